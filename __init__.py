@@ -6,13 +6,47 @@ Automatically add phonetics, definitions, examples and TTS audio to vocabulary c
 using MDX dictionaries. Supports batch processing and auto-playback during review.
 """
 
+import threading
+
+from aqt import gui_hooks, mw
+
 from . import hooks
 
 
+def _warm_dictionaries():
+    """Load MDX dictionaries and their field info ahead of the first lookup"""
+    from .dictionary.lookup import get_parsers, get_dictionary_fields
+    
+    get_parsers()
+    get_dictionary_fields()
+
+
+def _warm_tts():
+    """Prepare the configured TTS engine ahead of the first generation"""
+    from .tts.manager import warmup_engine
+    
+    warmup_engine()
+
+
+def _schedule_warm_dictionaries():
+    """Warm dictionaries and the TTS engine in background threads once the collection is open"""
+    if mw is None or mw.col is None:
+        return
+    
+    def _start():
+        threading.Thread(target=_warm_dictionaries, daemon=True).start()
+        threading.Thread(target=_warm_tts, daemon=True).start()
+    
+    mw.progress.timer(100, _start, False)
+
+
 def init_addon():
     """Initialize the EasyWords add-on"""
     # Setup hooks (note type creation is handled in hooks after collection loads)
     hooks.setup_hooks()
+    
+    # The collection is not loaded yet at add-on init, so warm up on profile open
+    gui_hooks.profile_did_open.append(_schedule_warm_dictionaries)
 
 
 # Initialize the add-on
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Asynchronous OpenAI client for issuing many chat completions concurrently
+"""
+
+import asyncio
+import importlib.util
+from typing import List, Optional
+
+from .client import OpenAIClient
+
+
+# Maximum number of requests kept in flight at once
+MAX_CONCURRENCY = 10
+
+
+async def generate_many(client: OpenAIClient, prompts: List[str],
+                        system_prompt: str = "You are a helpful assistant.",
+                        max_concurrency: int = MAX_CONCURRENCY) -> List[Optional[str]]:
+    """
+    Run several chat completions concurrently over a shared connection pool
+
+    Args:
+        client: Configured OpenAI client (provides URL, headers and body)
+        prompts: User prompts, one request each
+        system_prompt: System prompt shared by all requests
+        max_concurrency: Maximum number of requests in flight
+
+    Returns:
+        Generated contents in the same order as prompts (None for failures)
+    """
+    import aiohttp
+
+    results: List[Optional[str]] = [None] * len(prompts)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers=client.build_headers()) as session:
+
+        async def _generate(index: int, prompt: str):
+            async with semaphore:
+                try:
+                    body = client.build_request_body(prompt, system_prompt)
+                    async with session.post(client.base_url, json=body) as response:
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+                    return index, client.extract_content(data)
+                except Exception as e:
+                    print(f"OpenAI API Error: {e}")
+                    return index, None
+
+        tasks = [_generate(i, prompt) for i, prompt in enumerate(prompts)]
+        for future in asyncio.as_completed(tasks):
+            index, content = await future
+            results[index] = content
+
+    return results
+
+
+def generate_content_batch(prompts: List[str],
+                           system_prompt: str = "You are a helpful assistant.",
+                           api_key: Optional[str] = None) -> List[Optional[str]]:
+    """
+    Generate content for several prompts concurrently
+
+    Must be called from a background thread (it runs its own event loop).
+    Falls back to sequential requests when aiohttp is not available.
+
+    Returns:
+        Generated contents in the same order as prompts (None for failures)
+    """
+    client = OpenAIClient(api_key)
+    if not client.is_configured():
+        return [None] * len(prompts)
+
+    if importlib.util.find_spec("aiohttp") is None:
+        return [client.generate_content(prompt, system_prompt) for prompt in prompts]
+
+    return asyncio.run(generate_many(client, prompts, system_prompt))
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+OpenAI Batch API client for non-interactive bulk AI fill
+
+Requests are uploaded as a JSONL file and processed asynchronously by OpenAI
+within 24 hours at a reduced price. Results are collected later and written
+to the note fields.
+"""
+
+import json
+import os
+import tempfile
+import urllib.request
+import uuid
+from typing import Any, Dict, List, Optional
+
+from ..config import config
+from .client import OpenAIClient
+
+
+CHAT_COMPLETIONS_PATH = "/v1/chat/completions"
+
+
+def _get_api_root(client: OpenAIClient) -> str:
+    """Derive the API root (e.g. https://api.openai.com/v1) from the base URL"""
+    base_url = client.base_url.rstrip('/')
+    suffix = "/chat/completions"
+    if base_url.endswith(suffix):
+        return base_url[:-len(suffix)]
+    return base_url
+
+
+def _request_json(client: OpenAIClient, url: str, data: Optional[bytes] = None,
+                  content_type: str = "application/json") -> Dict[str, Any]:
+    """Send a request to the OpenAI API and decode the JSON response"""
+    headers = {"Authorization": f"Bearer {client.api_key}"}
+    if data is not None:
+        headers["Content-Type"] = content_type
+    req = urllib.request.Request(url, data=data, headers=headers,
+                                 method="POST" if data is not None else "GET")
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def _upload_file(client: OpenAIClient, path: str) -> str:
+    """Upload a JSONL file with purpose=batch and return its file id"""
+    boundary = uuid.uuid4().hex
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="purpose"\r\n\r\n'
+        "batch\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{os.path.basename(path)}"\r\n'
+        "Content-Type: application/jsonl\r\n\r\n"
+    ).encode('utf-8') + content + f"\r\n--{boundary}--\r\n".encode('utf-8')
+
+    result = _request_json(client, f"{_get_api_root(client)}/files", body,
+                           f"multipart/form-data; boundary={boundary}")
+    return result["id"]
+
+
+def submit_batch(records: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Submit AI fill requests to the OpenAI Batch API
+
+    Args:
+        records: List of dicts with keys:
+            nid: Note id to fill
+            word: The word to suggest for
+            fields: Dict mapping source field (e.g. 'Definition') to target note field
+
+    Returns:
+        Batch id, or None if submission failed
+    """
+    client = OpenAIClient()
+    if not client.is_configured() or not records:
+        return None
+
+    pending = {}
+    fd, path = tempfile.mkstemp(suffix=".jsonl", prefix="easywords_batch_")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for record in records:
+                custom_id = str(record['nid'])
+                source_fields = list(record['fields'].keys())
+                prompt = client._build_bulk_prompt([record['word']], source_fields)
+                line = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": CHAT_COMPLETIONS_PATH,
+                    "body": client.build_request_body(prompt, client.BULK_SYSTEM_PROMPT),
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+                pending[custom_id] = {'word': record['word'], 'fields': record['fields']}
+
+        file_id = _upload_file(client, path)
+        batch = _request_json(
+            client,
+            f"{_get_api_root(client)}/batches",
+            json.dumps({
+                "input_file_id": file_id,
+                "endpoint": CHAT_COMPLETIONS_PATH,
+                "completion_window": "24h",
+            }).encode('utf-8'),
+        )
+    except Exception as e:
+        print(f"OpenAI Batch API Error: {e}")
+        return None
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+    batch_id = batch["id"]
+    config.add_pending_ai_batch(batch_id, pending)
+    return batch_id
+
+
+def get_batch_status(batch_id: str) -> Optional[Dict[str, Any]]:
+    """Get the batch object from the OpenAI API, or None on failure"""
+    client = OpenAIClient()
+    if not client.is_configured():
+        return None
+    try:
+        return _request_json(client, f"{_get_api_root(client)}/batches/{batch_id}")
+    except Exception as e:
+        print(f"OpenAI Batch API Error: {e}")
+        return None
+
+
+def collect_batch(batch_id: str) -> Optional[int]:
+    """
+    Download the results of a completed batch and write them to note fields
+
+    Only empty fields are filled. The batch is removed from the pending list
+    once it has finished (completed, failed, expired or cancelled).
+
+    Returns:
+        Number of notes updated, or None if the batch is not finished yet
+    """
+    from aqt import mw
+
+    batch = get_batch_status(batch_id)
+    if not batch:
+        return None
+
+    status = batch.get("status")
+    if status in ("failed", "expired", "cancelled"):
+        config.remove_pending_ai_batch(batch_id)
+        return 0
+    if status != "completed":
+        return None
+
+    pending = config.get_pending_ai_batches().get(batch_id, {})
+    client = OpenAIClient()
+
+    updated = 0
+    changed_notes = []
+    output_file_id = batch.get("output_file_id")
+    if output_file_id:
+        req = urllib.request.Request(
+            f"{_get_api_root(client)}/files/{output_file_id}/content",
+            headers={"Authorization": f"Bearer {client.api_key}"},
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                lines = response.read().decode("utf-8").splitlines()
+        except Exception as e:
+            print(f"OpenAI Batch API Error: {e}")
+            return None
+
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            record = pending.get(entry.get("custom_id"))
+            body = (entry.get("response") or {}).get("body") or {}
+            if not record or not body:
+                continue
+
+            content = client.extract_content(body)
+            result = client._parse_bulk_response(content, [record['word']]).get(record['word'], {})
+            if not result:
+                continue
+
+            try:
+                note = mw.col.get_note(int(entry["custom_id"]))
+            except Exception:
+                continue
+
+            changed = False
+            for source_field, target_field in record['fields'].items():
+                if target_field in note and result.get(source_field) and not note[target_field]:
+                    note[target_field] = result[source_field]
+                    changed = True
+            if changed:
+                changed_notes.append(note)
+
+    # Save all filled notes in a single collection transaction
+    if changed_notes:
+        mw.col.update_notes(changed_notes)
+        updated = len(changed_notes)
+
+    config.remove_pending_ai_batch(batch_id)
+    return updated
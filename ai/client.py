@@ -4,10 +4,12 @@ OpenAI API Client
 """
 
 import json
+import random
+import time
 import urllib.request
 import urllib.error
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List
-from functools import lru_cache
 
 from ..config import config
 
@@ -17,13 +19,37 @@ class OpenAIClient:
 
     API_URL = "https://api.openai.com/v1/chat/completions"
 
+    # Maximum number of words packed into a single chat completion
+    MAX_BULK_WORDS = 20
+
+    BULK_SYSTEM_PROMPT = (
+        "You are a helpful dictionary assistant. "
+        "Provide concise definitions and examples for language learners. "
+        "Return the result as a valid JSON object keyed by word, where each value "
+        "is an object with keys matching the requested fields."
+    )
+
+    # HTTP statuses worth retrying, and statuses meaning the API key is rejected
+    TRANSIENT_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+    AUTH_STATUSES = frozenset({401, 403})
+
+    # Values of last_error after a failed request
+    ERROR_NEEDS_API_KEY = "needs_api_key"
+    ERROR_TRANSIENT = "transient"
+    ERROR_OTHER = "error"
+
+    # Shared HTTP session (connection pool with keep-alive), created lazily
+    _session = None
+
     # Class-level cache for AI responses (max 256 entries)
-    _cache: Dict[str, str] = {}
+    _cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
     _max_cache_size = 256
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or config.get_openai_api_key()
         self.base_url = config.get_base_url() or self.API_URL
+        # Reason the last request failed (one of the ERROR_* values), None on success
+        self.last_error: Optional[str] = None
 
     @classmethod
     def _get_cache_key(cls, word: str, fields: List[str]) -> str:
@@ -32,21 +58,44 @@ class OpenAIClient:
 
     @classmethod
     def _get_from_cache(cls, key: str) -> Optional[Dict[str, str]]:
-        """Get result from cache"""
-        return cls._cache.get(key)
+        """Get result from cache, marking it as most recently used"""
+        result = cls._cache.get(key)
+        if result is not None:
+            cls._cache.move_to_end(key)
+        return result
 
     @classmethod
     def _save_to_cache(cls, key: str, result: Dict[str, str]) -> None:
         """Save result to cache with LRU eviction"""
-        if len(cls._cache) >= cls._max_cache_size:
-            # Simple LRU: remove first (oldest) entry
-            cls._cache.pop(next(iter(cls._cache)))
         cls._cache[key] = result
+        cls._cache.move_to_end(key)
+        if len(cls._cache) > cls._max_cache_size:
+            # Evict the least recently used entry
+            cls._cache.popitem(last=False)
 
     @classmethod
     def clear_cache(cls) -> None:
         """Clear the cache"""
         cls._cache.clear()
+
+    @classmethod
+    def _get_session(cls):
+        """Get the shared requests session, or None if requests is unavailable"""
+        if cls._session is None:
+            try:
+                import requests
+                from requests.adapters import HTTPAdapter
+            except ImportError:
+                return None
+
+            session = requests.Session()
+            # Retries are handled by _request_with_retry (with jitter)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            cls._session = session
+        return cls._session
+
     def is_configured(self) -> bool:
         """Check if API key is configured"""
         return bool(self.api_key)
@@ -65,41 +114,112 @@ class OpenAIClient:
         if not self.is_configured():
             return None
             
-        model = config.get_openai_model()
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
-        
-        data = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ]
-        }
-        
-        try:
+        data = self.build_request_body(prompt, system_prompt)
+        headers = self.build_headers()
+
+        def _send() -> Dict[str, Any]:
+            session = self._get_session()
+            if session is not None:
+                response = session.post(self.base_url, json=data, headers=headers, timeout=30)
+                response.raise_for_status()
+                return response.json()
+
+            # Fallback when requests is not available
             req = urllib.request.Request(
                 self.base_url,
                 data=json.dumps(data).encode("utf-8"),
                 headers=headers,
                 method="POST",
             )
-            
-            with urllib.request.urlopen(req) as response:
-                result = json.loads(response.read().decode("utf-8"))
-                
-                if "choices" in result and len(result["choices"]) > 0:
-                    return result["choices"][0]["message"]["content"].strip()
-                
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return json.loads(response.read().decode("utf-8"))
+
+        self.last_error = None
+        try:
+            return self.extract_content(self._request_with_retry(_send))
         except Exception as e:
+            status = self._get_error_status(e)
+            if status in self.AUTH_STATUSES:
+                self.last_error = self.ERROR_NEEDS_API_KEY
+            elif self._is_transient_error(e):
+                self.last_error = self.ERROR_TRANSIENT
+            else:
+                self.last_error = self.ERROR_OTHER
             print(f"OpenAI API Error: {e}")
             return None
-            
+
+    @staticmethod
+    def _get_error_status(error: Exception) -> Optional[int]:
+        """Get the HTTP status code of a request error, if any"""
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code
+        response = getattr(error, "response", None)
+        return getattr(response, "status_code", None)
+
+    @classmethod
+    def _is_transient_error(cls, error: Exception) -> bool:
+        """Check if a request error is worth retrying"""
+        status = cls._get_error_status(error)
+        if status is not None:
+            return status in cls.TRANSIENT_STATUSES
+        if isinstance(error, urllib.error.URLError):
+            return True
+        try:
+            import requests
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        except ImportError:
+            return False
+
+    @classmethod
+    def _request_with_retry(cls, send, *, attempts: int = 3):
+        """
+        Call send(), retrying transient failures with exponential backoff and jitter
+        
+        Re-raises the last error when all attempts fail, and terminal errors
+        (e.g. 401/403) immediately.
+        """
+        for i in range(attempts):
+            try:
+                return send()
+            except Exception as e:
+                if i == attempts - 1 or not cls._is_transient_error(e):
+                    raise
+                time.sleep(min(2 ** i + random.random(), 20))
+
+    def build_headers(self) -> Dict[str, str]:
+        """Build HTTP headers for a chat completion request"""
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+
+    def build_request_body(self, prompt: str, system_prompt: str) -> Dict[str, Any]:
+        """Build the JSON body for a chat completion request"""
+        return {
+            "model": config.get_openai_model(),
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ]
+        }
+
+    @staticmethod
+    def extract_content(result: Dict[str, Any]) -> Optional[str]:
+        """Extract the message content from a chat completion response"""
+        if "choices" in result and len(result["choices"]) > 0:
+            return result["choices"][0]["message"]["content"].strip()
         return None
 
+    @staticmethod
+    def _parse_json_response(response: str) -> Any:
+        """Parse a JSON payload from a model response, stripping markdown fences"""
+        # Basic cleanup if the model adds markdown code blocks
+        if "```json" in response:
+            response = response.split("```json")[1].split("```")[0].strip()
+        elif "```" in response:
+            response = response.split("```")[1].split("```")[0].strip()
+        return json.loads(response)
+
     def suggest_fields(self, word: str, fields: List[str]) -> Dict[str, str]:
         """
         Suggest content for specific fields
@@ -111,44 +231,137 @@ class OpenAIClient:
         Returns:
             Dict mapping field name to suggested content
         """
-        # Check cache first
-        cache_key = self._get_cache_key(word, fields)
-        cached_result = self._get_from_cache(cache_key)
-        if cached_result is not None:
-            return cached_result
-
-        system_prompt = (
-            "You are a helpful dictionary assistant. "
-            "Provide concise definitions and examples for language learners. "
-            "Return the result as a valid JSON object with keys matching the requested fields."
-        )
+        if len(fields) > 1 and config.is_ai_per_field_parallel():
+            return self.suggest_fields_split(word, fields)
+        return self.suggest_fields_bulk([word], fields).get(word, {})
+
+    def suggest_fields_split(self, word: str, fields: List[str]) -> Dict[str, str]:
+        """
+        Suggest content for specific fields with one concurrent request per field
+
+        Args:
+            word: The word to suggest for
+            fields: List of fields to suggest (e.g. ['Definition', 'Example'])
+
+        Returns:
+            Dict mapping field name to suggested content
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        # One client per request so last_error is not shared between threads
+        clients = [OpenAIClient(self.api_key) for _ in fields]
+        result: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=len(fields)) as executor:
+            futures = [
+                executor.submit(client.suggest_fields_bulk, [word], [field])
+                for client, field in zip(clients, fields)
+            ]
+            for future in as_completed(futures):
+                result.update(future.result().get(word, {}))
+
+        self.last_error = next((c.last_error for c in clients if c.last_error), None)
+        return result
+
+    def suggest_fields_bulk(self, words: List[str], fields: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Suggest content for specific fields for several words at once
+
+        Words are packed into as few chat completions as possible
+        (at most MAX_BULK_WORDS per request).
 
+        Args:
+            words: The words to suggest for
+            fields: List of fields to suggest (e.g. ['Definition', 'Example'])
+
+        Returns:
+            Dict mapping each word to a dict of field name -> suggested content
+        """
+        results: Dict[str, Dict[str, str]] = {}
+        pending: List[str] = []
+
+        # Check cache first (each distinct word once)
+        for word in dict.fromkeys(words):
+            cached_result = self._get_from_cache(self._get_cache_key(word, fields))
+            if cached_result is not None:
+                results[word] = cached_result
+            else:
+                pending.append(word)
+
+        chunks = [
+            pending[i:i + self.MAX_BULK_WORDS]
+            for i in range(0, len(pending), self.MAX_BULK_WORDS)
+        ]
+        if not chunks:
+            return results
+
+        prompts = [self._build_bulk_prompt(chunk, fields) for chunk in chunks]
+        if len(chunks) > 1:
+            # Several requests needed: keep them in flight concurrently
+            from .async_client import generate_content_batch
+            responses = generate_content_batch(prompts, self.BULK_SYSTEM_PROMPT, self.api_key)
+        else:
+            responses = [self.generate_content(prompts[0], self.BULK_SYSTEM_PROMPT)]
+
+        for chunk, response in zip(chunks, responses):
+            chunk_results = self._try_parse_bulk_response(response, chunk)
+            succeeded = chunk_results is not None
+            for word in chunk:
+                result = chunk_results.get(word, {}) if succeeded else {}
+                # Save to cache (even empty results to avoid repeated lookups),
+                # unless the request or its parse failed and may succeed later
+                if succeeded:
+                    self._save_to_cache(self._get_cache_key(word, fields), result)
+                results[word] = result
+
+        return results
+
+    @staticmethod
+    def _build_bulk_prompt(words: List[str], fields: List[str]) -> str:
+        """Build a single prompt asking for the given fields of several words"""
         prompt = (
-            f"Word: {word}\n"
-            f"Please provide content for the following fields:\n"
+            "For each word below, return a JSON object keyed by word.\n"
+            "Words:\n"
+        )
+        for word in words:
+            prompt += f"- {word}\n"
+        prompt += (
+            f"\nPlease provide content for the following fields:\n"
             f"{', '.join(fields)}\n\n"
             "Format:\n"
             "{\n"
+            '  "<word>": {\n'
         )
         for field in fields:
-            prompt += f'  "{field}": "...",\n'
-        prompt += "}"
+            prompt += f'    "{field}": "...",\n'
+        prompt += "  }\n}"
+        return prompt
 
-        response = self.generate_content(prompt, system_prompt)
+    @classmethod
+    def _parse_bulk_response(cls, response: Optional[str], words: List[str]) -> Dict[str, Dict[str, str]]:
+        """Split a bulk JSON response into per-word results"""
+        return cls._try_parse_bulk_response(response, words) or {}
 
-        result = {}
-        if response:
-            try:
-                # Basic cleanup if the model adds markdown code blocks
-                if "```json" in response:
-                    response = response.split("```json")[1].split("```")[0].strip()
-                elif "```" in response:
-                    response = response.split("```")[1].split("```")[0].strip()
-
-                result = json.loads(response)
-            except json.JSONDecodeError:
-                print(f"Failed to parse AI response: {response}")
-
-        # Save to cache (even empty results to avoid repeated failed lookups)
-        self._save_to_cache(cache_key, result)
-        return result
+    @classmethod
+    def _try_parse_bulk_response(cls, response: Optional[str],
+                                 words: List[str]) -> Optional[Dict[str, Dict[str, str]]]:
+        """Split a bulk JSON response into per-word results (None if the request or parse failed)"""
+        if not response:
+            return None
+
+        try:
+            data = cls._parse_json_response(response)
+        except json.JSONDecodeError:
+            print(f"Failed to parse AI response: {response}")
+            return None
+
+        results: Dict[str, Dict[str, str]] = {}
+
+        if isinstance(data, dict):
+            # Match keys case-insensitively in case the model normalizes words
+            lowered = {str(k).strip().lower(): v for k, v in data.items()}
+            for word in words:
+                value = data.get(word, lowered.get(word.strip().lower()))
+                if isinstance(value, dict):
+                    results[word] = value
+
+        return results
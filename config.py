@@ -3,27 +3,146 @@
 Configuration management for EasyWords add-on
 """
 
-from typing import Dict, Any, List
+import json
+import os
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 import aqt
 
 
+# Config file written directly (bypassing addonManager) between Anki sessions
+USER_FILES_DIR = os.path.join(os.path.dirname(__file__), 'user_files')
+DIRECT_CONFIG_PATH = os.path.join(USER_FILES_DIR, 'config.json')
+
+
 class Config:
     """Configuration manager for EasyWords add-on"""
     
     def __init__(self, addon_name: str = "easyWords"):
         self.addon_name = addon_name
         self._config_cache = None
+        self._dirty = False
+        # Changes written to the direct file but not yet to addonManager
+        self._anki_dirty = False
+        self._flush_scheduled = False
+        # Guards the cache, the flags above and the flush itself; save() is
+        # also called from background operations
+        self._lock = threading.RLock()
+        # Incremented on every save, used to validate derived caches
+        self._version = 0
+        # Normalized field mappings: {(note_type_name, full): (version, mapping)}
+        self._norm_cache: Dict[Tuple[str, bool], Tuple[int, Mapping[str, Any]]] = {}
     
     def load(self) -> Dict[str, Any]:
         """Load configuration from Anki"""
         if self._config_cache is None:
-            self._config_cache = aqt.mw.addonManager.getConfig(self.addon_name)
-        return self._config_cache or {}
+            with self._lock:
+                if self._config_cache is None:
+                    self._config_cache = (self._read_direct()
+                                          or aqt.mw.addonManager.getConfig(self.addon_name) or {})
+        return self._config_cache
+    
+    def _read_direct(self) -> Optional[Dict[str, Any]]:
+        """Read the directly written config file, if it is newer than Anki's copy"""
+        if not os.path.exists(DIRECT_CONFIG_PATH):
+            return None
+        
+        # Anki's config editor writes meta.json; prefer it if edited more recently
+        try:
+            meta_path = os.path.join(aqt.mw.addonManager.addonsFolder(self.addon_name), 'meta.json')
+            if os.path.getmtime(meta_path) > os.path.getmtime(DIRECT_CONFIG_PATH):
+                return None
+        except OSError:
+            pass
+        
+        try:
+            with open(DIRECT_CONFIG_PATH, 'rb') as f:
+                data = f.read()
+            try:
+                import orjson
+                return orjson.loads(data)
+            except ImportError:
+                return json.loads(data)
+        except Exception as e:
+            print(f"Failed to read EasyWords config: {e}")
+            return None
+    
+    def _write_direct(self, config: Dict[str, Any]) -> bool:
+        """
+        Write the config file directly with orjson
+        
+        Returns:
+            True if written, False if orjson is unavailable or writing failed
+        """
+        try:
+            import orjson
+        except ImportError:
+            return False
+        
+        try:
+            data = orjson.dumps(config, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+            os.makedirs(USER_FILES_DIR, exist_ok=True)
+            tmp_path = DIRECT_CONFIG_PATH + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, DIRECT_CONFIG_PATH)
+            return True
+        except Exception as e:
+            print(f"Failed to write EasyWords config: {e}")
+            return False
     
     def save(self, config: Dict[str, Any]) -> None:
-        """Save configuration to Anki"""
-        aqt.mw.addonManager.writeConfig(self.addon_name, config)
-        self._config_cache = config
+        """
+        Save configuration to Anki
+        
+        The write is deferred to the next main loop iteration so that several
+        consecutive changes result in a single disk write.
+        """
+        with self._lock:
+            self._config_cache = config
+            self._dirty = True
+            self._version += 1
+        self._schedule_flush()
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped on every config change, for invalidating derived caches"""
+        return self._version
+    
+    def _schedule_flush(self) -> None:
+        """Schedule a flush on the main thread if one is not already pending"""
+        with self._lock:
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        try:
+            aqt.mw.taskman.run_on_main(self.flush)
+        except Exception:
+            self.flush()
+    
+    def flush(self, sync_anki: bool = False) -> None:
+        """
+        Write pending configuration changes
+        
+        Changes go to the direct orjson file; they are written through
+        addonManager when sync_anki is set (e.g. at shutdown) or orjson is
+        not available.
+        """
+        with self._lock:
+            self._flush_scheduled = False
+            if self._config_cache is None:
+                return
+            
+            if self._dirty:
+                self._dirty = False
+                self._anki_dirty = True
+                if not sync_anki and not self._write_direct(self._config_cache):
+                    sync_anki = True
+            
+            if sync_anki and self._anki_dirty:
+                aqt.mw.addonManager.writeConfig(self.addon_name, self._config_cache)
+                self._anki_dirty = False
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value"""
@@ -32,28 +151,57 @@ class Config:
     
     def set(self, key: str, value: Any) -> None:
         """Set a configuration value"""
-        config = self.load()
-        config[key] = value
-        self.save(config)
+        with self._lock:
+            config = self.load()
+            config[key] = value
+            self.save(config)
     
-    def get_mdx_paths(self) -> List[str]:
-        """Get list of MDX dictionary paths"""
-        return self.get('mdx_paths', [])
+    def get_mdx_paths(self) -> Tuple[str, ...]:
+        """Get MDX dictionary paths (read-only, use add/remove to modify)"""
+        return tuple(self.get('mdx_paths', []))
     
     def add_mdx_path(self, path: str) -> None:
         """Add a new MDX dictionary path"""
-        paths = self.get_mdx_paths()
+        paths = list(self.get_mdx_paths())
         if path not in paths:
             paths.append(path)
             self.set('mdx_paths', paths)
     
     def remove_mdx_path(self, path: str) -> None:
         """Remove an MDX dictionary path"""
-        paths = self.get_mdx_paths()
+        paths = list(self.get_mdx_paths())
         if path in paths:
             paths.remove(path)
             self.set('mdx_paths', paths)
     
+    def get_lookup_concurrency(self) -> int:
+        """Get the number of dictionary lookups run in parallel during batch fills"""
+        return max(1, int(self.get('lookup_concurrency', 8)))
+    
+    def get_audio_batch_max(self) -> int:
+        """Get the maximum number of texts per TTS batch during batch fills"""
+        return max(1, int(self.get('audio_batch_max', 32)))
+    
+    def get_audio_batch_max_wait_ms(self) -> int:
+        """Get how long a queued audio task may wait for its TTS batch to fill (ms)"""
+        return max(0, int(self.get('audio_batch_max_wait_ms', 200)))
+    
+    def get_tts_concurrency(self) -> int:
+        """Get the number of TTS batches allowed in flight at once during batch fills"""
+        return max(1, int(self.get('tts_concurrency', 2)))
+    
+    def get_edge_tts_concurrency(self) -> int:
+        """Get the number of Edge TTS requests kept in flight within one batch"""
+        return max(1, int(self.get('edge_tts_concurrency', 8)))
+    
+    def get_tts_batch_workers(self) -> int:
+        """Get the number of threads generating audio for engines without batch support"""
+        return max(1, int(self.get('tts_batch_workers', 4)))
+    
+    def get_mdx_storage(self) -> str:
+        """Get where MDX entries are kept after load ('memory', 'lazy' or 'sqlite')"""
+        return self.get('mdx_storage', 'memory')
+    
     def get_tts_engine(self) -> str:
         """Get current TTS engine"""
         return self.get('tts_engine', 'sapi5')
@@ -142,9 +290,40 @@ class Config:
     def set_base_url(self, url: str) -> None:
         """Set OpenAI API Base URL"""
         self.set('base_url', url)
-    def get_field_mappings(self) -> Dict[str, Dict[str, str]]:
+
+    def is_ai_per_field_parallel(self) -> bool:
+        """Check if AI suggestions should use one concurrent request per field"""
+        return self.get('ai_per_field_parallel', False)
+    
+    def set_ai_per_field_parallel(self, enabled: bool) -> None:
+        """Set whether AI suggestions use one concurrent request per field"""
+        self.set('ai_per_field_parallel', enabled)
+
+    def get_pending_ai_batches(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get submitted OpenAI batch jobs that have not been collected yet
+        
+        Returns:
+            Dict mapping batch id to {custom_id: {"word": ..., "fields": {...}}}
+        """
+        return self.get('pending_ai_batches', {})
+    
+    def add_pending_ai_batch(self, batch_id: str, records: Dict[str, Any]) -> None:
+        """Remember a submitted OpenAI batch job"""
+        batches = self.get_pending_ai_batches()
+        batches[batch_id] = records
+        self.set('pending_ai_batches', batches)
+    
+    def remove_pending_ai_batch(self, batch_id: str) -> None:
+        """Forget a collected OpenAI batch job"""
+        batches = self.get_pending_ai_batches()
+        if batch_id in batches:
+            del batches[batch_id]
+            self.set('pending_ai_batches', batches)
+    
+    def get_field_mappings(self) -> Mapping[str, Dict[str, str]]:
         """
-        Get all field mappings
+        Get all field mappings (read-only, use set_field_mapping to modify)
         
         Returns:
             Dict mapping note type name to field mappings
@@ -156,9 +335,12 @@ class Config:
                 }
             }
         """
-        return self.get('field_mappings', {})
+        return MappingProxyType({
+            name: MappingProxyType(mapping) if isinstance(mapping, dict) else mapping
+            for name, mapping in self.get('field_mappings', {}).items()
+        })
     
-    def get_field_mapping(self, note_type_name: str) -> Dict[str, str]:
+    def get_field_mapping(self, note_type_name: str) -> Mapping[str, str]:
         """
         Get field mapping for a specific note type
         
@@ -166,26 +348,12 @@ class Config:
             note_type_name: Name of the note type
         
         Returns:
-            Dict mapping source field to target field (only enabled fields)
+            Read-only dict mapping source field to target field (only enabled fields)
             Empty dict if no mapping configured
         """
-        mappings = self.get_field_mappings()
-        raw_mapping = mappings.get(note_type_name, {})
-        
-        # Normalize mapping format and filter enabled fields
-        normalized = {}
-        for source_field, target_value in raw_mapping.items():
-            if isinstance(target_value, dict):
-                # Enhanced format: {"target": "field_name", "enabled": true}
-                if target_value.get('enabled', True):
-                    normalized[source_field] = target_value['target']
-            elif isinstance(target_value, str):
-                # Simple format (legacy): "field_name"
-                normalized[source_field] = target_value
-        
-        return normalized
+        return self._get_normalized_mapping(note_type_name, full=False)
     
-    def get_field_mapping_full(self, note_type_name: str) -> Dict[str, Dict[str, Any]]:
+    def get_field_mapping_full(self, note_type_name: str) -> Mapping[str, Dict[str, Any]]:
         """
         Get full field mapping configuration including enabled/disabled status
         
@@ -193,24 +361,42 @@ class Config:
             note_type_name: Name of the note type
         
         Returns:
-            Dict mapping source field to config dict with 'target' and 'enabled' keys
+            Read-only dict mapping source field to config dict with 'target' and 'enabled' keys
         """
+        return self._get_normalized_mapping(note_type_name, full=True)
+    
+    def _get_normalized_mapping(self, note_type_name: str, full: bool) -> Mapping[str, Any]:
+        """Get a normalized field mapping, cached until the config changes"""
+        cache_key = (note_type_name, full)
+        cached = self._norm_cache.get(cache_key)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        
         mappings = self.get_field_mappings()
         raw_mapping = mappings.get(note_type_name, {})
         
-        # Normalize to enhanced format
         normalized = {}
         for source_field, target_value in raw_mapping.items():
             if isinstance(target_value, dict):
-                normalized[source_field] = target_value
+                # Enhanced format: {"target": "field_name", "enabled": true}
+                if full:
+                    # Read-only view, so callers cannot edit the cached config in place
+                    normalized[source_field] = MappingProxyType(target_value)
+                elif target_value.get('enabled', True):
+                    normalized[source_field] = target_value['target']
             elif isinstance(target_value, str):
-                # Convert legacy format
-                normalized[source_field] = {
-                    'target': target_value,
-                    'enabled': True
-                }
+                # Simple format (legacy): "field_name"
+                if full:
+                    normalized[source_field] = MappingProxyType({
+                        'target': target_value,
+                        'enabled': True
+                    })
+                else:
+                    normalized[source_field] = target_value
         
-        return normalized
+        result = MappingProxyType(normalized)
+        self._norm_cache[cache_key] = (self._version, result)
+        return result
     
     def set_field_mapping(self, note_type_name: str, mapping: Dict[str, str]) -> None:
         """
@@ -220,8 +406,11 @@ class Config:
             note_type_name: Name of the note type
             mapping: Dict mapping source field to target field
         """
-        mappings = self.get_field_mappings()
+        # Stored values must be plain dicts, not the read-only views
+        mappings = dict(self.get('field_mappings', {}))
         mappings[note_type_name] = mapping
+        self._norm_cache.pop((note_type_name, False), None)
+        self._norm_cache.pop((note_type_name, True), None)
         self.set('field_mappings', mappings)
     
     def has_field_mapping(self, note_type_name: str) -> bool:
@@ -3,10 +3,20 @@
 Dependency management for EasyWords
 """
 
+import collections
+import functools
+import importlib
+import importlib.util
 import subprocess
 import sys
 import os
-from typing import Optional
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+# Cache of package availability checks
+# Format: {package_name: is_installed}
+_installed_cache: Dict[str, bool] = {}
 
 
 def get_anki_python() -> str:
@@ -14,48 +24,95 @@ def get_anki_python() -> str:
     return sys.executable
 
 
-def install_package(package_name: str) -> bool:
+def install_package(package_name: str,
+                    on_output: Optional[Callable[[str], None]] = None) -> bool:
     """
     Install a Python package in Anki's environment
     
+    Prefers prebuilt wheels; if no wheel is available, retries allowing
+    source builds.
+    
     Args:
         package_name: Name of the package to install
+        on_output: Optional callback receiving pip output line by line
     
     Returns:
         True if installation succeeded, False otherwise
     """
+    python_exe = get_anki_python()
+    base_cmd = [python_exe, "-m", "pip", "install",
+                "--no-input", "--disable-pip-version-check", "--prefer-binary"]
+    
+    if _run_pip(base_cmd + ["--only-binary=:all:", package_name], on_output):
+        return True
+    
+    # Some packages have no wheel for this platform
+    return _run_pip(base_cmd + [package_name], on_output)
+
+
+def _run_pip(cmd: List[str], on_output: Optional[Callable[[str], None]] = None,
+             timeout: int = 120) -> bool:
+    """
+    Run a pip command, streaming its output instead of buffering all of it
+    
+    Returns:
+        True if the command succeeded, False otherwise
+    """
+    # Keep only the last lines for error reporting
+    tail = collections.deque(maxlen=20)
+    
     try:
-        python_exe = get_anki_python()
-        
-        # Try to install using pip
-        result = subprocess.run(
-            [python_exe, "-m", "pip", "install", package_name],
-            capture_output=True,
-            text=True,
-            timeout=120
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True
         )
-        
-        return result.returncode == 0
     except Exception as e:
-        print(f"Failed to install {package_name}: {e}")
+        print(f"Failed to run pip: {e}")
+        return False
+    
+    # Kill pip if it takes too long
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    try:
+        for line in process.stdout:
+            line = line.rstrip()
+            tail.append(line)
+            if on_output and line:
+                on_output(line)
+        returncode = process.wait()
+    except Exception as e:
+        print(f"Failed to run pip: {e}")
+        process.kill()
         return False
+    finally:
+        timer.cancel()
+    
+    if returncode != 0:
+        print(f"pip failed ({returncode}):\n" + "\n".join(tail))
+    return returncode == 0
 
 
 def check_package_installed(package_name: str) -> bool:
     """
     Check if a package is installed
     
+    Only locates the package (no module code is executed), and caches the result.
+    
     Args:
-        package_name: Name of the package to check
+        package_name: Name of the package to check (dotted names allowed)
     
     Returns:
         True if package is installed, False otherwise
     """
-    try:
-        __import__(package_name)
-        return True
-    except ImportError:
-        return False
+    if package_name not in _installed_cache:
+        try:
+            _installed_cache[package_name] = importlib.util.find_spec(package_name) is not None
+        except (ImportError, ValueError):
+            # Parent package of a dotted name is missing
+            _installed_cache[package_name] = False
+    return _installed_cache[package_name]
 
 
 def ensure_edge_tts() -> bool:
@@ -82,12 +139,11 @@ def ensure_pywin32() -> bool:
     if sys.platform != "win32":
         return False
     
-    try:
-        import win32com.client
+    if check_package_installed('win32com.client'):
         return True
-    except ImportError:
-        print("pywin32 not found. SAPI5 TTS will not be available.")
-        return False
+    
+    print("pywin32 not found. SAPI5 TTS will not be available.")
+    return False
 
 
 def ensure_mdict_utils() -> bool:
@@ -97,17 +153,17 @@ def ensure_mdict_utils() -> bool:
     Returns:
         True if mdict-utils is available, False otherwise
     """
-    try:
-        import mdict_utils
+    if check_package_installed('mdict_utils'):
         return True
-    except ImportError:
-        print("mdict-utils not found. MDX dictionaries will not be available.")
-        return False
+    
+    print("mdict-utils not found. MDX dictionaries will not be available.")
+    return False
 
 
+@functools.lru_cache(maxsize=1)
 def check_all_dependencies() -> dict:
     """
-    Check status of all dependencies
+    Check status of all dependencies (memoized for the process lifetime)
     
     Returns:
         Dictionary with dependency status
@@ -127,6 +183,13 @@ def check_all_dependencies() -> dict:
     return status
 
 
+def invalidate_dependency_cache() -> None:
+    """Forget cached dependency checks (e.g. after installing a package)"""
+    importlib.invalidate_caches()
+    _installed_cache.clear()
+    check_all_dependencies.cache_clear()
+
+
 def get_dependency_info() -> str:
     """
     Get human-readable dependency information
@@ -207,6 +270,7 @@ def auto_install_edge_tts_with_permission() -> bool:
     success = install_package("edge-tts")
     
     if success:
+        invalidate_dependency_cache()
         showInfo("Edge TTS installed successfully!\n\n"
                  "Please restart Anki to use Edge TTS.")
         return True
@@ -247,6 +311,7 @@ def auto_install_mdict_utils_with_permission() -> bool:
     success = install_package("mdict-utils")
     
     if success:
+        invalidate_dependency_cache()
         showInfo("mdict-utils installed successfully!\n\n"
                  "You can now use MDX dictionaries with EasyWords.")
         return True
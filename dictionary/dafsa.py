@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Prefix index over dictionary keys for EasyWords
+
+Uses a DAWG (directed acyclic word graph) from the optional `dawg` package
+when available, which compresses shared prefixes and suffixes and is
+persisted in user_files. Falls back to a sorted key list with binary search.
+"""
+
+import bisect
+import hashlib
+import logging
+import os
+from typing import Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+USER_FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'user_files')
+
+
+def _index_cache_path(mdx_paths: Sequence[str]) -> str:
+    """Get the on-disk cache path for the DAWG of the given dictionaries"""
+    digest = hashlib.sha1()
+    # Bump when key normalization changes, so indexes with old keys are rebuilt
+    digest.update(b'keys-v2')
+    for path in mdx_paths:
+        digest.update(path.encode('utf-8'))
+        try:
+            digest.update(str(os.path.getmtime(path)).encode('utf-8'))
+        except OSError:
+            pass
+    return os.path.join(USER_FILES_DIR, f"key_index_{digest.hexdigest()[:16]}.dawg")
+
+
+class KeyIndex:
+    """Prefix-searchable index over the union of dictionary keys"""
+    
+    def __init__(self, dawg=None, sorted_keys: Optional[List[str]] = None):
+        self._dawg = dawg
+        self._sorted_keys = sorted_keys or []
+    
+    @classmethod
+    def build(cls, mdx_paths: Sequence[str], keys: Iterable[str]) -> "KeyIndex":
+        """
+        Build (or load from cache) the index for the given dictionaries
+        
+        Args:
+            mdx_paths: Dictionary paths, used to key the on-disk cache
+            keys: Union of all dictionary keys
+        """
+        try:
+            import dawg
+        except ImportError:
+            return cls(sorted_keys=sorted(set(keys)))
+        
+        cache_path = _index_cache_path(mdx_paths)
+        if os.path.exists(cache_path):
+            try:
+                return cls(dawg=dawg.CompletionDAWG().load(cache_path))
+            except Exception as e:
+                logger.warning(f"Failed to load key index cache: {e}")
+        
+        index = dawg.CompletionDAWG(keys)
+        try:
+            os.makedirs(USER_FILES_DIR, exist_ok=True)
+            index.save(cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to save key index cache: {e}")
+        return cls(dawg=index)
+    
+    def __contains__(self, key: str) -> bool:
+        if self._dawg is not None:
+            return key in self._dawg
+        pos = bisect.bisect_left(self._sorted_keys, key)
+        return pos < len(self._sorted_keys) and self._sorted_keys[pos] == key
+    
+    def iter_prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get up to `limit` keys starting with prefix, in sorted order"""
+        if self._dawg is not None:
+            result = []
+            for key in self._dawg.iterkeys(prefix):
+                result.append(key)
+                if len(result) >= limit:
+                    break
+            return result
+        
+        start = bisect.bisect_left(self._sorted_keys, prefix)
+        result = []
+        for key in self._sorted_keys[start:start + limit]:
+            if not key.startswith(prefix):
+                break
+            result.append(key)
+        return result
@@ -3,41 +3,211 @@
 Dictionary lookup interface for EasyWords
 """
 
-from typing import Optional, Dict, List
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple, Callable, Iterable
 from ..config import config
-from .mdx_parser import create_parser, MDXParser
+from .mdx_parser import create_parser, clean_word, normalize_word, MDXParser, STORAGE_MEMORY
+from .dafsa import KeyIndex
+from . import persist_cache
 
 
 # Cache of loaded parsers
 _parsers: Dict[str, MDXParser] = {}
 
-# Simple in-memory cache for online lookups
-# Format: {word: result_dict}
-_online_cache: Dict[str, Optional[Dict]] = {}
+# mdx_paths seen by the last get_parsers() call and the resulting parsers
+_last_mdx_paths: Optional[Tuple[str, ...]] = None
+_parser_list: List[MDXParser] = []
+_parsers_lock = threading.RLock()
+
+# Unified index over the in-memory dictionaries; lazy and SQLite dictionaries
+# keep their keys out of memory and are queried directly
+# Format: {word_key (lowercased UTF-8 bytes): parser}, first dictionary in mdx_paths order wins
+_unified_index: Dict[bytes, MDXParser] = {}
+_index_paths: Tuple[str, ...] = ()
+
+# Prefix index over the unified key set, built lazily on first use
+_key_index: Optional[KeyIndex] = None
+
+# Bump when extraction/parsing changes what a lookup returns, so results
+# persisted by older versions are no longer used
+LOOKUP_CACHE_VERSION = 1
+
+# Last sources fingerprint, with the (config version, loaded paths) it was built for
+_fingerprint: Optional[Tuple[Tuple[int, Tuple[str, ...]], str]] = None
+
+# Online results fetched ahead of time by prefetch_online(); None marks a
+# word the dictionary has no entry for (failed requests are left out)
+# Format: {(word_norm, dict_config_key): result}
+_prefetched: Dict[Tuple[str, str], Optional[Dict]] = {}
+_NOT_PREFETCHED = object()
+_prefetched_lock = threading.Lock()
+
+# Lookups currently in progress, so concurrent callers share one result
+# Format: {(word, mode): future}
+_inflight: Dict[Tuple[str, str], Future] = {}
+_inflight_lock = threading.Lock()
+
+
+class LookupResult:
+    """
+    Fixed-shape lookup result for hot loops (attribute access instead of dict keys)
+    
+    Attributes:
+        phonetic: Phonetic transcription or ''
+        definition: Definition or ''
+        example: Example sentence or ''
+    """
+    
+    __slots__ = ('phonetic', 'definition', 'example')
+    
+    def __init__(self, phonetic: str = '', definition: str = '', example: str = ''):
+        self.phonetic = phonetic
+        self.definition = definition
+        self.example = example
+    
+    @classmethod
+    def from_dict(cls, result: Optional[Dict]) -> Optional['LookupResult']:
+        """Convert a lookup_word() dict, keeping None for a miss"""
+        if not result:
+            return None
+        return cls(result.get('phonetic') or '', result.get('definition') or '',
+                   result.get('example') or '')
 
 
 def get_parsers() -> List[MDXParser]:
-    """Get list of loaded dictionary parsers"""
-    global _parsers
+    """Get list of loaded dictionary parsers (in priority order)"""
+    global _parsers, _last_mdx_paths, _parser_list
     
     mdx_paths = config.get_mdx_paths()
     if not mdx_paths:
         return []
     
-    # Load new dictionaries
-    for path in mdx_paths:
-        if path not in _parsers:
-            parser = create_parser(path)
-            if parser.load():
-                _parsers[path] = parser
+    # Common case: configuration unchanged since the last call
+    if mdx_paths == _last_mdx_paths:
+        return list(_parser_list)
     
-    # Remove parsers for paths no longer in config
-    paths_to_remove = [p for p in _parsers.keys() if p not in mdx_paths]
-    for path in paths_to_remove:
-        _parsers[path].close()
-        del _parsers[path]
+    # Serialize loading, e.g. background warm-up racing a user lookup
+    with _parsers_lock:
+        if mdx_paths == _last_mdx_paths:
+            return list(_parser_list)
+        
+        current = set(_parsers.keys())
+        desired = set(mdx_paths)
+        
+        # Remove parsers for paths no longer in config
+        for path in current - desired:
+            _parsers[path].close()
+            del _parsers[path]
+        
+        # Load new dictionaries
+        to_add = desired - current
+        for path in mdx_paths:
+            if path in to_add:
+                parser = create_parser(path, storage=config.get_mdx_storage())
+                if parser.load():
+                    _parsers[path] = parser
+        
+        # Rebuild the unified index if the loaded dictionaries or their order changed
+        loaded_paths = tuple(p for p in mdx_paths if p in _parsers)
+        if loaded_paths != _index_paths:
+            _rebuild_unified_index(loaded_paths)
+        
+        _last_mdx_paths = mdx_paths
+        _parser_list = [_parsers[p] for p in loaded_paths]
+        return list(_parser_list)
+
+
+def _rebuild_unified_index(loaded_paths: Tuple[str, ...]) -> None:
+    """Rebuild the merged key index, preserving mdx_paths priority order"""
+    global _index_paths, _key_index
     
-    return list(_parsers.values())
+    _unified_index.clear()
+    _key_index = None
+    for path in loaded_paths:
+        parser = _parsers[path]
+        if parser.storage != STORAGE_MEMORY:
+            continue
+        for key in parser.keys():
+            _unified_index.setdefault(key, parser)
+    _index_paths = loaded_paths
+
+
+def _has_local_entry(key: bytes, parsers: List[MDXParser]) -> bool:
+    """Check whether any loaded dictionary has an entry for key"""
+    if key in _unified_index:
+        return True
+    return any(parser.contains(key) for parser in parsers if parser.storage != STORAGE_MEMORY)
+
+
+def lookup_word_local(word: str) -> Optional[Dict]:
+    """
+    Look up a word in the configured MDX dictionaries
+    
+    In-memory dictionaries are only tried when the unified index has the
+    key; lazy and SQLite dictionaries are queried directly.
+    
+    Returns:
+        Dict with keys: phonetic, definition, example, html
+        None if word not found in any dictionary
+    """
+    parsers = get_parsers()
+    if not parsers:
+        return None
+    
+    word_lower = normalize_word(word)
+    if not word_lower:
+        return None
+    
+    # Try exact match first, then without special characters (e.g. "hello!" -> "hello")
+    word_clean = clean_word(word_lower)
+    keys = (word_lower,) if word_clean == word_lower else (word_lower, word_clean)
+    for key in keys:
+        key = key.encode('utf-8')
+        indexed = key in _unified_index
+        # Dictionaries in priority order; an empty or unparsable entry falls through
+        for parser in parsers:
+            if not indexed and parser.storage == STORAGE_MEMORY:
+                continue
+            result = parser.lookup_by_ref(key, include_html=False)
+            if result:
+                return result
+    
+    return None
+
+
+def suggest_prefix(prefix: str, limit: int = 10) -> List[str]:
+    """
+    Suggest dictionary words starting with prefix (e.g. for autocomplete)
+    
+    Returns:
+        Up to `limit` matching keys from all loaded MDX dictionaries
+    """
+    global _key_index
+    
+    prefix = normalize_word(prefix)
+    parsers = get_parsers()
+    if not prefix or not parsers:
+        return []
+    
+    if _key_index is None:
+        _key_index = KeyIndex.build(
+            tuple(parser.mdx_path for parser in parsers if parser.storage == STORAGE_MEMORY),
+            (key.decode('utf-8', 'replace') for key in _unified_index)
+        )
+    
+    matches = _key_index.iter_prefix(prefix, limit)
+    stores = [parser for parser in parsers if parser.storage != STORAGE_MEMORY]
+    if not stores:
+        return matches
+    
+    merged = set(matches)
+    for parser in stores:
+        merged.update(parser.prefix_search(prefix, limit))
+    return sorted(merged)[:limit]
 
 
 def lookup_word(word: str) -> Optional[Dict]:
@@ -52,36 +222,92 @@ def lookup_word(word: str) -> Optional[Dict]:
         return None
 
     mode = config.get_dictionary_mode()
+    key = (word, mode)
+
+    # If the same lookup is already running in another thread, wait for it
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight[key] = future
+
+    if not is_owner:
+        return future.result()
 
+    try:
+        # Successful results are persisted across sessions; fallbacks are not
+        cache_key = persist_cache.make_key(word, mode, _get_sources_fingerprint())
+        result = persist_cache.get(cache_key)
+        if result is None:
+            result = _lookup_word(word, mode)
+            if result:
+                persist_cache.put(cache_key, result)
+            else:
+                result = get_fallback_result(word)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _lookup_word(word: str, mode: str) -> Optional[Dict]:
+    """
+    Look up a word using the given dictionary mode
+    
+    Returns:
+        Dict with keys: phonetic, definition, example
+        None if word not found in any dictionary
+    """
     # Local only
     if mode == "local":
-        parsers = get_parsers()
-        for parser in parsers:
-            result = parser.lookup(word)
-            if result:
-                return result
-        return get_fallback_result(word)
+        return lookup_word_local(word)
 
     # Online only
     if mode == "online":
-        online_result = lookup_word_online(word)
-        if online_result:
-            return online_result
-        return get_fallback_result(word)
+        return lookup_word_online(word)
 
     # Auto: local first, then online
-    parsers = get_parsers()
-    for parser in parsers:
-        result = parser.lookup(word)
-        if result:
-            return result
+    result = lookup_word_local(word)
+    if result:
+        return result
+
+    return lookup_word_online(word)
 
-    online_result = lookup_word_online(word)
-    if online_result:
-        return online_result
+
+def _get_sources_fingerprint() -> str:
+    """
+    Describe the configured dictionaries, so cached results follow changes
     
-    # Not found in any dictionary
-    return get_fallback_result(word)
+    Covers the configuration, each MDX file's mtime and size (a file replaced
+    in place) and LOOKUP_CACHE_VERSION (changed extraction logic). Files are
+    stat-ed again whenever the config or the loaded dictionaries change.
+    """
+    global _fingerprint
+    
+    state = (config.version, _index_paths)
+    if _fingerprint is not None and _fingerprint[0] == state:
+        return _fingerprint[1]
+    
+    mdx_paths = config.get_mdx_paths()
+    files = []
+    for path in mdx_paths:
+        try:
+            stat = os.stat(path)
+            files.append([stat.st_mtime, stat.st_size])
+        except OSError:
+            files.append(None)
+    
+    fingerprint = json.dumps(
+        [LOOKUP_CACHE_VERSION, mdx_paths, files, config.get_online_dictionaries()],
+        sort_keys=True
+    )
+    _fingerprint = (state, fingerprint)
+    return fingerprint
 
 
 def lookup_word_online(word: str) -> Optional[Dict]:
@@ -95,11 +321,10 @@ def lookup_word_online(word: str) -> Optional[Dict]:
     if not word:
         return None
     
-    # Check cache first
-    if word in _online_cache:
-        return _online_cache[word]
+    word_norm = normalize_word(word)
+    if not word_norm:
+        return None
     
-    from .online import create_online_dictionary
     import logging
     
     logger = logging.getLogger(__name__)
@@ -121,22 +346,139 @@ def lookup_word_online(word: str) -> Optional[Dict]:
             continue
         
         try:
-            online_dict = create_online_dictionary(dict_config)
-            if online_dict:
-                result = online_dict.lookup(word)
-                if result:
-                    logger.info(f"Found word '{word}' in online dictionary: {dict_config.get('name')}")
-                    _online_cache[word] = result
-                    return result
+            # Results (including misses) are cached per normalized word and dictionary
+            result = _lookup_one_online(word_norm, json.dumps(dict_config, sort_keys=True))
+            if result:
+                logger.info(f"Found word '{word}' in online dictionary: {dict_config.get('name')}")
+                return result
         except Exception as e:
             logger.error(f"Error looking up word in {dict_config.get('name', 'unknown')}: {e}")
             continue
     
-    # Cache negative result to avoid repeated failed lookups
-    _online_cache[word] = None
     return None
 
 
+@lru_cache(maxsize=4096)
+def _lookup_one_online(word_norm: str, dict_config_key: str) -> Optional[Dict]:
+    """
+    Look up a normalized word in a single online dictionary (memoized)
+    
+    A word the dictionary has no entry for is cached as None. Network and
+    HTTP errors propagate, so failed requests are not cached and get retried.
+    
+    Args:
+        word_norm: Word normalized with normalize_word()
+        dict_config_key: Dictionary config serialized as sorted JSON (hashable)
+    """
+    from .online import create_online_dictionary
+    
+    with _prefetched_lock:
+        result = _prefetched.pop((word_norm, dict_config_key), _NOT_PREFETCHED)
+    if result is not _NOT_PREFETCHED:
+        return result
+    
+    online_dict = create_online_dictionary(json.loads(dict_config_key))
+    if not online_dict:
+        return None
+    return online_dict.fetch(word_norm)
+
+
+def prefetch_online(words: List[str]) -> None:
+    """
+    Fetch online entries for many words concurrently ahead of lookup_word()
+    
+    Words that the local dictionaries already cover (in auto mode) are
+    skipped. Later lookup_word() calls pick the results up instead of issuing
+    one request per word. Must be called from a background thread or a
+    context without a running event loop.
+    """
+    from .online import create_online_dictionary
+    from .online_async import lookup_many_sync
+    
+    mode = config.get_dictionary_mode()
+    if mode == "local":
+        return
+    
+    pending = {normalize_word(word) for word in words if word and word.strip()}
+    parsers = get_parsers()
+    if mode != "online" and parsers:
+        pending = {
+            word for word in pending
+            if not _has_local_entry(word.encode('utf-8'), parsers)
+            and not _has_local_entry(clean_word(word).encode('utf-8'), parsers)
+        }
+    
+    for dict_config in config.get_online_dictionaries():
+        if not pending:
+            break
+        if not dict_config.get('enabled', False):
+            continue
+        
+        online_dict = create_online_dictionary(dict_config)
+        if not online_dict:
+            continue
+        
+        dict_config_key = json.dumps(dict_config, sort_keys=True)
+        results = lookup_many_sync(online_dict, sorted(pending))
+        if not results:
+            # aiohttp unavailable or every request failed; lookups go one by one
+            break
+        
+        with _prefetched_lock:
+            for word, result in results.items():
+                _prefetched[(word, dict_config_key)] = result
+        
+        # Only words this dictionary did not find fall through to the next one
+        pending = {word for word in pending if not results.get(word)}
+
+
+def lookup_many(words: Iterable[str], max_workers: int = 8,
+                progress: Optional[Callable[[int], None]] = None) -> Dict[str, Optional[Dict]]:
+    """
+    Look up many words at once
+    
+    Duplicates are dropped and online entries are prefetched concurrently;
+    the remaining lookups run in sorted order on a thread pool, so lazy MDX
+    reads of neighbouring keys hit the same record blocks.
+    
+    Args:
+        words: Words to look up
+        max_workers: Number of lookups run in parallel
+        progress: Called with the number of words finished so far
+    
+    Returns:
+        {word: lookup_word(word)} for every distinct word; words whose lookup
+        raised are left out
+    """
+    unique = sorted({word for word in words if word})
+    if not unique:
+        return {}
+    
+    try:
+        prefetch_online(unique)
+    except Exception as e:
+        print(f"Online prefetch failed: {e}")
+    
+    results: Dict[str, Optional[Dict]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(lookup_word, word): word for word in unique}
+        for done, future in enumerate(as_completed(futures), 1):
+            word = futures[future]
+            try:
+                results[word] = future.result()
+            except Exception as e:
+                print(f"Lookup failed for '{word}': {e}")
+            if progress:
+                progress(done)
+    
+    return results
+
+
+def cache_info():
+    """Get online lookup cache statistics (hits, misses, maxsize, currsize)"""
+    return _lookup_one_online.cache_info()
+
+
 def get_fallback_result(word: str) -> Dict:
     """
     Get a fallback result when no dictionary is available
@@ -152,13 +494,24 @@ def get_fallback_result(word: str) -> Dict:
 
 def reload_dictionaries():
     """Reload all dictionaries (useful after config changes)"""
-    global _parsers, _online_cache
+    global _parsers, _index_paths, _key_index, _last_mdx_paths, _parser_list, _fingerprint
     
-    for parser in _parsers.values():
-        parser.close()
-    
-    _parsers.clear()
-    _online_cache.clear()
+    with _parsers_lock:
+        for parser in _parsers.values():
+            parser.close()
+        
+        _parsers.clear()
+        _last_mdx_paths = None
+        _parser_list = []
+        _unified_index.clear()
+        _index_paths = ()
+        _key_index = None
+        _fingerprint = None
+    _lookup_one_online.cache_clear()
+    # Dictionaries may have been replaced; drop persisted results too
+    persist_cache.clear()
+    with _prefetched_lock:
+        _prefetched.clear()
 
 
 def has_dictionaries() -> bool:
@@ -5,22 +5,156 @@ MDX dictionary parser for EasyWords
 This module handles parsing MDX dictionary files using mdict-utils library.
 """
 
-from typing import Optional, Dict
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple, Union
+import hashlib
+import itertools
 import os
 import re
 import logging
+import sqlite3
+import threading
+import unicodedata
 
 logger = logging.getLogger(__name__)
 
+USER_FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'user_files')
+
+# Entry storage modes (config key "mdx_storage")
+STORAGE_MEMORY = 'memory'  # All entries in memory (dict or marisa-trie)
+STORAGE_LAZY = 'lazy'      # Key -> record offset index, entries read from the MDX on demand
+STORAGE_SQLITE = 'sqlite'  # Entries in an SQLite table in user_files, built once per MDX file
+
+# Precompiled patterns used on every lookup
+_PHONETIC_RE = re.compile(r'/([^/]+)/')
+# Script/style blocks and tags stripped in a single pass
+_STRIP_RE = re.compile(r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<[^>]+>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_EXAMPLE_RE = re.compile(r'<span[^>]*class=["\']example["\'][^>]*>(.*?)</span>', re.DOTALL)
+_NONWORD_RE = re.compile(r'[^\w\s-]')
+# ASCII equivalent of _NONWORD_RE for str.translate
+_PUNCT_TABLE = str.maketrans('', '', ''.join(chr(i) for i in range(128) if _NONWORD_RE.match(chr(i))))
+# First visible (non-tag, non-whitespace) character, for cheap field probing
+_TEXT_RE = re.compile(r'(?:^|>)\s*[^<\s]')
+
+# Bytes versions of the parsing patterns, so raw entries need not be decoded whole
+_PHONETIC_RE_B = re.compile(_PHONETIC_RE.pattern.encode())
+_STRIP_RE_B = re.compile(_STRIP_RE.pattern.encode(), re.DOTALL)
+_TAG_RE_B = re.compile(_TAG_RE.pattern.encode())
+_WS_RE_B = re.compile(rb'\s+')
+_EXAMPLE_RE_B = re.compile(_EXAMPLE_RE.pattern.encode(), re.DOTALL)
+
+# Optional fast HTML parser (C extension), used to strip markup in one tree walk
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+except ImportError:
+    _FastHTMLParser = None
+
+# Optional compact trie (C extension) for in-memory entries; shares key prefixes
+try:
+    import marisa_trie
+except ImportError:
+    marisa_trie = None
+
+# Optional bloom filter, lets SQLite-backed lookups reject unknown words without a query
+try:
+    from pybloom_live import BloomFilter
+except ImportError:
+    BloomFilter = None
+
+
+def clean_word(word: str) -> str:
+    """Strip special characters from a lookup word (e.g. "hello!" -> "hello")"""
+    if word.isascii():
+        return word.translate(_PUNCT_TABLE)
+    return _NONWORD_RE.sub('', word)
+
+
+@lru_cache(maxsize=4096)
+def normalize_word(word: str) -> str:
+    """
+    Normalize a query word the same way dictionary keys are normalized
+    
+    NFKC folds composed/decomposed and fullwidth forms (e.g. "café", "ｗｏｒｄ")
+    before lowercasing. Memoized, since the same words are looked up repeatedly.
+    """
+    if word.isascii():
+        return word.lower().strip()
+    return unicodedata.normalize('NFKC', word).lower().strip()
+
+
+def _normalize_key(key) -> bytes:
+    """Lowercase a raw MDX key without decoding it when it is plain ASCII"""
+    if not isinstance(key, bytes):
+        return unicodedata.normalize('NFKC', str(key)).lower().encode('utf-8')
+    if key.isascii():
+        return key.lower()
+    # bytes.lower() only folds ASCII (and NFKC leaves ASCII unchanged),
+    # so non-ASCII keys take the slow path
+    return unicodedata.normalize('NFKC', key.decode('utf-8', 'replace')).lower().encode('utf-8')
+
+
+def _quick_field_probe(html: str) -> Tuple[bool, bool, bool]:
+    """
+    Cheaply check which fields _parse_html() would fill for an entry
+    
+    Returns:
+        (has_phonetic, has_definition, has_example)
+    """
+    has_phonetic = _PHONETIC_RE.search(html) is not None
+    has_definition = _TEXT_RE.search(html) is not None
+    has_example = 'class="example"' in html or "class='example'" in html
+    return has_phonetic, has_definition, has_example
+
+
+def _sqlite_store_path(mdx_path: str) -> str:
+    """Get the SQLite entry store path for an MDX file (changes with its mtime)"""
+    digest = hashlib.sha1(mdx_path.encode('utf-8'))
+    # Bump when _normalize_key() changes, so stores with old keys are rebuilt
+    digest.update(b'keys-v2')
+    try:
+        digest.update(str(os.path.getmtime(mdx_path)).encode('utf-8'))
+    except OSError:
+        pass
+    return os.path.join(USER_FILES_DIR, f"mdx_store_{digest.hexdigest()[:16]}.sqlite3")
+
 
 class MDXParser:
     """Parser for MDX dictionary files using mdict-utils"""
     
-    def __init__(self, mdx_path: str):
+    # Number of entries kept decoded in lazy mode
+    VALUE_CACHE_SIZE = 256
+    
+    def __init__(self, mdx_path: str, storage: str = STORAGE_MEMORY):
+        """
+        Args:
+            mdx_path: Path to the MDX file
+            storage: Where entries live after load (STORAGE_MEMORY,
+                STORAGE_LAZY or STORAGE_SQLITE)
+        """
         self.mdx_path = mdx_path
+        self.storage = storage
+        self.lazy = storage == STORAGE_LAZY
         self.is_loaded = False
-        self._word_dict: Dict[str, bytes] = {}
+        # Keys are lowercased UTF-8 bytes, see _normalize_key()
+        self._word_dict: Dict[bytes, bytes] = {}
+        # Eager mode with marisa-trie: replaces _word_dict once loaded
+        self._trie = None
+        # Lazy mode: {word_key: (record_offset, record_length)}
+        self._offsets: Dict[bytes, Tuple[int, int]] = {}
+        self._value_cache: "OrderedDict[bytes, Union[str, bytes]]" = OrderedDict()
+        self._value_cache_lock = threading.Lock()
+        # SQLite mode: connection to the entry store, shared across threads
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+        # SQLite mode: bloom filter over all keys, built when the store opens;
+        # it stands in for the unified index, which leaves SQLite keys out
+        self._bloom = None
         self._mdx = None
+        # Result of get_available_fields(), kept until close()
+        self._cached_fields: Optional[Dict[str, str]] = None
     
     def load(self) -> bool:
         """Load the MDX dictionary"""
@@ -31,19 +165,43 @@ class MDXParser:
             logger.error(f"MDX file not found: {self.mdx_path}")
             return False
         
+        if self.storage == STORAGE_SQLITE and self._open_sqlite_store():
+            return True
+        
         try:
             from mdict_utils.reader import MDX
             
             logger.info(f"Loading MDX dictionary: {self.mdx_path}")
             self._mdx = MDX(self.mdx_path)
             
-            # Load all entries into memory for fast lookup
-            for key, value in self._mdx.items():
-                word_key = key.decode('utf-8').lower() if isinstance(key, bytes) else str(key).lower()
-                self._word_dict[word_key] = value
+            if self.storage == STORAGE_SQLITE:
+                entry_count = self._build_sqlite_store()
+                if entry_count is None:
+                    return False
+            elif self.lazy:
+                # Only record where each entry lives; values are read on demand
+                key_list = self._mdx._key_list
+                offsets = [offset for offset, _ in key_list]
+                # Record length = next record's offset - this offset (-1: to the end)
+                lengths = [end - start for start, end in zip(offsets, offsets[1:])] + [-1]
+                # ASCII keys are lowercased inline, saving a call per entry
+                self._offsets = {
+                    (key.lower() if key.__class__ is bytes and key.isascii() else _normalize_key(key)):
+                        (offset, length)
+                    for (offset, key), length in zip(key_list, lengths)
+                }
+                entry_count = len(self._offsets)
+            else:
+                # Load all entries into memory for fast lookup
+                self._word_dict = {
+                    (key.lower() if key.__class__ is bytes and key.isascii() else _normalize_key(key)): value
+                    for key, value in self._mdx.items()
+                }
+                entry_count = len(self._word_dict)
+                self._compact()
             
             self.is_loaded = True
-            logger.info(f"Loaded {len(self._word_dict)} dictionary entries")
+            logger.info(f"Loaded {entry_count} dictionary entries")
             return True
             
         except ImportError as e:
@@ -65,24 +223,242 @@ class MDXParser:
             if not self.load():
                 return None
         
-        word_lower = word.lower().strip()
+        word_lower = normalize_word(word)
         if not word_lower:
             return None
         
         # Try exact match first
-        html_content = self._word_dict.get(word_lower)
+        html_content = self._get_raw(word_lower.encode('utf-8'))
         
         # If not found, try without special characters
         if not html_content:
             # Try variations (e.g., "hello!" -> "hello")
-            word_clean = re.sub(r'[^\w\s-]', '', word_lower)
-            html_content = self._word_dict.get(word_clean)
+            word_clean = clean_word(word_lower)
+            if word_clean != word_lower:
+                html_content = self._get_raw(word_clean.encode('utf-8'))
         
         if not html_content:
             logger.debug(f"Word not found in dictionary: {word}")
             return None
         
+        return self._parse_entry(word, html_content)
+    
+    def _open_sqlite_store(self) -> bool:
+        """Open an existing SQLite entry store for this MDX file, if any"""
+        store_path = _sqlite_store_path(self.mdx_path)
+        if not os.path.exists(store_path):
+            return False
+        
+        try:
+            conn = sqlite3.connect(store_path, check_same_thread=False)
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("SELECT 1 FROM entries LIMIT 1")
+            # Built while loading (e.g. during warm-up), not under the first lookup
+            bloom = self._build_bloom(conn) if BloomFilter is not None else None
+        except Exception as e:
+            logger.warning(f"Failed to open dictionary store {store_path}: {e}")
+            return False
+        
+        self._bloom = bloom
+        self._conn = conn
+        self.is_loaded = True
+        logger.info(f"Opened dictionary store for {self.mdx_path}")
+        return True
+    
+    def _build_sqlite_store(self) -> Optional[int]:
+        """
+        Write all MDX entries into a new SQLite entry store and open it
+        
+        Returns:
+            Number of entries, or None if the store could not be built
+        """
+        store_path = _sqlite_store_path(self.mdx_path)
+        tmp_path = store_path + '.tmp'
+        try:
+            os.makedirs(USER_FILES_DIR, exist_ok=True)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            
+            # Build under a temporary name so an interrupted build is never reused
+            conn = sqlite3.connect(tmp_path)
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE entries(k BLOB PRIMARY KEY, v BLOB) WITHOUT ROWID")
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries(k, v) VALUES (?, ?)",
+                    ((_normalize_key(key), value) for key, value in self._mdx.items())
+                )
+            entry_count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            conn.close()
+            os.replace(tmp_path, store_path)
+        except Exception as e:
+            logger.error(f"Failed to build dictionary store for {self.mdx_path}: {e}", exc_info=True)
+            return None
+        
+        self._mdx = None
+        if not self._open_sqlite_store():
+            return None
+        return entry_count
+    
+    @staticmethod
+    def _build_bloom(conn: sqlite3.Connection):
+        """Build a bloom filter over the keys of a SQLite entry store"""
+        count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        bloom = BloomFilter(capacity=max(count, 1) * 2, error_rate=0.001)
+        for (key,) in conn.execute("SELECT k FROM entries"):
+            bloom.add(key)
+        return bloom
+    
+    def _compact(self):
+        """Move loaded entries into a marisa-trie, if available"""
+        if marisa_trie is None or not self._word_dict:
+            return
+        
         try:
+            # Keys are valid UTF-8 after _normalize_key(), so decoding is lossless
+            self._trie = marisa_trie.BytesTrie(
+                (key.decode('utf-8'), value) for key, value in self._word_dict.items()
+            )
+        except Exception as e:
+            logger.warning(f"Failed to build dictionary trie, keeping dict: {e}")
+            self._trie = None
+            return
+        self._word_dict = {}
+    
+    def keys(self):
+        """Get the keys of all loaded entries (lowercased UTF-8 bytes)"""
+        if not self.is_loaded:
+            if not self.load():
+                return []
+        if self._trie is not None:
+            return [key.encode('utf-8') for key in self._trie.iterkeys()]
+        if self._conn is not None:
+            with self._conn_lock:
+                return [row[0] for row in self._conn.execute("SELECT k FROM entries")]
+        return self._offsets.keys() if self.lazy else self._word_dict.keys()
+    
+    def _sample_keys(self, count: int) -> List[bytes]:
+        """Get up to count entry keys without listing the whole dictionary"""
+        if self._trie is not None:
+            return [key.encode('utf-8') for key in itertools.islice(self._trie.iterkeys(), count)]
+        if self._conn is not None:
+            with self._conn_lock:
+                return [row[0] for row in self._conn.execute("SELECT k FROM entries LIMIT ?", (count,))]
+        return list(itertools.islice(self._offsets if self.lazy else self._word_dict, count))
+    
+    def prefix_search(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Find entry keys starting with prefix
+        
+        Returns:
+            Up to `limit` matching keys
+        """
+        if not self.is_loaded:
+            if not self.load():
+                return []
+        
+        prefix = normalize_word(prefix)
+        if self._trie is not None:
+            return list(itertools.islice(self._trie.iterkeys(prefix), limit))
+        
+        prefix_bytes = prefix.encode('utf-8')
+        if self._conn is not None:
+            # Range scan on the primary key; 0xFF never occurs in UTF-8
+            with self._conn_lock:
+                rows = self._conn.execute(
+                    "SELECT k FROM entries WHERE k >= ? AND k < ? ORDER BY k LIMIT ?",
+                    (prefix_bytes, prefix_bytes + b'\xff', limit)
+                ).fetchall()
+            return [row[0].decode('utf-8', 'replace') for row in rows]
+        
+        matches = (key for key in self.keys() if key.startswith(prefix_bytes))
+        return [key.decode('utf-8', 'replace') for key in itertools.islice(matches, limit)]
+    
+    def contains(self, key: bytes) -> bool:
+        """Check whether an entry exists for an exact key (lowercased UTF-8 bytes)"""
+        if not self.is_loaded:
+            return False
+        if self._trie is not None:
+            return key.decode('utf-8', 'replace') in self._trie
+        if self._conn is not None:
+            if self._bloom is not None and key not in self._bloom:
+                return False
+            try:
+                with self._conn_lock:
+                    row = self._conn.execute("SELECT 1 FROM entries WHERE k = ?", (key,)).fetchone()
+            except Exception as e:
+                logger.error(f"Failed to check dictionary entry {key!r}: {e}", exc_info=True)
+                return False
+            return row is not None
+        return key in (self._offsets if self.lazy else self._word_dict)
+    
+    def _get_raw(self, key: bytes) -> Optional[Union[str, bytes]]:
+        """Get the raw entry content for an exact key"""
+        if self._trie is not None:
+            hits = self._trie.get(key.decode('utf-8', 'replace'))
+            return hits[0] if hits else None
+        if self._conn is not None:
+            if self._bloom is not None and key not in self._bloom:
+                return None
+            try:
+                with self._conn_lock:
+                    row = self._conn.execute("SELECT v FROM entries WHERE k = ?", (key,)).fetchone()
+            except Exception as e:
+                logger.error(f"Failed to read dictionary entry {key!r}: {e}", exc_info=True)
+                return None
+            return row[0] if row else None
+        if not self.lazy:
+            return self._word_dict.get(key)
+        
+        with self._value_cache_lock:
+            cached = self._value_cache.get(key)
+            if cached is not None:
+                self._value_cache.move_to_end(key)
+                return cached
+        
+        location = self._offsets.get(key)
+        if location is None:
+            return None
+        
+        try:
+            from mdict_utils.reader import get_record
+            offset, length = location
+            value = get_record(self._mdx, key, offset, length)
+        except Exception as e:
+            logger.error(f"Failed to read dictionary entry {key!r}: {e}", exc_info=True)
+            return None
+        
+        with self._value_cache_lock:
+            self._value_cache[key] = value
+            if len(self._value_cache) > self.VALUE_CACHE_SIZE:
+                self._value_cache.popitem(last=False)
+        return value
+    
+    def lookup_by_ref(self, ref: bytes, include_html: bool = True) -> Optional[Dict]:
+        """
+        Look up an entry by its exact key as returned by keys()
+        
+        Args:
+            ref: Entry key
+            include_html: Add the full entry HTML to the result; without it,
+                raw entries are parsed as bytes and never decoded whole
+        
+        Returns:
+            Dict with keys: phonetic, definition, example, html (optional)
+            None if entry not found
+        """
+        html_content = self._get_raw(ref)
+        if not html_content:
+            return None
+        return self._parse_entry(ref.decode('utf-8', 'replace'), html_content, include_html)
+    
+    def _parse_entry(self, word: str, html_content, include_html: bool = True) -> Optional[Dict]:
+        """Decode and parse a raw dictionary entry"""
+        try:
+            if not include_html and isinstance(html_content, bytes):
+                return self._parse_html(html_content)
+            
             # Decode HTML content
             html = html_content.decode('utf-8') if isinstance(html_content, bytes) else str(html_content)
             
@@ -96,11 +472,12 @@ class MDXParser:
             logger.error(f"Failed to parse dictionary entry for '{word}': {e}", exc_info=True)
             return None
     
-    def _parse_html(self, html: str) -> Dict:
+    def _parse_html(self, html: Union[str, bytes]) -> Dict:
         """
-        Parse HTML content from MDX to extract useful information
+        Parse HTML content from MDX to extract information
         
-        This is customized for Collins dictionary format
+        This is customized for Collins dictionary format. Raw UTF-8 bytes are
+        scanned as bytes; only the extracted pieces are decoded.
         """
         result = {
             'phonetic': '',
@@ -108,19 +485,35 @@ class MDXParser:
             'example': ''
         }
         
+        is_bytes = isinstance(html, bytes)
+        if is_bytes:
+            phonetic_re, strip_re, tag_re, ws_re, example_re = (
+                _PHONETIC_RE_B, _STRIP_RE_B, _TAG_RE_B, _WS_RE_B, _EXAMPLE_RE_B)
+        else:
+            phonetic_re, strip_re, tag_re, ws_re, example_re = (
+                _PHONETIC_RE, _STRIP_RE, _TAG_RE, _WS_RE, _EXAMPLE_RE)
+        
+        def _text(value) -> str:
+            return value.decode('utf-8', 'replace') if is_bytes else value
+        
         try:
             # Extract phonetic (if present in the dictionary)
             # Collins format: look for pronunciation patterns
-            phonetic_match = re.search(r'/([^/]+)/', html)
+            phonetic_match = phonetic_re.search(html)
             if phonetic_match:
-                result['phonetic'] = phonetic_match.group(1)
+                result['phonetic'] = _text(phonetic_match.group(1))
             
             # Remove HTML tags for definition
             # Strip tags but keep content
-            text = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL)
-            text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
-            text = re.sub(r'<[^>]+>', ' ', text)
-            text = re.sub(r'\s+', ' ', text).strip()
+            if _FastHTMLParser is not None:
+                tree = _FastHTMLParser(html)
+                for node in tree.css('script, style'):
+                    node.decompose()
+                text = tree.root.text(separator=' ') if tree.root else ''
+            else:
+                tree = None
+                text = _text(ws_re.sub(b' ' if is_bytes else ' ', strip_re.sub(b' ' if is_bytes else ' ', html)))
+            text = _WS_RE.sub(' ', text).strip()
             
             # Take first 500 chars as definition
             if len(text) > 500:
@@ -130,9 +523,12 @@ class MDXParser:
             
             # Try to find example sentences (usually in specific tags)
             # This is a simplified approach - customize based on your dictionary format
-            example_match = re.findall(r'<span[^>]*class=["\']example["\'][^>]*>(.*?)</span>', html, re.DOTALL)
-            if example_match:
-                examples = [re.sub(r'<[^>]+>', '', ex).strip() for ex in example_match[:2]]
+            if tree is not None:
+                examples = [node.text().strip() for node in tree.css('span.example')[:2]]
+            else:
+                examples = [_text(tag_re.sub(b'' if is_bytes else '', ex)).strip()
+                            for ex in example_re.findall(html)[:2]]
+            if examples:
                 result['example'] = ' '.join(examples)
             
         except Exception as e:
@@ -149,12 +545,16 @@ class MDXParser:
         Returns:
             Dict mapping field name to description
         """
+        if self._cached_fields is not None:
+            return dict(self._cached_fields)
+        
         if not self.is_loaded:
             if not self.load():
                 return {}
         
         # Sample a few entries to determine available fields
-        sample_size = min(10, len(self._word_dict))
+        sample = self._sample_keys(10)
+        sample_size = len(sample)
         if sample_size == 0:
             return {}
         
@@ -165,17 +565,19 @@ class MDXParser:
         }
         
         # Check sample entries
-        for word_key in list(self._word_dict.keys())[:sample_size]:
-            html_content = self._word_dict[word_key]
+        for word_key in sample:
+            html_content = self._get_raw(word_key)
+            if not html_content:
+                continue
             try:
                 html = html_content.decode('utf-8') if isinstance(html_content, bytes) else str(html_content)
-                result = self._parse_html(html)
+                has_phonetic, has_definition, has_example = _quick_field_probe(html)
                 
-                if result.get('phonetic'):
+                if has_phonetic:
                     fields['phonetic'] += 1
-                if result.get('definition'):
+                if has_definition:
                     fields['definition'] += 1
-                if result.get('example'):
+                if has_example:
                     fields['example'] += 1
             except Exception as e:
                 logger.warning(f"Failed to parse sample entry: {e}")
@@ -192,19 +594,33 @@ class MDXParser:
         if fields['example'] >= threshold:
             available['Example'] = 'Example sentences'
         
-        return available
+        self._cached_fields = available
+        return dict(available)
+    
+    def invalidate_fields(self):
+        """Forget the detected fields so the next get_available_fields() rescans"""
+        self._cached_fields = None
     
     def close(self):
         """Close the dictionary and free resources"""
         self.is_loaded = False
+        self._cached_fields = None
         self._word_dict.clear()
+        self._trie = None
+        self._offsets.clear()
+        self._value_cache.clear()
+        if self._conn is not None:
+            with self._conn_lock:
+                self._conn.close()
+            self._conn = None
+        self._bloom = None
         self._mdx = None
 
 
-def create_parser(mdx_path: str) -> MDXParser:
+def create_parser(mdx_path: str, storage: str = STORAGE_MEMORY) -> MDXParser:
     """
     Factory function to create an MDX parser
     
     Returns MDXParser which uses mdict-utils library.
     """
-    return MDXParser(mdx_path)
+    return MDXParser(mdx_path, storage=storage)
@@ -4,11 +4,79 @@ Online Dictionary APIs for EasyWords
 """
 
 import json
+import re
 import urllib.request
 import urllib.parse
 import urllib.error
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
+
+
+# First non-blank line of a Wiktionary extract that is not a "== Heading =="
+_FIRST_DEF_RE = re.compile(r'^[^\S\n]*([^=\s][^\n]*?)[^\S\n]*$', re.MULTILINE)
+
+# JSON decoder for response bodies: orjson parses bytes directly when available
+try:
+    from orjson import loads as _loads
+except ImportError:
+    def _loads(body) -> Any:
+        """Decode a JSON response body (bytes or str)"""
+        return json.loads(body.decode('utf-8') if isinstance(body, bytes) else body)
+
+
+# Shared HTTP session (keep-alive, connection pooling), created on first use
+_session = None
+
+
+def _get_session():
+    """Get the shared requests session, or None if requests is unavailable"""
+    global _session
+    if _session is None:
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+        except ImportError:
+            return None
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+    return _session
+
+
+def _get_json(url: str, headers: Optional[Dict[str, str]] = None) -> Any:
+    """
+    GET a URL and decode its JSON body
+    
+    Returns:
+        Decoded JSON, or None on HTTP 404 (word not found)
+    
+    Raises:
+        Exception on other HTTP or network errors
+    """
+    session = _get_session()
+    if session is not None:
+        response = session.get(url, headers=headers, timeout=10)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return _loads(response.content)
+    
+    req = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return _loads(response.read())
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
 
 
 class OnlineDictionary(ABC):
@@ -17,11 +85,53 @@ class OnlineDictionary(ABC):
     def __init__(self, name: str):
         self.name = name
     
-    @abstractmethod
     def lookup(self, word: str) -> Optional[Dict[str, str]]:
         """
         Look up a word
         
+        Returns:
+            Dict with keys: phonetic, definition, example
+            None if not found
+        """
+        try:
+            return self.fetch(word)
+        except Exception as e:
+            print(f"{type(self).__name__} Error: {e}")
+        
+        return None
+    
+    def fetch(self, word: str) -> Optional[Dict[str, str]]:
+        """
+        Look up a word, letting network and HTTP errors propagate
+        
+        Returns:
+            Dict with keys: phonetic, definition, example
+            None if the dictionary has no entry for the word
+        """
+        if not word:
+            return None
+        
+        url, headers = self.build_request(word)
+        return self.parse_response(_get_json(url, headers=headers))
+    
+    @abstractmethod
+    def build_request(self, word: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Build the GET request for a word
+        
+        Returns:
+            (url, headers)
+        """
+        pass
+    
+    @abstractmethod
+    def parse_response(self, data: Any) -> Optional[Dict[str, str]]:
+        """
+        Extract fields from a decoded JSON response
+        
+        Args:
+            data: Decoded JSON body, or None if the API answered 404
+        
         Returns:
             Dict with keys: phonetic, definition, example
             None if not found
@@ -40,61 +150,47 @@ class FreeDictionaryAPI(OnlineDictionary):
     def __init__(self):
         super().__init__("Free Dictionary API")
     
-    def lookup(self, word: str) -> Optional[Dict[str, str]]:
-        if not word:
+    def build_request(self, word: str) -> Tuple[str, Dict[str, str]]:
+        return self.API_URL.format(urllib.parse.quote(word)), {}
+    
+    def parse_response(self, data: Any) -> Optional[Dict[str, str]]:
+        if not isinstance(data, list) or not data:
             return None
-            
-        url = self.API_URL.format(urllib.parse.quote(word))
         
-        try:
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                
-                if not isinstance(data, list) or not data:
-                    return None
-                
-                entry = data[0]
-                result = {
-                    'phonetic': '',
-                    'definition': '',
-                    'example': ''
-                }
-                
-                # Extract Phonetic
-                if 'phonetic' in entry:
-                    result['phonetic'] = entry['phonetic']
-                elif 'phonetics' in entry:
-                    for p in entry['phonetics']:
-                        if 'text' in p:
-                            result['phonetic'] = p['text']
-                            break
-                
-                # Extract Definition and Example
-                if 'meanings' in entry:
-                    for meaning in entry['meanings']:
-                        if 'definitions' in meaning:
-                            for definition in meaning['definitions']:
-                                if not result['definition'] and 'definition' in definition:
-                                    result['definition'] = definition['definition']
-                                
-                                if not result['example'] and 'example' in definition:
-                                    result['example'] = definition['example']
-                                
-                                if result['definition'] and result['example']:
-                                    break
-                        if result['definition'] and result['example']:
-                            break
-                            
-                return result
-                
-        except urllib.error.HTTPError as e:
-            if e.code == 404:
-                return None  # Word not found
-            print(f"FreeDictionaryAPI HTTP Error: {e}")
-        except Exception as e:
-            print(f"FreeDictionaryAPI Error: {e}")
+        entry = data[0]
+        result = {
+            'phonetic': '',
+            'definition': '',
+            'example': ''
+        }
+        
+        # Extract Phonetic
+        if 'phonetic' in entry:
+            result['phonetic'] = entry['phonetic']
+        elif 'phonetics' in entry:
+            for p in entry['phonetics']:
+                if 'text' in p:
+                    result['phonetic'] = p['text']
+                    break
+        
+        # Extract Definition and Example (first of each, across all senses)
+        for definition in _iter_definitions(entry):
+            if not result['definition'] and 'definition' in definition:
+                result['definition'] = definition['definition']
             
-        return None
+            if not result['example'] and 'example' in definition:
+                result['example'] = definition['example']
+            
+            if result['definition'] and result['example']:
+                break
+                    
+        return result
+
+
+def _iter_definitions(entry: Dict[str, Any]):
+    """Yield every definition dict of a Free Dictionary entry, sense by sense"""
+    for meaning in entry.get('meanings', ()):
+        yield from meaning.get('definitions', ())
 
 
 class WiktionaryAPI(OnlineDictionary):
@@ -104,62 +200,46 @@ class WiktionaryAPI(OnlineDictionary):
     
     API_URL = "https://en.wiktionary.org/w/api.php?action=query&format=json&prop=extracts&titles={}&redirects=1&explaintext=1&exintro=1"
     
+    # User-Agent is required by Wikimedia API
+    HEADERS = {'User-Agent': 'EasyWordsAnkiAddon/1.0 (mailto:user@example.com)'}
+    
     def __init__(self):
         super().__init__("Wiktionary (English)")
     
-    def lookup(self, word: str) -> Optional[Dict[str, str]]:
-        if not word:
+    def build_request(self, word: str) -> Tuple[str, Dict[str, str]]:
+        return self.API_URL.format(urllib.parse.quote(word)), self.HEADERS
+    
+    def parse_response(self, data: Any) -> Optional[Dict[str, str]]:
+        if not data:
             return None
-            
-        url = self.API_URL.format(urllib.parse.quote(word))
         
-        try:
-            # User-Agent is required by Wikimedia API
-            req = urllib.request.Request(
-                url, 
-                headers={'User-Agent': 'EasyWordsAnkiAddon/1.0 (mailto:user@example.com)'}
-            )
-            
-            with urllib.request.urlopen(req) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                
-                pages = data.get('query', {}).get('pages', {})
-                if not pages:
-                    return None
-                
-                # Get the first page
-                page_id = list(pages.keys())[0]
-                if page_id == "-1":
-                    return None  # Missing
-                
-                page = pages[page_id]
-                extract = page.get('extract', '')
-                
-                if not extract:
-                    return None
-                
-                # Parse extract (very basic parsing)
-                # Wiktionary extracts are unstructured text. 
-                # We'll try to get the first paragraph as definition.
-                
-                lines = extract.split('\n')
-                definition = ""
-                for line in lines:
-                    line = line.strip()
-                    if line and not line.startswith('='):
-                        definition = line
-                        break
-                
-                return {
-                    'phonetic': '', # Wiktionary extract doesn't reliably provide phonetic in plain text
-                    'definition': definition,
-                    'example': '' # Hard to extract example reliably from plain text summary
-                }
-                
-        except Exception as e:
-            print(f"WiktionaryAPI Error: {e}")
-            
-        return None
+        pages = data.get('query', {}).get('pages', {})
+        if not pages:
+            return None
+        
+        # Get the first page
+        page_id = list(pages.keys())[0]
+        if page_id == "-1":
+            return None  # Missing
+        
+        page = pages[page_id]
+        extract = page.get('extract', '')
+        
+        if not extract:
+            return None
+        
+        # Parse extract (very basic parsing)
+        # Wiktionary extracts are unstructured text. 
+        # We'll try to get the first paragraph as definition.
+        
+        match = _FIRST_DEF_RE.search(extract)
+        definition = match.group(1) if match else ""
+        
+        return {
+            'phonetic': '', # Wiktionary extract doesn't reliably provide phonetic in plain text
+            'definition': definition,
+            'example': '' # Hard to extract example reliably from plain text summary
+        }
 
 
 def create_online_dictionary(config: Dict[str, Any]) -> Optional[OnlineDictionary]:
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Asynchronous batch lookups against online dictionary APIs
+"""
+
+import asyncio
+import importlib.util
+from typing import Dict, List, Optional
+
+from .online import OnlineDictionary, _loads
+
+
+# Maximum number of requests kept in flight at once
+MAX_CONCURRENCY = 16
+
+
+async def lookup_many(online_dict: OnlineDictionary, words: List[str],
+                      max_concurrency: int = MAX_CONCURRENCY) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Look up several words concurrently over a shared connection pool
+
+    Args:
+        online_dict: Dictionary that builds requests and parses responses
+        words: Words to look up
+        max_concurrency: Maximum number of requests in flight
+
+    Returns:
+        {word: result} for every word that got an answer (result is None if
+        the word was not found). Words whose request failed are left out.
+    """
+    import aiohttp
+
+    results: Dict[str, Optional[Dict[str, str]]] = {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=30)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+
+        async def _lookup(word: str):
+            async with semaphore:
+                try:
+                    url, headers = online_dict.build_request(word)
+                    async with session.get(url, headers=headers) as response:
+                        if response.status == 404:
+                            data = None
+                        else:
+                            response.raise_for_status()
+                            data = _loads(await response.read())
+                    results[word] = online_dict.parse_response(data)
+                except Exception as e:
+                    print(f"{type(online_dict).__name__} Error: {e}")
+
+        await asyncio.gather(*(_lookup(word) for word in words if word))
+
+    return results
+
+
+def lookup_many_sync(online_dict: OnlineDictionary,
+                     words: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Look up several words concurrently from synchronous code
+
+    Runs its own event loop, so it must not be called from a running loop.
+    Returns an empty dict when aiohttp is not available; callers then fall
+    back to per-word lookups.
+
+    Returns:
+        {word: result} as for lookup_many()
+    """
+    if importlib.util.find_spec("aiohttp") is None:
+        return {}
+
+    return asyncio.run(lookup_many(online_dict, words))
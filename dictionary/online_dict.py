@@ -3,9 +3,8 @@
 Online dictionary support for EasyWords
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent lookup result cache for EasyWords
+
+Successful dictionary lookups are stored in an SQLite database in
+user_files, so re-filling a note with an unchanged word does not hit
+the dictionaries or the network again across Anki sessions.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Optional, Dict
+
+logger = logging.getLogger(__name__)
+
+USER_FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'user_files')
+DB_PATH = os.path.join(USER_FILES_DIR, 'lookup_cache.sqlite3')
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def _hash(text: str) -> str:
+    """Hash a cache key, using xxhash when available"""
+    try:
+        import xxhash
+        return xxhash.xxh64(text.encode('utf-8')).hexdigest()
+    except ImportError:
+        import hashlib
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def make_key(word: str, mode: str, sources: str = "") -> str:
+    """
+    Build the cache key for a lookup
+    
+    Args:
+        word: The looked up word
+        mode: Dictionary mode (local/online/auto)
+        sources: Fingerprint of the configured dictionaries
+    """
+    return _hash(f"{word}|{mode}|{sources}")
+
+
+def _get_connection() -> Optional[sqlite3.Connection]:
+    """Open the cache database on first use"""
+    global _conn
+    if _conn is None:
+        try:
+            os.makedirs(USER_FILES_DIR, exist_ok=True)
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS results(hash TEXT PRIMARY KEY, json TEXT)")
+            conn.commit()
+            _conn = conn
+        except Exception as e:
+            logger.warning(f"Failed to open lookup cache: {e}")
+            return None
+    return _conn
+
+
+def get(key: str) -> Optional[Dict]:
+    """Get a cached lookup result, or None if not cached"""
+    with _lock:
+        conn = _get_connection()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT json FROM results WHERE hash = ?", (key,)).fetchone()
+        except Exception as e:
+            logger.warning(f"Failed to read lookup cache: {e}")
+            return None
+    return json.loads(row[0]) if row else None
+
+
+def put(key: str, result: Dict) -> None:
+    """Store a successful lookup result"""
+    with _lock:
+        conn = _get_connection()
+        if conn is None:
+            return
+        try:
+            conn.execute("INSERT OR REPLACE INTO results(hash, json) VALUES (?, ?)",
+                         (key, json.dumps(result, ensure_ascii=False)))
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to write lookup cache: {e}")
+
+
+def clear() -> None:
+    """Remove all cached lookup results"""
+    with _lock:
+        conn = _get_connection()
+        if conn is None:
+            return
+        try:
+            conn.execute("DELETE FROM results")
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to clear lookup cache: {e}")
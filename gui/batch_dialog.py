@@ -3,14 +3,81 @@
 Batch processing dialog for EasyWords
 """
 
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Dict, List
+
 from aqt.qt import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                     QCheckBox, QGroupBox, QProgressBar)
-from aqt.utils import showInfo, tooltip
+                     QCheckBox, QGroupBox, QProgressBar, QTimer)
+from aqt.utils import showInfo
 from aqt import mw
+from anki.utils import ids2str
+
+from ..note_type import get_mapped_fields
+from ..config import config
+from ..dictionary.lookup import lookup_many, LookupResult
+from ..dictionary.mdx_parser import normalize_word
+from ..tts.manager import generate_audio_batch, collect_batch, warmup_engine
+
 
-from ..note_type import FIELD_WORD, FIELD_PHONETIC, FIELD_DEFINITION, FIELD_EXAMPLE, FIELD_AUDIO
-from ..dictionary.lookup import lookup_word
-from ..tts.manager import generate_audio, generate_audio_batch
+# Pending audio write: generated file for text goes into field of note nid
+AudioTask = namedtuple('AudioTask', 'nid field text')
+
+
+def _audio_worker(task_queue: "queue.Queue", results: List, stats: Dict,
+                  max_batch: int = 32, max_wait: float = 0.2, concurrency: int = 2) -> None:
+    """
+    Generate audio for tasks as they arrive, in batches (runs in a worker thread)
+    
+    A batch is sent to the TTS engine once it holds max_batch tasks or its
+    first task has waited max_wait seconds, whichever comes first. Small
+    jobs start quickly and backlogs go out in full batches. Up to concurrency
+    batches are generated at the same time; collecting further tasks pauses
+    while that many are in flight.
+    
+    Args:
+        task_queue: AudioTask items; None marks the end
+        results: Receives (task, filename) pairs; filename is None on failure
+        stats: Receives 'time' (seconds spent generating) and 'done' (tasks finished)
+        max_batch: Maximum number of texts per generate_audio_batch() call
+        max_wait: Maximum seconds a queued task waits for its batch to fill
+        concurrency: Maximum number of generate_audio_batch() calls in flight
+    """
+    import logging
+    import time
+    
+    logger = logging.getLogger(__name__)
+    in_flight = threading.BoundedSemaphore(concurrency)
+    stats_lock = threading.Lock()
+    
+    def _generate(batch: List[Dict]) -> None:
+        audio_start = time.time()
+        try:
+            filenames = generate_audio_batch([{'text': task.text} for task in batch])
+        except Exception as e:
+            logger.error(f"Batch audio generation failed: {e}")
+            filenames = [None] * len(batch)
+        finally:
+            in_flight.release()
+        with stats_lock:
+            stats['time'] += time.time() - audio_start
+            results.extend(zip(batch, filenames))
+            stats['done'] += len(batch)
+    
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    
+    finished = False
+    while not finished:
+        batch, finished = collect_batch(task_queue, max_batch, max_wait)
+        if batch:
+            in_flight.acquire()
+            executor.submit(_generate, batch)
+    
+    # Wait for the batches still in flight
+    executor.shutdown(wait=True)
 
 
 class BatchDialog(QDialog):
@@ -82,31 +149,80 @@ class BatchDialog(QDialog):
         self.setLayout(layout)
     
     def start_processing(self):
-        """Start batch processing with optimizations"""
-        import time
-        import logging
-        
-        logger = logging.getLogger(__name__)
-        start_time = time.time()
+        """Start batch processing in the background"""
+        from aqt.operations import QueryOp
         
         self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(self.note_ids))
+        self.progress_bar.setRange(0, len(self.note_ids))
         self.progress_bar.setValue(0)
         
         self.start_button.setEnabled(False)
         self.cancel_button.setEnabled(False)
         
-        processed = 0
+        # Snapshot the options; widgets must not be read from the worker thread
+        options = {
+            'phonetic': self.fill_phonetic_check.isChecked(),
+            'definition': self.fill_definition_check.isChecked(),
+            'example': self.fill_example_check.isChecked(),
+            'audio': self.fill_audio_check.isChecked(),
+            'overwrite': self.overwrite_check.isChecked(),
+        }
+        
+        # Get the TTS engine ready while notes are read and looked up
+        if options['audio']:
+            mw.taskman.run_in_background(warmup_engine, lambda future: None)
+        
+        # The worker only bumps raw counters; a timer repaints the bar when they change
+        self._progress_value = 0
+        self._progress_max = len(self.note_ids)
+        self._progress_timer = QTimer(self)
+        self._progress_timer.timeout.connect(self._refresh_progress)
+        self._progress_timer.start(100)
+        
+        QueryOp(
+            parent=self,
+            op=lambda col: self._run_batch(options),
+            success=self._on_batch_done
+        ).failure(self._on_batch_failed).run_in_background()
+    
+    def _refresh_progress(self):
+        """Copy the worker's progress into the progress bar if it changed"""
+        if self.progress_bar.maximum() != self._progress_max:
+            self.progress_bar.setRange(0, self._progress_max)
+        if self.progress_bar.value() != self._progress_value:
+            self.progress_bar.setValue(self._progress_value)
+    
+    def _run_batch(self, options: Dict[str, bool]) -> Dict:
+        """
+        Fill the selected notes (runs in a background thread)
+        
+        Notes are only edited here; _on_batch_done() saves them.
+        
+        Returns:
+            Stats dict with keys: notes (edited notes), updated, skipped,
+            total_time, dict_lookup_time, audio_gen_time, errors
+        """
+        import time
+        import logging
+        
+        logger = logging.getLogger(__name__)
+        start_time = time.time()
+        
         skipped = 0
         errors = 0
         
-        # Import field mapping functions once
-        from ..note_type import get_mapped_fields, get_word_from_note
+        # Bind module-level helpers to locals for the per-note loop
+        _get_mapped = get_mapped_fields
+        
+        # Cache fill plans per note type to avoid repeated mapping lookups
+        plan_cache = {}
+        notes_to_flush = set() # IDs of notes edited in either phase
+        notes_map = {} # ID -> Note object, loaded only for notes that get written
         
-        # Cache note type mappings to avoid repeated lookups
-        mapping_cache = {}
-        notes_to_flush = set() # Store note IDs to flush
-        notes_map = {} # ID -> Note object
+        def _get_note(nid):
+            if nid not in notes_map:
+                notes_map[nid] = mw.col.get_note(nid)
+            return notes_map[nid]
         
         # Performance tracking
         dict_lookup_time = 0
@@ -115,165 +231,215 @@ class BatchDialog(QDialog):
         # Queue for audio generation
         audio_tasks = []
         
-        # Phase 1: Dictionary Lookup & Field Prep
-        logger.info("Phase 1: Dictionary Lookup")
-        
-        for i, nid in enumerate(self.note_ids):
+        # Phase 2 (Audio Generation) runs in a worker thread fed while notes are
+        # still being read and looked up, so TTS and dictionary lookups overlap
+        audio_queue = queue.Queue()
+        audio_results = [] # (task, filename)
+        audio_stats = {'time': 0.0, 'done': 0}
+        queued_texts = set()
+        audio_thread = threading.Thread(
+            target=_audio_worker,
+            args=(audio_queue, audio_results, audio_stats,
+                  config.get_audio_batch_max(), config.get_audio_batch_max_wait_ms() / 1000.0,
+                  config.get_tts_concurrency()),
+            daemon=True
+        )
+        audio_thread.start()
+        
+        # Read note types and raw field values of all notes in one query
+        rows = mw.col.db.all(
+            f"select id, mid, flds from notes where id in {ids2str(self.note_ids)}"
+        )
+        errors += len(self.note_ids) - len(rows)
+        
+        # Fill options resolved once for the run
+        overwrite = options['overwrite']
+        text_roles = [
+            (role, attrgetter(key)) for role, key in
+            (('Phonetic', 'phonetic'), ('Definition', 'definition'), ('Example', 'example'))
+            if options[key]
+        ]
+        
+        tasks = [] # (nid, fields to fill, word)
+        for nid, mid, flds in rows:
             try:
-                note = mw.col.get_note(nid)
-                notes_map[nid] = note
-                note_type_name = note.note_type()['name']
-                
-                # Check mapping cache first
-                if note_type_name not in mapping_cache:
-                    mapping_cache[note_type_name] = get_mapped_fields(note)
+                # Compile the fill plan once per note type
+                # Format: (word index, [(target field, index, result getter)], (audio field, index) or None)
+                if mid not in plan_cache:
+                    sample = mw.col.get_note(nid)
+                    field_index = {name: i for i, name in enumerate(sample.keys())}
+                    mapping = {
+                        role: target_field
+                        for role, target_field in (_get_mapped(sample) or {}).items()
+                        if target_field in field_index
+                    }
+                    audio_field = mapping.get('Audio') if options['audio'] else None
+                    plan_cache[mid] = (
+                        field_index[mapping['Word']] if 'Word' in mapping else None,
+                        [(mapping[role], field_index[mapping[role]], get_value)
+                         for role, get_value in text_roles if role in mapping],
+                        (audio_field, field_index[audio_field]) if audio_field else None,
+                    )
                 
-                mapping = mapping_cache[note_type_name]
-                if not mapping:
+                word_index, plan, audio_plan = plan_cache[mid]
+                if word_index is None:
                     skipped += 1
-                    self.progress_bar.setValue(i + 1)
                     continue
                 
                 # Get word from note
-                word = get_word_from_note(note)
+                values = flds.split('\x1f')
+                word = values[word_index].strip()
                 if not word:
                     skipped += 1
-                    self.progress_bar.setValue(i + 1)
                     continue
                 
-                changed = False
-                
-                # Look up dictionary
-                dict_start = time.time()
-                result = lookup_word(word)
-                dict_lookup_time += time.time() - dict_start
-                
-                if result:
-                    # Fill phonetic
-                    if self.fill_phonetic_check.isChecked() and 'Phonetic' in mapping:
-                        target_field = mapping['Phonetic']
-                        if target_field in note and result.get('phonetic'):
-                            if self.overwrite_check.isChecked() or not note[target_field]:
-                                note[target_field] = result['phonetic']
-                                changed = True
-                    
-                    # Fill definition
-                    if self.fill_definition_check.isChecked() and 'Definition' in mapping:
-                        target_field = mapping['Definition']
-                        if target_field in note and result.get('definition'):
-                            if self.overwrite_check.isChecked() or not note[target_field]:
-                                note[target_field] = result['definition']
-                                changed = True
-                    
-                    # Fill example
-                    if self.fill_example_check.isChecked() and 'Example' in mapping:
-                        target_field = mapping['Example']
-                        if target_field in note and result.get('example'):
-                            if self.overwrite_check.isChecked() or not note[target_field]:
-                                note[target_field] = result['example']
-                                changed = True
+                # Fields still to fill, judged from the raw values without loading the note
+                fields = [
+                    (target_field, get_value) for target_field, index, get_value in plan
+                    if overwrite or not values[index]
+                ]
                 
                 # Prepare Audio Task
-                if self.fill_audio_check.isChecked() and 'Audio' in mapping:
-                    target_field = mapping['Audio']
-                    if target_field in note:
-                        if self.overwrite_check.isChecked() or not note[target_field]:
-                            audio_tasks.append({
-                                'nid': nid,
-                                'field': target_field,
-                                'text': word
-                            })
-                            # Don't count as changed yet, will do in Phase 2
+                had_audio_task = False
+                if audio_plan and (overwrite or not values[audio_plan[1]]):
+                    audio_tasks.append(AudioTask(nid, audio_plan[0], word))
+                    had_audio_task = True
+                    # Synthesize each distinct text once; the file is shared afterwards
+                    if word not in queued_texts:
+                        queued_texts.add(word)
+                        audio_queue.put(audio_tasks[-1])
+                    # Don't count as changed yet, will do in Phase 2
                 
-                if changed:
-                    notes_to_flush.add(nid)
-                    processed += 1
-                elif not audio_tasks or audio_tasks[-1]['nid'] != nid:
-                    # If no changes and no audio task, it's a skip
+                if fields:
+                    tasks.append((nid, fields, word))
+                elif not had_audio_task:
+                    # Nothing to fill: skip without a dictionary lookup
                     skipped += 1
-                
             except Exception as e:
-                logger.error(f"Error processing note {nid}: {e}", exc_info=True)
+                logger.error(f"Error reading note {nid}: {e}", exc_info=True)
                 errors += 1
-            
-            # Update progress bar partially (allocating 50% for Phase 1)
-            progress = int((i + 1) / len(self.note_ids) * 50)
-            self.progress_bar.setValue(progress)
-            
-            if (i + 1) % 50 == 0:
-                mw.app.processEvents()
         
-        # Flush initial changes
-        if notes_to_flush:
-            for nid in notes_to_flush:
-                notes_map[nid].flush()
-            notes_to_flush.clear()
+        # Progress counts one step per distinct word and one per distinct audio text
+        word_keys = {normalize_word(task[2]) for task in tasks}
+        self._progress_max = max(len(word_keys) + len(queued_texts), 1)
         
-        # Phase 2: Batch Audio Generation
-        logger.info(f"Phase 2: Audio Generation ({len(audio_tasks)} tasks)")
+        # Phase 1: Dictionary Lookup & Field Prep
+        # Each distinct word is looked up once, then results are written into notes
+        logger.info("Phase 1: Dictionary Lookup")
+        dict_start = time.time()
+        
+        def _on_lookup_progress(done: int):
+            self._progress_value = done
+        
+        raw_results = lookup_many(word_keys, config.get_lookup_concurrency(), _on_lookup_progress)
+        results = {word: LookupResult.from_dict(result) for word, result in raw_results.items()}
         
-        if audio_tasks:
-            BATCH_SIZE = 20
-            total_audio = len(audio_tasks)
+        for nid, fields, word in tasks:
+            key = normalize_word(word)
+            if key not in results:
+                errors += 1
+                continue
             
-            for i in range(0, total_audio, BATCH_SIZE):
-                batch = audio_tasks[i:i+BATCH_SIZE]
-                
-                # Prepare items for manager
-                items = [{'text': task['text']} for task in batch]
-                
-                # Generate
-                audio_start = time.time()
-                try:
-                    filenames = generate_audio_batch(items)
-                except Exception as e:
-                    logger.error(f"Batch audio generation failed: {e}")
-                    filenames = [None] * len(batch)
-                    
-                audio_gen_time += time.time() - audio_start
+            try:
+                changed = False
+                result = results[key]
                 
-                # Update notes
-                batch_flush_list = []
-                for task, filename in zip(batch, filenames):
-                    if filename:
-                        note = notes_map[task['nid']]
-                        note[task['field']] = f"[sound:{filename}]"
-                        batch_flush_list.append(note)
-                        
-                        # Increment processed if not already counted (simple approximation)
-                        # We might double count if it was already processed in Phase 1, but "Processed" usually means "touched"
-                        # Let's just track successful updates.
+                # Fill phonetic / definition / example
+                if result:
+                    for target_field, get_value in fields:
+                        value = get_value(result)
+                        if value:
+                            _get_note(nid)[target_field] = value
+                            changed = True
                 
-                # Flush batch
-                for note in batch_flush_list:
-                    note.flush()
+                if changed:
+                    notes_to_flush.add(nid)
                 
-                # Update progress (Allocating remaining 50%)
-                current_audio_progress = i + len(batch)
-                total_progress = 50 + int(current_audio_progress / total_audio * 50)
-                self.progress_bar.setValue(total_progress)
-                mw.app.processEvents()
+            except Exception as e:
+                logger.error(f"Error processing note {nid}: {e}", exc_info=True)
+                errors += 1
+        
+        dict_lookup_time += time.time() - dict_start
+        
+        # Phase 2: Batch Audio Generation (finish the remaining queued tasks)
+        logger.info(f"Phase 2: Audio Generation ({len(audio_tasks)} tasks)")
+        audio_queue.put(None)
+        
+        while audio_thread.is_alive():
+            audio_thread.join(0.1)
+            # Update progress
+            self._progress_value = len(word_keys) + audio_stats['done']
+        audio_gen_time = audio_stats['time']
+        
+        # Update notes, fanning each generated file out to every task with its text
+        filename_by_text = {task.text: filename for task, filename in audio_results}
+        for task in audio_tasks:
+            filename = filename_by_text.get(task.text)
+            if filename:
+                _get_note(task.nid)[task.field] = f"[sound:{filename}]"
+                notes_to_flush.add(task.nid)
         
         # Final Stats
         total_time = time.time() - start_time
-        processed_count = processed + len(audio_tasks) # Approximation
         
         # Log performance statistics
         logger.info(f"Batch processing completed in {total_time:.2f}s")
         logger.info(f"  Dictionary lookup: {dict_lookup_time:.2f}s")
         logger.info(f"  Audio generation: {audio_gen_time:.2f}s")
         
-        self.progress_bar.setValue(100)
+        return {
+            'notes': [notes_map[nid] for nid in notes_to_flush],
+            'updated': len(notes_to_flush),
+            'skipped': skipped,
+            'total_time': total_time,
+            'dict_lookup_time': dict_lookup_time,
+            'audio_gen_time': audio_gen_time,
+            'errors': errors,
+        }
+    
+    def _on_batch_done(self, stats: Dict):
+        """Save the edited notes and report the batch result (runs on the main thread)"""
+        from aqt.operations import CollectionOp
+        from aqt.qt import sip
+        
+        # Save in one undoable operation that also refreshes the browser and editor;
+        # this happens even if the dialog was closed meanwhile
+        if stats['notes']:
+            CollectionOp(
+                parent=mw,
+                op=lambda col: col.update_notes(stats['notes'])
+            ).run_in_background()
+        
+        if sip.isdeleted(self):
+            return
+        
+        self._progress_timer.stop()
+        self.progress_bar.setValue(self.progress_bar.maximum())
         self.start_button.setEnabled(True)
         self.cancel_button.setEnabled(True)
         
         message = f"Batch processing complete!\n\n"
-        message += f"Time: {total_time:.2f}s\n"
-        message += f"Lookups: {dict_lookup_time:.2f}s\n"
-        message += f"Audio: {audio_gen_time:.2f}s\n"
+        message += f"Updated: {stats['updated']} note(s)\n"
+        message += f"Skipped: {stats['skipped']} note(s)\n"
+        message += f"Time: {stats['total_time']:.2f}s\n"
+        message += f"Lookups: {stats['dict_lookup_time']:.2f}s\n"
+        message += f"Audio: {stats['audio_gen_time']:.2f}s\n"
         
-        if errors > 0:
-            message += f"\nErrors: {errors}"
+        if stats['errors'] > 0:
+            message += f"\nErrors: {stats['errors']}"
         
         showInfo(message)
         self.accept()
+    
+    def _on_batch_failed(self, exc: Exception):
+        """Report an unexpected batch failure (runs on the main thread)"""
+        from aqt.qt import sip
+        
+        if sip.isdeleted(self):
+            showInfo(f"Batch processing failed: {exc}")
+            return
+        
+        self._progress_timer.stop()
+        self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(True)
+        showInfo(f"Batch processing failed: {exc}")
@@ -23,6 +23,9 @@ class ConfigDialog(QDialog):
         self.setMinimumWidth(600)
         self.setMinimumHeight(600)
         
+        # Voices are listed when the TTS tab is first shown
+        self._voices_loaded = False
+        
         self.setup_ui()
         self.load_config()
     
@@ -70,6 +73,9 @@ class ConfigDialog(QDialog):
         tts_layout.addStretch()
         tts_tab.setLayout(tts_layout)
         tabs.addTab(tts_tab, "Text-to-Speech")
+        self._tts_tab = tts_tab
+        self._tabs = tabs
+        tabs.currentChanged.connect(self._on_tab_changed)
         
         # AI Tab
         ai_tab = QWidget()
@@ -229,6 +235,13 @@ class ConfigDialog(QDialog):
         self.openai_baseurl_input.setPlaceholderText("https://api.openai.com/v1/chat/completions")
         layout.addRow("Base URL:", self.openai_baseurl_input)
         
+        # Per-field parallel requests
+        self.ai_per_field_parallel_check = QCheckBox("Request each field separately (in parallel)")
+        self.ai_per_field_parallel_check.setToolTip(
+            "Send one concurrent request per field instead of a single combined request"
+        )
+        layout.addRow(self.ai_per_field_parallel_check)
+        
         # Info
         info_label = QLabel(
             "Enter your OpenAI API Key to enable AI-powered field suggestions.\n"
@@ -248,7 +261,6 @@ class ConfigDialog(QDialog):
 
     def test_openai_settings(self):
         """Test current OpenAI configuration"""
-        from ..ai.client import OpenAIClient
         import json
         import urllib.request
         import urllib.error
@@ -284,7 +296,7 @@ class ConfigDialog(QDialog):
             indent=2,
         )
 
-        try:
+        def _post():
             req = urllib.request.Request(
                 base_url,
                 data=json.dumps(test_body).encode("utf-8"),
@@ -293,7 +305,27 @@ class ConfigDialog(QDialog):
             )
             with urllib.request.urlopen(req, timeout=15) as resp:
                 raw = resp.read().decode("utf-8")
-                data = json.loads(raw)
+                return json.loads(raw)
+
+        # Run the request off the GUI thread so Anki stays responsive
+        self.openai_test_button.setEnabled(False)
+        mw.taskman.run_in_background(
+            _post,
+            lambda future: self._show_openai_result(future, request_summary),
+        )
+
+    def _show_openai_result(self, future, request_summary: str):
+        """Report the outcome of test_openai_settings() (runs on the main thread)"""
+        import json
+        from aqt.qt import sip
+
+        # The dialog may have been closed while the request was running
+        if sip.isdeleted(self.openai_test_button):
+            return
+        self.openai_test_button.setEnabled(True)
+
+        try:
+            data = future.result()
         except Exception as e:
             showInfo(
                 "OpenAI test failed:\n\n"
@@ -313,9 +345,11 @@ class ConfigDialog(QDialog):
         """Load configuration into UI"""
         # Load dictionaries
         mdx_paths = config.get_mdx_paths()
+        # Fill the list in one go and repaint once
+        self.dict_list.setUpdatesEnabled(False)
         self.dict_list.clear()
-        for path in mdx_paths:
-            self.dict_list.addItem(path)
+        self.dict_list.addItems(list(mdx_paths))
+        self.dict_list.setUpdatesEnabled(True)
         
         # Load TTS settings
         engine_name = config.get_tts_engine()
@@ -323,13 +357,7 @@ class ConfigDialog(QDialog):
         if index >= 0:
             self.engine_combo.setCurrentIndex(index)
         
-        self.on_engine_changed()  # Load voices
-        
-        voice_name = config.get_tts_voice()
-        if voice_name:
-            index = self.voice_combo.findText(voice_name)
-            if index >= 0:
-                self.voice_combo.setCurrentIndex(index)
+        # Voices are loaded by _on_tab_changed()
         
         self.speed_spin.setValue(config.get_tts_speed())
         
@@ -348,6 +376,7 @@ class ConfigDialog(QDialog):
         self.openai_key_input.setText(config.get_openai_api_key())
         self.openai_model_input.setText(config.get_openai_model())
         self.openai_baseurl_input.setText(config.get_base_url())
+        self.ai_per_field_parallel_check.setChecked(config.is_ai_per_field_parallel())
     
     def save_config(self):
         """Save configuration from UI"""
@@ -364,8 +393,10 @@ class ConfigDialog(QDialog):
         engine_name = self.engine_combo.currentData()
         config.set_tts_engine(engine_name)
         
-        voice_name = self.voice_combo.currentText()
-        config.set_tts_voice(voice_name)
+        # Keep the saved voice if the voice list was never loaded
+        if self._voices_loaded:
+            voice_name = self.voice_combo.currentText()
+            config.set_tts_voice(voice_name)
         
         config.set_tts_speed(self.speed_spin.value())
         
@@ -385,6 +416,7 @@ class ConfigDialog(QDialog):
         config.set_openai_model(model)
         base_url = self.openai_baseurl_input.text().strip()
         config.set_base_url(base_url)
+        config.set_ai_per_field_parallel(self.ai_per_field_parallel_check.isChecked())
         
         showInfo("Configuration saved successfully!")
         self.accept()
@@ -423,17 +455,35 @@ class ConfigDialog(QDialog):
             self.dict_list.insertItem(current_row + 1, item)
             self.dict_list.setCurrentRow(current_row + 1)
     
+    def _on_tab_changed(self, index: int):
+        """Load the voice list the first time the TTS tab is shown"""
+        if self._voices_loaded or self._tabs.widget(index) is not self._tts_tab:
+            return
+        
+        self._voices_loaded = True
+        self.on_engine_changed()  # Load voices
+        
+        voice_name = config.get_tts_voice()
+        if voice_name:
+            index = self.voice_combo.findText(voice_name)
+            if index >= 0:
+                self.voice_combo.setCurrentIndex(index)
+    
     def on_engine_changed(self):
         """Handle TTS engine change"""
+        if not self._voices_loaded:
+            return
+        
         engine_name = self.engine_combo.currentData()
         if not engine_name:
             return
         
         # Load voices for this engine
-        self.voice_combo.clear()
         voices = get_voices_for_engine(engine_name)
-        for voice in voices:
-            self.voice_combo.addItem(voice)
+        self.voice_combo.setUpdatesEnabled(False)
+        self.voice_combo.clear()
+        self.voice_combo.addItems(voices)
+        self.voice_combo.setUpdatesEnabled(True)
     
     def show_dependency_status(self):
         """Show dependency status"""
@@ -4,8 +4,9 @@ Dictionary field inspector dialog for EasyWords
 """
 
 import os
+from html import escape
 from aqt.qt import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                     QTreeWidget, QTreeWidgetItem, QTextBrowser, QLineEdit, QSplitter, Qt)
+                     QTreeWidget, QTreeWidgetItem, QTextBrowser, QLineEdit, QSplitter, Qt, QTimer)
 from aqt.utils import showInfo
 from aqt import mw
 
@@ -15,12 +16,43 @@ from ..dictionary.lookup import get_parsers
 class DictInspectorDialog(QDialog):
     """Dialog for inspecting available dictionary fields"""
     
+    _PREVIEW_HEADER = "<b>Preview Field Content</b>"
+    
+    # Placeholder rows, created on first use and cloned per dictionary
+    _LOADING_PROTO = None
+    _NO_FIELDS_PROTO = None
+    
+    @classmethod
+    def _placeholder(cls, attr: str, text: str) -> QTreeWidgetItem:
+        """Clone the placeholder prototype stored in attr, creating it first if needed"""
+        proto = getattr(cls, attr)
+        if proto is None:
+            proto = QTreeWidgetItem([text])
+            setattr(cls, attr, proto)
+        return proto.clone()
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Dictionary Fields Inspector")
         self.setMinimumWidth(900)
         self.setMinimumHeight(600)
         
+        # Preview lookups already done in this dialog
+        # Format: {(id(parser), word): result}
+        self._lookup_cache = {}
+        # Parsers shown in the tree; items store an index into this list
+        self._parsers = []
+        # Incremented per preview lookup so only the latest result is shown
+        self._lookup_seq = 0
+        # (id(parser), word) of the result currently in the preview
+        self._last_html_key = None
+        
+        # Previews the typed word once typing pauses
+        self._lookup_timer = QTimer(self)
+        self._lookup_timer.setSingleShot(True)
+        self._lookup_timer.setInterval(100)
+        self._lookup_timer.timeout.connect(self._auto_lookup)
+        
         self.setup_ui()
         self.load_dictionaries()
     
@@ -35,6 +67,7 @@ class DictInspectorDialog(QDialog):
         left_widget = QTreeWidget()
         left_widget.setHeaderLabels(["Dictionary / Field"])
         left_widget.itemClicked.connect(self.on_item_clicked)
+        left_widget.itemExpanded.connect(self._populate_fields)
         self.tree = left_widget
         splitter.addWidget(left_widget)
         
@@ -43,13 +76,14 @@ class DictInspectorDialog(QDialog):
         right_widget = QDialog() # Container
         right_widget.setLayout(right_layout)
         
-        right_layout.addWidget(QLabel("<b>Preview Field Content</b>"))
+        right_layout.addWidget(QLabel(self._PREVIEW_HEADER))
         
         input_layout = QHBoxLayout()
         input_layout.addWidget(QLabel("Test Word:"))
         self.word_input = QLineEdit()
         self.word_input.setPlaceholderText("Enter a word to test...")
         self.word_input.returnPressed.connect(self.test_lookup)
+        self.word_input.textChanged.connect(lambda text: self._lookup_timer.start())
         input_layout.addWidget(self.word_input)
         
         self.test_button = QPushButton("Test Lookup")
@@ -75,7 +109,7 @@ class DictInspectorDialog(QDialog):
         button_layout.addStretch()
         
         self.refresh_button = QPushButton("Refresh")
-        self.refresh_button.clicked.connect(self.load_dictionaries)
+        self.refresh_button.clicked.connect(self.refresh)
         button_layout.addWidget(self.refresh_button)
         
         self.close_button = QPushButton("Close")
@@ -86,84 +120,172 @@ class DictInspectorDialog(QDialog):
         
         self.setLayout(main_layout)
     
+    def done(self, result):
+        """Drop parser references when the dialog closes"""
+        self._parsers.clear()
+        self._lookup_cache.clear()
+        super().done(result)
+    
+    def refresh(self):
+        """Rescan all dictionaries and redisplay their fields"""
+        self._lookup_cache.clear()
+        self._last_html_key = None
+        for parser in get_parsers():
+            parser.invalidate_fields()
+        self.load_dictionaries()
+    
     def load_dictionaries(self):
         """Load and display dictionary fields"""
-        self.tree.clear()
         self.status_label.setText("Loading dictionary fields...")
         
+        # Rebuild the tree with a single repaint at the end
+        self.tree.setUpdatesEnabled(False)
         try:
+            self.tree.clear()
             parsers = get_parsers()
+            self._parsers = list(parsers)
             
             if not parsers:
                 self.status_label.setText("No dictionaries configured.")
                 return
             
-            # Display each dictionary and its fields
-            for parser in parsers:
+            # Display each dictionary; fields are detected when it is expanded
+            for parser_index, parser in enumerate(parsers):
                 # Dictionary item
                 dict_name = os.path.basename(parser.mdx_path)
                 dict_item = QTreeWidgetItem(self.tree)
                 dict_item.setText(0, f"📚 {dict_name}")
-                dict_item.setData(0, 100, parser) # Store parser
-                
-                # Field items
-                fields = parser.get_available_fields()
-                if fields:
-                    for field_name, field_desc in fields.items():
-                        field_item = QTreeWidgetItem(dict_item)
-                        field_item.setText(0, f"  • {field_name}")
-                        field_item.setData(0, 100, parser)
-                        field_item.setData(0, 101, field_name) # Store field name
-                else:
-                    no_fields_item = QTreeWidgetItem(dict_item)
-                    no_fields_item.setText(0, "  (No fields detected)")
+                dict_item.setData(0, 100, parser_index) # Store parser index
                 
-                dict_item.setExpanded(True)
+                # Field items are added by _populate_fields() on first expand
+                dict_item.addChild(self._placeholder('_LOADING_PROTO', "  Loading…"))
+                dict_item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
             
             self.status_label.setText(f"Loaded {len(parsers)} dictionary(ies)")
             
         except Exception as e:
             self.status_label.setText(f"Error loading dictionary fields: {str(e)}")
             showInfo(f"Failed to load dictionary fields:\n{str(e)}")
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
+    def _populate_fields(self, dict_item):
+        """Replace the placeholder under a dictionary item with its fields"""
+        if dict_item.parent() is not None or dict_item.data(0, 102):
+            return
+        dict_item.setData(0, 102, True) # Fields loaded
+        
+        parser_index = dict_item.data(0, 100)
+        parser = self._parsers[parser_index]
+        dict_item.takeChildren()
+        
+        # Detected fields are cached on the parser
+        fields = parser.get_available_fields()
+        
+        if fields:
+            for field_name, field_desc in fields.items():
+                field_item = QTreeWidgetItem(dict_item)
+                field_item.setText(0, f"  • {field_name}")
+                field_item.setData(0, 100, parser_index)
+                field_item.setData(0, 101, field_name) # Store field name
+        else:
+            dict_item.addChild(self._placeholder('_NO_FIELDS_PROTO', "  (No fields detected)"))
+    
     def on_item_clicked(self, item, column):
         """Handle item click"""
         # If user clicks a field, maybe pre-fill the preview?
         # For now, just focus the input
         pass
     
+    def _selected_parser(self):
+        """Get the parser of the selected tree item, or None"""
+        item = self.tree.currentItem()
+        if not item:
+            return None
+        parser_index = item.data(0, 100)
+        if parser_index is None or parser_index >= len(self._parsers):
+            return None
+        return self._parsers[parser_index]
+    
     def test_lookup(self):
         """Test lookup for selected dictionary"""
+        self._lookup_timer.stop()
+        
         word = self.word_input.text().strip()
         if not word:
             showInfo("Please enter a word.")
             return
             
-        item = self.tree.currentItem()
-        if not item:
+        if not self.tree.currentItem():
             showInfo("Please select a dictionary or field.")
             return
             
-        parser = item.data(0, 100)
-        if not parser:
+        parser = self._selected_parser()
+        if parser is None:
             showInfo("Please select a valid dictionary item.")
             return
-            
-        # Perform lookup
+        
+        self._start_lookup(parser, word)
+    
+    def _auto_lookup(self):
+        """Preview the typed word once typing pauses (no prompts on missing input)"""
+        word = self.word_input.text().strip()
+        parser = self._selected_parser()
+        if word and parser is not None:
+            self._start_lookup(parser, word)
+    
+    def _start_lookup(self, parser, word: str):
+        """Show the entry for word, looking it up in the background if needed"""
+        # Any lookup still running is now stale
+        self._lookup_seq += 1
+        seq = self._lookup_seq
+        
+        cache_key = (id(parser), word)
+        if cache_key in self._lookup_cache:
+            self._show_result(cache_key, word, self._lookup_cache[cache_key])
+            return
+        
+        mw.taskman.run_in_background(
+            lambda: parser.lookup(word),
+            lambda future: self._on_lookup_done(future, seq, cache_key, word),
+        )
+    
+    def _on_lookup_done(self, future, seq: int, cache_key, word: str):
+        """Receive a background lookup (runs on the main thread)"""
+        from aqt.qt import sip
+        
+        # The dialog may have been closed while the lookup was running
+        if sip.isdeleted(self.preview_browser):
+            return
+        
         try:
-            result = parser.lookup(word)
-            
-            html = f"<h3>Result for '{word}'</h3>"
-            
-            if result:
-                html += "<table border='1' cellspacing='0' cellpadding='5'>"
-                for key, value in result.items():
-                    html += f"<tr><td><b>{key}</b></td><td>{value}</td></tr>"
-                html += "</table>"
-            else:
-                html += "<p style='color:red'>Not found in this dictionary.</p>"
-                
-            self.preview_browser.setHtml(html)
-            
+            result = future.result()
         except Exception as e:
-            self.preview_browser.setHtml(f"<p style='color:red'>Error: {str(e)}</p>")
+            if seq == self._lookup_seq:
+                self._last_html_key = None
+                self.preview_browser.setHtml(f"<p style='color:red'>Error: {escape(str(e))}</p>")
+            return
+        
+        self._lookup_cache[cache_key] = result
+        if seq == self._lookup_seq:
+            self._show_result(cache_key, word, result)
+    
+    def _show_result(self, cache_key, word: str, result):
+        """Render a lookup result in the preview unless it is already shown"""
+        if cache_key == self._last_html_key:
+            return
+        self._last_html_key = cache_key
+        
+        parts = [f"<h3>Result for '{escape(word)}'</h3>"]
+        
+        if result:
+            parts.append("<table border='1' cellspacing='0' cellpadding='5'>")
+            parts.extend(
+                f"<tr><td><b>{escape(str(key))}</b></td><td>{escape(str(value))}</td></tr>"
+                for key, value in result.items()
+            )
+            parts.append("</table>")
+        else:
+            parts.append("<p style='color:red'>Not found in this dictionary.</p>")
+            
+        self.preview_browser.setHtml("".join(parts))
@@ -5,7 +5,8 @@ Field mapping dialog for EasyWords
 
 from typing import Dict, List
 from aqt.qt import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                     QComboBox, QCheckBox, QFormLayout, QGroupBox, QScrollArea, QWidget)
+                     QComboBox, QCheckBox, QFormLayout, QGroupBox, QScrollArea, QWidget,
+                     QTimer, QStringListModel)
 from aqt.utils import showInfo
 from aqt import mw
 
@@ -19,6 +20,12 @@ class FieldMappingDialog(QDialog):
     # Standard EasyWords source fields
     SOURCE_FIELDS = ['Word', 'Phonetic', 'Definition', 'Example', 'Audio']
     
+    _INFO_TEXT = (
+        "Configure how EasyWords fields map to your note type fields.\n"
+        "Select a note type, then choose which fields should be filled."
+    )
+    _WORD_LABEL_HTML = "<b>Word</b> (Required):"
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("EasyWords - Field Mapping Configuration")
@@ -29,6 +36,11 @@ class FieldMappingDialog(QDialog):
         self.field_enabled: Dict[str, QCheckBox] = {}
         self.current_note_type = None
         self.target_fields: List[str] = []
+        # Field names per note type id, filled by load_note_types()
+        self._fields_by_id: Dict[int, List[str]] = {}
+        # Field list the mapping combos currently hold
+        self._last_target_fields: List[str] = []
+        self._index_by_target: Dict[str, int] = {"": 0}
         
         self.setup_ui()
         self.load_note_types()
@@ -38,10 +50,7 @@ class FieldMappingDialog(QDialog):
         layout = QVBoxLayout()
         
         # Info label
-        info_label = QLabel(
-            "Configure how EasyWords fields map to your note type fields.\n"
-            "Select a note type, then choose which fields should be filled."
-        )
+        info_label = QLabel(self._INFO_TEXT)
         info_label.setWordWrap(True)
         layout.addWidget(info_label)
         
@@ -51,6 +60,12 @@ class FieldMappingDialog(QDialog):
         
         self.notetype_combo = QComboBox()
         self.notetype_combo.currentIndexChanged.connect(self.on_notetype_changed)
+        
+        # Rebuilds the mapping rows once the selection has settled
+        self._rebuild_timer = QTimer(self)
+        self._rebuild_timer.setSingleShot(True)
+        self._rebuild_timer.setInterval(50)
+        self._rebuild_timer.timeout.connect(self._do_rebuild)
         notetype_layout.addWidget(self.notetype_combo, 1)
         
         self.inspect_button = QPushButton("View Dictionary Fields")
@@ -70,6 +85,7 @@ class FieldMappingDialog(QDialog):
         self.form_layout = QFormLayout()
         scroll_widget.setLayout(self.form_layout)
         scroll.setWidget(scroll_widget)
+        self._build_mapping_rows()
         
         mapping_layout.addWidget(scroll)
         mapping_group.setLayout(mapping_layout)
@@ -96,19 +112,31 @@ class FieldMappingDialog(QDialog):
         if not mw or not mw.col:
             return
         
-        self.notetype_combo.clear()
-        
-        # Get all note types
+        # Get all note types, remembering their field names for later selections
         models = mw.col.models.all()
+        self._fields_by_id = {
+            model['id']: [field['name'] for field in model['flds']] for model in models
+        }
+        
+        # Fill the combo silently; the first note type is shown directly below
+        self.notetype_combo.blockSignals(True)
+        self.notetype_combo.clear()
         for model in models:
             self.notetype_combo.addItem(model['name'], model['id'])
         
         # Select first note type
         if self.notetype_combo.count() > 0:
             self.notetype_combo.setCurrentIndex(0)
+        self.notetype_combo.blockSignals(False)
+        
+        self._do_rebuild()
     
     def on_notetype_changed(self):
-        """Handle note type selection change"""
+        """Handle note type selection change (coalesced while the user cycles through types)"""
+        self._rebuild_timer.start()
+    
+    def _do_rebuild(self):
+        """Show the mapping of the selected note type"""
         if not mw or not mw.col:
             return
         
@@ -118,35 +146,27 @@ class FieldMappingDialog(QDialog):
         
         self.current_note_type = notetype_name
         
-        # Get note type model
-        model = mw.col.models.by_name(notetype_name)
-        if not model:
+        # Get target fields from the note type (read once in load_note_types)
+        target_fields = self._fields_by_id.get(self.notetype_combo.currentData())
+        if target_fields is None:
             return
         
-        # Get target fields from the note type
-        self.target_fields = [field['name'] for field in model['flds']]
+        self.target_fields = list(target_fields)
         
         # Load existing mapping (full format with enabled status)
         existing_mapping = config.get_field_mapping_full(notetype_name)
         
-        # Rebuild field mapping UI
-        self.rebuild_field_mapping_ui(existing_mapping)
+        # Show it in the mapping rows
+        self._apply_mapping_ui(existing_mapping)
     
-    def rebuild_field_mapping_ui(self, existing_mapping: Dict[str, Dict]):
-        """Rebuild the field mapping UI with current note type fields"""
-        # Clear existing form
-        while self.form_layout.count():
-            child = self.form_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        self.field_combos.clear()
-        self.field_enabled.clear()
-        
-        if not self.target_fields:
-            no_fields_label = QLabel("This note type has no fields.")
-            self.form_layout.addRow(no_fields_label)
-            return
+    def _build_mapping_rows(self):
+        """Create the mapping rows once; _apply_mapping_ui() refills them"""
+        self.no_fields_label = QLabel("This note type has no fields.")
+        self.form_layout.addRow(self.no_fields_label)
+        self._row_widgets: List[QWidget] = []
+        
+        # Item list shared by every field combo, set by _apply_mapping_ui()
+        self._targets_model = QStringListModel(self)
         
         # Create combo box and checkbox for each source field
         for source_field in self.SOURCE_FIELDS:
@@ -156,46 +176,75 @@ class FieldMappingDialog(QDialog):
             
             # Field combo box
             combo = QComboBox()
-            combo.addItem("(Don't fill this field)", "")
-            
-            # Add all target fields
-            for target_field in self.target_fields:
-                combo.addItem(target_field, target_field)
-            
-            # Set current mapping if exists
-            if source_field in existing_mapping:
-                field_config = existing_mapping[source_field]
-                target = field_config.get('target', '')
-                enabled = field_config.get('enabled', True)
-                
-                index = combo.findData(target)
-                if index >= 0:
-                    combo.setCurrentIndex(index)
-                enabled_check.setChecked(enabled)
-            else:
-                # Try to find a matching field name
-                index = combo.findText(source_field)
-                if index >= 0:
-                    combo.setCurrentIndex(index)
+            combo.setModel(self._targets_model)
             
             # Enable/disable combo based on checkbox
-            combo.setEnabled(enabled_check.isChecked())
             enabled_check.toggled.connect(lambda checked, c=combo: c.setEnabled(checked))
             
             self.field_combos[source_field] = combo
             self.field_enabled[source_field] = enabled_check
             
-            # Add to form with checkbox and combo in a horizontal layout
-            row_layout = QHBoxLayout()
+            # Add to form with checkbox and combo in one row widget
+            row_widget = QWidget()
+            row_layout = QHBoxLayout(row_widget)
+            row_layout.setContentsMargins(0, 0, 0, 0)
             row_layout.addWidget(enabled_check)
             row_layout.addWidget(combo, 1)
             
-            label_text = f"{source_field}:"
-            if source_field == 'Word':
-                label_text = f"<b>{source_field}</b> (Required):"
+            label_text = self._WORD_LABEL_HTML if source_field == 'Word' else f"{source_field}:"
             
             label = QLabel(label_text)
-            self.form_layout.addRow(label, row_layout)
+            self.form_layout.addRow(label, row_widget)
+            self._row_widgets.extend((label, row_widget))
+        
+        # Nothing to show until a note type is selected
+        for widget in [self.no_fields_label] + self._row_widgets:
+            widget.setVisible(False)
+    
+    def _apply_mapping_ui(self, existing_mapping: Dict[str, Dict]):
+        """Show the current note type's fields and mapping in the existing rows"""
+        has_fields = bool(self.target_fields)
+        self.no_fields_label.setVisible(not has_fields)
+        for widget in self._row_widgets:
+            widget.setVisible(has_fields)
+        if not has_fields:
+            # Hidden rows must not save a mapping left over from another note type
+            for combo in self.field_combos.values():
+                combo.setCurrentIndex(0)
+            return
+        
+        # Refill the combos only when the field list differs from the last note type
+        refill = self.target_fields != self._last_target_fields
+        if refill:
+            self._last_target_fields = list(self.target_fields)
+            # All combos share one model: "(Don't fill this field)", then the fields
+            self._targets_model.setStringList(["(Don't fill this field)"] + self.target_fields)
+            self._index_by_target = {"": 0}
+            for i, target_field in enumerate(self.target_fields, 1):
+                self._index_by_target[target_field] = i
+        index_by_target = self._index_by_target
+        
+        for source_field in self.SOURCE_FIELDS:
+            combo = self.field_combos[source_field]
+            enabled_check = self.field_enabled[source_field]
+            
+            combo.blockSignals(True)
+            
+            # Set current mapping if exists
+            enabled = True
+            if source_field in existing_mapping:
+                field_config = existing_mapping[source_field]
+                target = field_config.get('target', '')
+                enabled = field_config.get('enabled', True)
+                index = index_by_target.get(target, -1)
+            else:
+                # Try to find a matching field name
+                index = index_by_target.get(source_field, -1)
+            combo.setCurrentIndex(max(index, 0))
+            combo.blockSignals(False)
+            
+            enabled_check.setChecked(enabled)
+            combo.setEnabled(enabled)
     
     def save_mapping(self):
         """Save the field mapping configuration"""
@@ -203,27 +252,27 @@ class FieldMappingDialog(QDialog):
             showInfo("Please select a note type first.")
             return
         
-        # Collect mapping from UI with enabled status
+        # Collect mapping from UI with enabled status, checking the Word field on the way
         mapping = {}
+        word_mapped = False
         for source_field, combo in self.field_combos.items():
-            target_field = combo.currentData()
-            enabled = self.field_enabled[source_field].isChecked()
+            # Index 0 is "(Don't fill this field)"
+            if combo.currentIndex() <= 0:
+                continue  # Only save if a target is selected
             
-            if target_field:  # Only save if a target is selected
-                mapping[source_field] = {
-                    'target': target_field,
-                    'enabled': enabled
-                }
+            enabled = self.field_enabled[source_field].isChecked()
+            mapping[source_field] = {
+                'target': combo.currentText(),
+                'enabled': enabled
+            }
+            if source_field == 'Word' and enabled:
+                word_mapped = True
         
         if not mapping:
             showInfo("Please map at least one field.")
             return
             
         # Validation: 'Word' field is required
-        word_mapped = False
-        if 'Word' in mapping and mapping['Word'].get('enabled', False):
-            word_mapped = True
-            
         if not word_mapped:
             showInfo("The 'Word' field must be mapped and enabled.\nEasyWords needs this field to know what to look up.")
             return
@@ -3,20 +3,34 @@
 Icon utilities for EasyWords GUI
 """
 
+from typing import Dict
+
 from aqt.qt import QIcon, QPixmap
 import os
 
 
+ICON_DIR = os.path.join(os.path.dirname(__file__), 'icons')
+
+# Icons already created, by name
+_ICON_CACHE: Dict[str, QIcon] = {}
+
+
 def get_icon(name: str) -> QIcon:
     """
     Get an icon by name
     
     For now, returns an empty icon. Icons can be added later.
     """
-    icon_dir = os.path.join(os.path.dirname(__file__), 'icons')
-    icon_path = os.path.join(icon_dir, f"{name}.png")
+    icon = _ICON_CACHE.get(name)
+    if icon is not None:
+        return icon
+    
+    icon_path = os.path.join(ICON_DIR, f"{name}.png")
     
     if os.path.exists(icon_path):
-        return QIcon(icon_path)
+        icon = QIcon(icon_path)
+    else:
+        icon = QIcon()
     
-    return QIcon()
+    _ICON_CACHE[name] = icon
+    return icon
@@ -13,6 +13,10 @@ from ..config import config
 from ..dictionary.online import get_available_online_dicts
 
 
+# List prefix for disabled / enabled dictionaries
+_STATUS_ICONS = ("❌", "✅")
+
+
 class OnlineDictDialog(QDialog):
     """Dialog for configuring online dictionaries"""
     
@@ -23,6 +27,8 @@ class OnlineDictDialog(QDialog):
         self.setMinimumHeight(400)
         
         self.dictionaries = config.get_online_dictionaries()
+        # Type codes already in the list, for the duplicate check
+        self._present_types = {d.get('type') for d in self.dictionaries}
         
         self.setup_ui()
         self.refresh_list()
@@ -49,6 +55,7 @@ class OnlineDictDialog(QDialog):
         # Add new dictionary
         self.add_combo = QComboBox()
         self.available_types = get_available_online_dicts()
+        self._type_name_by_code = {t['type']: t['name'] for t in self.available_types}
         for dict_type in self.available_types:
             self.add_combo.addItem(dict_type['name'], dict_type['type'])
             
@@ -100,28 +107,31 @@ class OnlineDictDialog(QDialog):
         
         self.setLayout(layout)
     
+    def _item_text(self, dict_config) -> str:
+        """Format the list row for a dictionary config"""
+        enabled = dict_config.get('enabled', True)
+        type_code = dict_config.get('type', '')
+        
+        # Find pretty name for type
+        type_name = self._type_name_by_code.get(type_code, type_code)
+        
+        return f"{_STATUS_ICONS[bool(enabled)]} {type_name}"
+    
     def refresh_list(self):
         """Refresh the list widget"""
-        self.dict_list.clear()
-        
-        for dict_config in self.dictionaries:
-            name = dict_config.get('name', 'Unknown')
-            enabled = dict_config.get('enabled', True)
-            type_code = dict_config.get('type', '')
-            
-            # Find pretty name for type
-            type_name = type_code
-            for t in self.available_types:
-                if t['type'] == type_code:
-                    type_name = t['name']
-                    break
+        # Rebuild without intermediate repaints or signals
+        self.dict_list.setUpdatesEnabled(False)
+        self.dict_list.blockSignals(True)
+        try:
+            self.dict_list.clear()
             
-            status = "✅" if enabled else "❌"
-            text = f"{status} {type_name}"
-            
-            item = QListWidgetItem(text)
-            item.setData(100, dict_config) # Store config in item
-            self.dict_list.addItem(item)
+            for dict_config in self.dictionaries:
+                item = QListWidgetItem(self._item_text(dict_config))
+                item.setData(100, dict_config) # Store config in item
+                self.dict_list.addItem(item)
+        finally:
+            self.dict_list.blockSignals(False)
+            self.dict_list.setUpdatesEnabled(True)
     
     def add_dictionary(self):
         """Add selected dictionary type"""
@@ -129,10 +139,9 @@ class OnlineDictDialog(QDialog):
         type_name = self.add_combo.currentText()
         
         # Check if already added
-        for d in self.dictionaries:
-            if d.get('type') == type_code:
-                showInfo(f"{type_name} is already added.")
-                return
+        if type_code in self._present_types:
+            showInfo(f"{type_name} is already added.")
+            return
         
         new_dict = {
             'type': type_code,
@@ -141,6 +150,7 @@ class OnlineDictDialog(QDialog):
         }
         
         self.dictionaries.append(new_dict)
+        self._present_types.add(type_code)
         self.refresh_list()
     
     def remove_dictionary(self):
@@ -150,7 +160,8 @@ class OnlineDictDialog(QDialog):
             return
             
         if askUser("Are you sure you want to remove this dictionary?"):
-            self.dictionaries.pop(row)
+            removed = self.dictionaries.pop(row)
+            self._present_types.discard(removed.get('type'))
             self.refresh_list()
     
     def move_up(self):
@@ -160,8 +171,7 @@ class OnlineDictDialog(QDialog):
             return
             
         self.dictionaries[row], self.dictionaries[row-1] = self.dictionaries[row-1], self.dictionaries[row]
-        self.refresh_list()
-        self.dict_list.setCurrentRow(row-1)
+        self._move_item(row, row-1)
     
     def move_down(self):
         """Move selected dictionary down"""
@@ -170,8 +180,13 @@ class OnlineDictDialog(QDialog):
             return
             
         self.dictionaries[row], self.dictionaries[row+1] = self.dictionaries[row+1], self.dictionaries[row]
-        self.refresh_list()
-        self.dict_list.setCurrentRow(row+1)
+        self._move_item(row, row+1)
+    
+    def _move_item(self, row: int, new_row: int):
+        """Move one list row to match a swap in self.dictionaries"""
+        item = self.dict_list.takeItem(row)
+        self.dict_list.insertItem(new_row, item)
+        self.dict_list.setCurrentRow(new_row)
         
     def toggle_enabled(self):
         """Toggle enabled status of selected dictionary"""
@@ -179,9 +194,13 @@ class OnlineDictDialog(QDialog):
         if row < 0:
             return
             
-        self.dictionaries[row]['enabled'] = not self.dictionaries[row]['enabled']
-        self.refresh_list()
-        self.dict_list.setCurrentRow(row)
+        dict_config = self.dictionaries[row]
+        dict_config['enabled'] = not dict_config['enabled']
+        
+        # Only the toggled row changes
+        item = self.dict_list.item(row)
+        item.setText(self._item_text(dict_config))
+        item.setData(100, dict_config)
         
     def save_config(self):
         """Save configuration"""
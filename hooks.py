@@ -3,18 +3,52 @@
 Anki hooks integration for EasyWords add-on
 """
 
-import aqt
-from aqt import gui_hooks, mw
-from aqt.qt import QAction, QMenu
+import logging
 import weakref
+from typing import List, Optional
+
+from aqt import gui_hooks, mw
+from aqt.qt import QAction, QMenu, QTimer
+from aqt.utils import showWarning, tooltip
 
 from .config import config
+from .note_type import get_mapped_fields, get_word_from_note
+
+
+logger = logging.getLogger(__name__)
+
+# Bound by _deferred_imports(): the TTS engines and dictionaries are heavier
+# to import, so they are loaded once the profile opens instead of at add-on load
+lookup_word = None
+generate_audio = None
+generate_audio_in_background = None
 
 
 # Keep track of active editors to update UI
 _active_editors = weakref.WeakSet()
+# Editor showing each note, keyed by id(note); updated whenever an editor loads a note
+_editor_by_note = weakref.WeakValueDictionary()
 _addnote_hook_installed = False
 
+# Pending auto-audio starts per note, so only the last Word edit generates audio
+_pending_tts_timers = weakref.WeakKeyDictionary()
+AUTO_AUDIO_DEBOUNCE_MS = 400
+
+# Notes filled outside the editor, keyed by note id; saved together by _flush_note_saves()
+_pending_note_saves = {}
+_note_save_timer = None
+NOTE_SAVE_DELAY_MS = 500
+
+
+def _deferred_imports() -> None:
+    """Import the TTS and dictionary helpers used by the hook handlers (once)"""
+    global lookup_word, generate_audio, generate_audio_in_background
+    if generate_audio_in_background is not None:
+        return
+    
+    from .dictionary.lookup import lookup_word
+    from .tts.manager import generate_audio, generate_audio_in_background
+
 
 def setup_hooks():
     """Setup all Anki hooks"""
@@ -31,7 +65,8 @@ def setup_profile_hooks():
     def on_profile_did_open():
         """Called when a profile is opened and collection is available"""
         from .note_type import ensure_note_type
-        from .config import config
+        
+        _deferred_imports()
         
         # Create note type if auto-create is enabled
         if config.is_auto_create_note_type():
@@ -40,9 +75,23 @@ def setup_profile_hooks():
         _install_addnote_hook()
     
     gui_hooks.profile_did_open.append(on_profile_did_open)
+    
+    def on_profile_will_close():
+        """Write any pending note and configuration changes before Anki shuts down"""
+        _flush_note_saves()
+        config.flush(sync_anki=True)
+    
+    gui_hooks.profile_will_close.append(on_profile_will_close)
+    
+    def on_media_changed(*args):
+        """Media sync or Check Media may add or remove audio files"""
+        from .tts.manager import invalidate_cache
+        invalidate_cache()
+    
+    gui_hooks.media_sync_did_start_or_stop.append(on_media_changed)
+    gui_hooks.media_check_will_start.append(on_media_changed)
 
 def _install_addnote_hook() -> None:
-    import logging
     import types
 
     global _addnote_hook_installed
@@ -54,7 +103,6 @@ def _install_addnote_hook() -> None:
     if not hasattr(col, "addNote"):
         return
 
-    logger = logging.getLogger(__name__)
     original_add_note = col.addNote
 
     def wrapped(self, note, *args, **kwargs):
@@ -70,13 +118,37 @@ def _install_addnote_hook() -> None:
     _addnote_hook_installed = True
 
 
-def _maybe_generate_audio_for_note(note) -> None:
-    import logging
+def _queue_note_save(note) -> None:
+    """Save a note with the next batch of filled notes (in one collection update)"""
+    global _note_save_timer
+    
+    _pending_note_saves[note.id] = note
+    
+    if _note_save_timer is None:
+        _note_save_timer = QTimer(mw)
+        _note_save_timer.setSingleShot(True)
+        _note_save_timer.timeout.connect(_flush_note_saves)
+    if not _note_save_timer.isActive():
+        _note_save_timer.start(NOTE_SAVE_DELAY_MS)
+
+
+def _flush_note_saves() -> None:
+    """Write all queued notes with a single update_notes() call"""
+    if _note_save_timer is not None:
+        _note_save_timer.stop()
+    if not _pending_note_saves or not mw or not mw.col:
+        return
+    
+    notes = list(_pending_note_saves.values())
+    _pending_note_saves.clear()
+    try:
+        mw.col.update_notes(notes)
+    except Exception as e:
+        logger.error(f"Failed to save {len(notes)} filled note(s): {e}", exc_info=True)
 
-    from .note_type import get_mapped_fields, get_word_from_note
-    from .tts.manager import generate_audio_in_background
 
-    logger = logging.getLogger(__name__)
+def _maybe_generate_audio_for_note(note) -> None:
+    _deferred_imports()
 
     mapping = get_mapped_fields(note)
     if not mapping:
@@ -89,33 +161,12 @@ def _maybe_generate_audio_for_note(note) -> None:
     if note[audio_field_name]:
         return
 
-    word = get_word_from_note(note)
+    word = get_word_from_note(note, mapping)
     if not word:
         return
 
-    def _on_done(success: bool, filename: str | None) -> None:
-        if not success or not filename:
-            return
-        try:
-            if getattr(note, "id", 0) != 0:
-                note.flush()
-        except Exception as e:
-            logger.error(f"Failed to flush note after audio generation: {e}", exc_info=True)
-
-    def _start_generation(retry_count: int = 0) -> None:
-        def _callback(success: bool, filename: str | None) -> None:
-            if success:
-                _on_done(True, filename)
-                return
-            if retry_count < 3:
-                logger.info(f"Retrying audio generation for '{word}' ({retry_count + 1}/3)")
-                _start_generation(retry_count + 1)
-                return
-            _on_done(False, None)
-
-        generate_audio_in_background(note, audio_field_name, word, _callback)
-
-    _start_generation()
+    # Added notes share the background TTS worker's batches; the retrier saves them
+    AudioRetrier(note, None, audio_field_name, word).start()
 
 
 def setup_menu():
@@ -141,6 +192,13 @@ def setup_editor_hooks():
         
     gui_hooks.editor_did_init.append(on_editor_did_init)
     
+    def on_editor_did_load_note(editor):
+        """Remember which editor shows the loaded note"""
+        if editor.note is not None:
+            _editor_by_note[id(editor.note)] = editor
+    
+    gui_hooks.editor_did_load_note.append(on_editor_did_load_note)
+    
     def on_editor_did_init_buttons(buttons, editor):
         """Add EasyWords buttons to editor"""
         from .gui.icons import get_icon
@@ -149,7 +207,7 @@ def setup_editor_hooks():
         fill_button = editor.addButton(
             icon=None,  # We'll add an icon later
             cmd="easywords_fill",
-            func=lambda ed: fill_current_note(ed),
+            func=fill_current_note,
             tip="Fill word information with EasyWords",
             label="EW"
         )
@@ -159,7 +217,7 @@ def setup_editor_hooks():
         ai_button = editor.addButton(
             icon=None,
             cmd="easywords_ai",
-            func=lambda ed: ai_fill_current_note(ed),
+            func=ai_fill_current_note,
             tip="Generate definitions and examples with AI",
             label="AI"
         )
@@ -173,13 +231,17 @@ def setup_editor_hooks():
     if config.is_auto_fill_on_add() or config.is_auto_generate_audio_on_add():
         def on_add_cards_did_add_note(note):
             """Auto-fill when adding a new note"""
-            from .note_type import get_mapped_fields, get_word_from_note
-            
             # Check if note has field mapping and word content
             mapping = get_mapped_fields(note)
-            if mapping and get_word_from_note(note):
+            if mapping and get_word_from_note(note, mapping):
                 if config.is_auto_fill_on_add():
-                    fill_note_fields(note)
+                    # Don't interrupt adding cards with modal dialogs
+                    errors = []
+                    fill_note_fields(note, errors=errors)
+                    if errors:
+                        for message in errors:
+                            logger.warning(message)
+                        tooltip(f"EasyWords: {len(errors)} problem(s) filling the note. Check the log.")
                 elif config.is_auto_generate_audio_on_add():
                     _maybe_generate_audio_for_note(note)
         
@@ -189,6 +251,61 @@ def setup_editor_hooks():
     gui_hooks.editor_did_unfocus_field.append(on_editor_did_unfocus_field)
 
 
+class AudioRetrier:
+    """
+    Generates auto-audio for a note, retrying failures (max 3 retries)
+    
+    Holds the note and editor weakly, so a pending retry chain does not keep
+    a closed editor window alive. Instances are the generation callback.
+    """
+    
+    __slots__ = ('note', '_editor_ref', 'audio_field_name', 'word', 'retry_count')
+    
+    MAX_RETRIES = 3
+    
+    def __init__(self, note, editor, audio_field_name: str, word: str):
+        self.note = weakref.ref(note)
+        self._editor_ref = weakref.ref(editor) if editor is not None else None
+        self.audio_field_name = audio_field_name
+        self.word = word
+        self.retry_count = 0
+    
+    def start(self) -> None:
+        """Start (or restart) generation if the note still exists"""
+        _deferred_imports()
+        
+        note = self.note()
+        if note is None:
+            return
+        generate_audio_in_background(note, self.audio_field_name, self.word, self)
+    
+    def __call__(self, success: bool, filename) -> None:
+        if success and filename:
+            logger.info(f"Auto-generated audio for '{self.word}': {filename}")
+            editor = self._editor_ref() if self._editor_ref else None
+            if editor is not None and editor.note is self.note():
+                # Update editor UI
+                # We use setNoteField which updates the note and the UI
+                # Note: note[audio_field_name] is already updated by generate_audio_in_background
+                # But to be safe and ensure UI sync, we can set it again via editor
+                editor.setNoteField(self.audio_field_name, f"[sound:{filename}]")
+                return
+            
+            # Notes not shown in an editor (e.g. just added) are saved here
+            note = self.note()
+            if note is not None and note.id:
+                _queue_note_save(note)
+            return
+        
+        if self.retry_count < self.MAX_RETRIES:
+            self.retry_count += 1
+            logger.info(f"Retrying audio generation for '{self.word}' ({self.retry_count}/{self.MAX_RETRIES})")
+            self.start()
+            return
+        
+        logger.warning(f"Failed to auto-generate audio for '{self.word}'")
+
+
 def on_editor_did_unfocus_field(changed: bool, note, current_field_idx: int):
     """
     Handle field unfocus event to trigger auto audio generation.
@@ -200,30 +317,22 @@ def on_editor_did_unfocus_field(changed: bool, note, current_field_idx: int):
     if not config.is_auto_generate_audio_on_add():
         return
         
-    from .note_type import get_mapped_fields
-    from .tts.manager import generate_audio_in_background
-    import logging
-    
-    logger = logging.getLogger(__name__)
+    # Map index to field name first; this is cheap and most edits are not the Word field
+    # (the note type comes from Anki's model cache, so no field list is built)
+    note_type = note.note_type()
+    fields = note_type['flds']
+    if current_field_idx >= len(fields):
+        return
+        
+    unfocused_field_name = fields[current_field_idx]['name']
     
     # Check if we should generate audio
-    mapping = get_mapped_fields(note)
+    mapping = get_mapped_fields(note, note_type)
     if not mapping:
         return
         
     # Check if unfocused field is "Word"
-    word_field_name = mapping.get('Word')
-    if not word_field_name:
-        return
-        
-    # Map index to field name
-    field_names = list(note.keys())
-    if current_field_idx >= len(field_names):
-        return
-        
-    unfocused_field_name = field_names[current_field_idx]
-    
-    if unfocused_field_name != word_field_name:
+    if unfocused_field_name != mapping.get('Word'):
         return
         
     # Check Audio field
@@ -236,75 +345,83 @@ def on_editor_did_unfocus_field(changed: bool, note, current_field_idx: int):
         return
         
     # Get word content
-    word = note[word_field_name].strip()
+    word = note[unfocused_field_name].strip()
     if not word:
         return
         
     logger.debug(f"Auto-generating audio for '{word}'")
     
-    # Find the editor for this note
-    editor = None
-    for ed in _active_editors:
-        if ed.note is note:
-            editor = ed
-            break
-            
-    def _on_done(success, filename):
-        if success and filename:
-            logger.info(f"Auto-generated audio for '{word}': {filename}")
-            if editor:
-                # Update editor UI
-                # We use setNoteField which updates the note and the UI
-                # Note: note[audio_field_name] is already updated by generate_audio_in_background
-                # But to be safe and ensure UI sync, we can set it again via editor
-                editor.setNoteField(audio_field_name, f"[sound:{filename}]")
-        else:
-            logger.warning(f"Failed to auto-generate audio for '{word}'")
-            # Retry logic could be implemented here if needed, 
-            # but for now we just log. 
-            # Requirements said "Add failure retry logic (max 3 times)".
-            # We can implement a simple retry wrapper here.
-
-    # Retry wrapper
-    def _start_generation(retry_count=0):
-        def _callback(success, filename):
-            if success:
-                _on_done(True, filename)
-            elif retry_count < 3:
-                logger.info(f"Retrying audio generation for '{word}' ({retry_count + 1}/3)")
-                _start_generation(retry_count + 1)
-            else:
-                _on_done(False, None)
-                
-        generate_audio_in_background(note, audio_field_name, word, _callback)
+    # Find the editor for this note (ids can be reused, so confirm the match)
+    editor = _editor_by_note.get(id(note))
+    if editor is not None and editor.note is not note:
+        editor = None
+    
+    retrier = AudioRetrier(note, editor, audio_field_name, word)
 
-    _start_generation()
+    # Debounce: a newer edit of the same note replaces the pending start
+    timer = _pending_tts_timers.pop(note, None)
+    if timer is not None:
+        timer.stop()
+        timer.deleteLater()
 
+    timer = QTimer(mw)
+    timer.setSingleShot(True)
 
-def fill_current_note(editor):
-    """Fill the current note being edited - seamless interaction"""
-    import logging
-    from aqt.utils import tooltip, showWarning
+    def _on_timeout():
+        pending_note = retrier.note()
+        if pending_note is not None and _pending_tts_timers.get(pending_note) is timer:
+            del _pending_tts_timers[pending_note]
+        timer.deleteLater()
+        retrier.start()
 
-    logger = logging.getLogger(__name__)
+    timer.timeout.connect(_on_timeout)
+    _pending_tts_timers[note] = timer
+    timer.start(AUTO_AUDIO_DEBOUNCE_MS)
 
+
+def fill_current_note(editor):
+    """Fill the current note being edited - seamless interaction"""
     try:
         if not editor.note:
             logger.warning("No note in editor")
             tooltip("No note to fill", parent=editor.widget)
             return
 
-        from .note_type import get_mapped_fields
+        from aqt.operations import QueryOp
 
         # Check if note has field mapping configured
-        mapping = get_mapped_fields(editor.note)
+        note = editor.note
+        mapping = get_mapped_fields(note)
         if not mapping:
             tooltip("Note type not configured for EasyWords", parent=editor.widget)
             return
 
-        fill_note_fields(editor.note, flush=False)
-        editor.loadNote()
-        tooltip("✓ Fields filled", parent=editor.widget)
+        word = get_word_from_note(note, mapping)
+        if not word:
+            logger.debug("Word field is empty or not found, skipping")
+            return
+
+        # Look up and synthesize in the background so the editor stays responsive
+        want_audio = _wants_audio(note, mapping)
+
+        def _on_done(data):
+            try:
+                _apply_to_note(note, mapping, word, data)
+                if editor.note is note:
+                    editor.loadNote()
+                elif note.id != 0:
+                    # The editor moved on; save the note it was filling
+                    mw.col.update_notes([note])
+                tooltip("✓ Fields filled", parent=editor.widget)
+            except Exception as e:
+                logger.error(f"Failed to fill note in editor: {e}", exc_info=True)
+                showWarning(f"Failed to fill note:\n{str(e)}\n\nPlease check the Anki console for details.")
+
+        QueryOp(
+            parent=editor.widget,
+            op=lambda col: _lookup_and_audio_blocking(word, want_audio),
+            success=_on_done
+        ).run_in_background()
 
     except Exception as e:
         logger.error(f"Failed to fill note in editor: {e}", exc_info=True)
@@ -313,14 +430,9 @@ def fill_current_note(editor):
 
 def ai_fill_current_note(editor):
     """Fill the current note using AI - seamless interaction without dialogs"""
-    import logging
     from .ai.client import OpenAIClient
-    from .note_type import get_mapped_fields, get_word_from_note
-    from aqt.utils import showWarning, tooltip
     from aqt.operations import QueryOp
 
-    logger = logging.getLogger(__name__)
-
     try:
         if not editor.note:
             tooltip("No note in editor", parent=editor.widget)
@@ -337,7 +449,7 @@ def ai_fill_current_note(editor):
             tooltip("Note type not configured for EasyWords", parent=editor.widget)
             return
 
-        word = get_word_from_note(editor.note)
+        word = get_word_from_note(editor.note, mapping)
         if not word:
             tooltip("Word field is empty", parent=editor.widget)
             return
@@ -371,6 +483,9 @@ def ai_fill_current_note(editor):
             return client.suggest_fields(word, fields_to_fill)
 
         def _success(result):
+            if not result and client.last_error == client.ERROR_NEEDS_API_KEY:
+                tooltip("AI request rejected - check your OpenAI API Key", parent=editor.widget)
+                return
             if not result:
                 tooltip("AI request failed - check console", parent=editor.widget)
                 logger.warning(f"AI returned empty result for word: {word}")
@@ -402,7 +517,84 @@ def ai_fill_current_note(editor):
         tooltip(f"Error: {str(e)}", parent=editor.widget)
 
 
-def fill_note_fields(note, flush=True):
+def _lookup_and_audio_blocking(word: str, want_audio: bool) -> dict:
+    """
+    Look up a word and optionally generate its audio (safe off the main thread)
+    
+    Returns:
+        Dict with keys: result (lookup_word() result), audio (filename or None),
+        lookup_error / audio_error (exception message or None)
+    """
+    _deferred_imports()
+    
+    data = {'result': None, 'audio': None, 'lookup_error': None, 'audio_error': None}
+    
+    # Lookup dictionary
+    try:
+        data['result'] = lookup_word(word)
+    except Exception as e:
+        logger.error(f"Failed to lookup word '{word}': {e}", exc_info=True)
+        data['lookup_error'] = str(e)
+    
+    if want_audio:
+        try:
+            data['audio'] = generate_audio(word)
+        except Exception as e:
+            logger.error(f"Failed to generate audio for '{word}': {e}", exc_info=True)
+            data['audio_error'] = str(e)
+    
+    return data
+
+
+def _wants_audio(note, mapping) -> bool:
+    """Check whether the note's mapped Audio field exists and is empty"""
+    target_field = mapping.get('Audio')
+    return bool(target_field) and target_field in note and not note[target_field]
+
+
+def _report_error(message: str, errors: Optional[List[str]]) -> None:
+    """Collect an error into errors if given, otherwise show it in a dialog"""
+    if errors is None:
+        showWarning(message)
+    else:
+        errors.append(message)
+
+
+def _apply_to_note(note, mapping, word: str, data: dict,
+                   errors: Optional[List[str]] = None) -> None:
+    """
+    Write the output of _lookup_and_audio_blocking() into empty mapped fields
+    
+    Args:
+        errors: Optional list collecting error messages instead of showing warning dialogs
+    """
+    if data['lookup_error']:
+        _report_error(f"Dictionary lookup failed for '{word}':\n{data['lookup_error']}", errors)
+    
+    result = data['result']
+    if result:
+        # Fill phonetic / definition / example if mapped and result available
+        for role, key in (('Phonetic', 'phonetic'), ('Definition', 'definition'), ('Example', 'example')):
+            if role in mapping:
+                target_field = mapping[role]
+                if target_field in note and result.get(key):
+                    if not note[target_field]:
+                        note[target_field] = result[key]
+                        logger.debug(f"Filled {key} for '{word}' into '{target_field}'")
+    
+    # Generate audio if Audio field is mapped and empty
+    if data['audio_error']:
+        _report_error(f"Audio generation failed for '{word}':\n{data['audio_error']}", errors)
+    elif _wants_audio(note, mapping):
+        target_field = mapping['Audio']
+        if data['audio']:
+            note[target_field] = f"[sound:{data['audio']}]"
+            logger.info(f"Generated audio for '{word}' into '{target_field}'")
+        else:
+            logger.warning(f"Failed to generate audio for '{word}'")
+
+
+def fill_note_fields(note, flush=True, errors: Optional[List[str]] = None):
     """
     Fill note fields with dictionary and TTS data using field mapping
     
@@ -411,15 +603,11 @@ def fill_note_fields(note, flush=True):
     
     Args:
         note: The note to fill
-        flush: Whether to flush changes to database (False for new notes in editor)
+        flush: Whether to save changes to the database (False for new notes in editor).
+            Saves are queued and written together, see _queue_note_save()
+        errors: Optional list collecting error messages; when given, failures are
+            appended to it instead of being shown in modal dialogs
     """
-    from .note_type import get_mapped_fields, get_word_from_note
-    from .dictionary.lookup import lookup_word
-    from .tts.manager import generate_audio
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
     try:
         # Get field mapping for this note type
         mapping = get_mapped_fields(note)
@@ -428,69 +616,21 @@ def fill_note_fields(note, flush=True):
             return
         
         # Get the word to look up
-        word = get_word_from_note(note)
+        word = get_word_from_note(note, mapping)
         if not word:
             logger.debug("Word field is empty or not found, skipping")
             return
         
-        # Lookup dictionary
-        try:
-            result = lookup_word(word)
-            
-            if result:
-                # Fill phonetic if mapped and result available
-                if 'Phonetic' in mapping:
-                    target_field = mapping['Phonetic']
-                    if target_field in note and result.get('phonetic'):
-                        if not note[target_field]:
-                            note[target_field] = result['phonetic']
-                            logger.debug(f"Filled phonetic for '{word}' into '{target_field}'")
-                
-                # Fill definition if mapped and result available
-                if 'Definition' in mapping:
-                    target_field = mapping['Definition']
-                    if target_field in note and result.get('definition'):
-                        if not note[target_field]:
-                            note[target_field] = result['definition']
-                            logger.debug(f"Filled definition for '{word}' into '{target_field}'")
-                
-                # Fill example if mapped and result available
-                if 'Example' in mapping:
-                    target_field = mapping['Example']
-                    if target_field in note and result.get('example'):
-                        if not note[target_field]:
-                            note[target_field] = result['example']
-                            logger.debug(f"Filled example for '{word}' into '{target_field}'")
-        except Exception as e:
-            logger.error(f"Failed to lookup word '{word}': {e}", exc_info=True)
-            from aqt.utils import showWarning
-            showWarning(f"Dictionary lookup failed for '{word}':\n{str(e)}")
-        
-        # Generate audio if Audio field is mapped and empty
-        if 'Audio' in mapping:
-            target_field = mapping['Audio']
-            if target_field in note:
-                try:
-                    if not note[target_field]:
-                        audio_file = generate_audio(word)
-                        if audio_file:
-                            note[target_field] = f"[sound:{audio_file}]"
-                            logger.info(f"Generated audio for '{word}' into '{target_field}'")
-                        else:
-                            logger.warning(f"Failed to generate audio for '{word}'")
-                except Exception as e:
-                    logger.error(f"Failed to generate audio for '{word}': {e}", exc_info=True)
-                    from aqt.utils import showWarning
-                    showWarning(f"Audio generation failed for '{word}':\n{str(e)}")
+        data = _lookup_and_audio_blocking(word, _wants_audio(note, mapping))
+        _apply_to_note(note, mapping, word, data, errors)
         
-        # Only flush if note has been saved before (has an id)
+        # Only save if note has been saved before (has an id)
         if flush and note.id != 0:
-            note.flush()
+            _queue_note_save(note)
             
     except Exception as e:
         logger.error(f"Unexpected error in fill_note_fields: {e}", exc_info=True)
-        from aqt.utils import showWarning
-        showWarning(f"Failed to fill note fields:\n{str(e)}\n\nPlease check the Anki console for details.")
+        _report_error(f"Failed to fill note fields:\n{str(e)}\n\nPlease check the Anki console for details.", errors)
 
 
 def setup_browser_hooks():
@@ -504,6 +644,18 @@ def setup_browser_hooks():
         action_fill = QAction("Fill Selected Cards...", browser)
         action_fill.triggered.connect(lambda: batch_fill_cards(browser))
         menu.addAction(action_fill)
+        
+        action_ai_fill = QAction("AI fill selected cards", browser)
+        action_ai_fill.triggered.connect(lambda: ai_fill_selected_cards(browser))
+        menu.addAction(action_ai_fill)
+        
+        action_ai_batch = QAction("Queue AI fill (batch, cheaper)", browser)
+        action_ai_batch.triggered.connect(lambda: queue_ai_batch_fill(browser))
+        menu.addAction(action_ai_batch)
+        
+        action_ai_collect = QAction("Collect AI batch results", browser)
+        action_ai_collect.triggered.connect(lambda: collect_ai_batches(browser))
+        menu.addAction(action_ai_collect)
     
     gui_hooks.browser_menus_did_init.append(on_browser_menus_did_init)
 
@@ -511,7 +663,6 @@ def setup_browser_hooks():
 def batch_fill_cards(browser):
     """Open batch fill dialog"""
     from .gui.batch_dialog import BatchDialog
-    from aqt.utils import tooltip
 
     selected_nids = browser.selectedNotes()
     if not selected_nids:
@@ -522,6 +673,167 @@ def batch_fill_cards(browser):
     dialog.exec()
 
 
+def _collect_ai_records(nids) -> List[dict]:
+    """
+    Find the empty AI-fillable fields of the given notes
+    
+    Returns:
+        List of dicts with keys: nid, word, fields (source field -> target note field)
+    """
+    records = []
+    for nid in nids:
+        note = mw.col.get_note(nid)
+        mapping = get_mapped_fields(note)
+        if not mapping:
+            continue
+        word = get_word_from_note(note, mapping)
+        if not word:
+            continue
+
+        fields = {}
+        for source_field in ('Definition', 'Example'):
+            target = mapping.get(source_field)
+            if target and target in note and not note[target]:
+                fields[source_field] = target
+        if fields:
+            records.append({'nid': nid, 'word': word, 'fields': fields})
+    return records
+
+
+def ai_fill_selected_cards(browser):
+    """Fill empty AI fields of the selected notes now, packing many words per request"""
+    from .ai.client import OpenAIClient
+    from aqt.operations import CollectionOp, QueryOp
+
+    selected_nids = browser.selectedNotes()
+    if not selected_nids:
+        tooltip("Please select some cards first", parent=browser)
+        return
+
+    client = OpenAIClient()
+    if not client.is_configured():
+        showWarning("OpenAI API Key is not configured.\nPlease go to Tools > EasyWords Configuration > AI Integration.")
+        return
+
+    records = _collect_ai_records(selected_nids)
+    if not records:
+        tooltip("All AI fields already filled", parent=browser)
+        return
+
+    def _op(col):
+        # One bulk call per set of requested fields; it packs the words into
+        # as few chat completions as possible and sends those concurrently
+        groups = {}
+        for record in records:
+            groups.setdefault(tuple(record['fields']), []).append(record)
+
+        notes = []
+        for source_fields, group in groups.items():
+            results = client.suggest_fields_bulk([r['word'] for r in group], list(source_fields))
+            for record in group:
+                result = results.get(record['word'], {})
+                note = col.get_note(record['nid'])
+                changed = False
+                for source_field, target_field in record['fields'].items():
+                    if result.get(source_field) and not note[target_field]:
+                        note[target_field] = result[source_field]
+                        changed = True
+                if changed:
+                    notes.append(note)
+        return notes
+
+    def _success(notes):
+        if not notes:
+            tooltip("AI returned no content - check console", parent=browser)
+            return
+        # Save in one undoable operation that also refreshes the browser
+        CollectionOp(
+            parent=browser,
+            op=lambda col: col.update_notes(notes)
+        ).success(
+            lambda _: tooltip(f"✓ AI filled {len(notes)} note(s)", parent=browser)
+        ).run_in_background()
+
+    tooltip("AI filling...", parent=browser)
+    QueryOp(
+        parent=browser,
+        op=_op,
+        success=_success
+    ).run_in_background()
+
+
+def queue_ai_batch_fill(browser):
+    """Queue AI fill for selected notes via the OpenAI Batch API"""
+    from .ai.client import OpenAIClient
+    from .ai.batch_client import submit_batch
+    from aqt.utils import showInfo
+    from aqt.operations import QueryOp
+
+    selected_nids = browser.selectedNotes()
+    if not selected_nids:
+        tooltip("Please select some cards first", parent=browser)
+        return
+
+    if not OpenAIClient().is_configured():
+        showWarning("OpenAI API Key is not configured.\nPlease go to Tools > EasyWords Configuration > AI Integration.")
+        return
+
+    records = _collect_ai_records(selected_nids)
+    if not records:
+        tooltip("All AI fields already filled", parent=browser)
+        return
+
+    def _success(batch_id):
+        if batch_id:
+            showInfo(f"Queued {len(records)} note(s) for AI fill.\n\n"
+                     "Results are usually ready within 24 hours.\n"
+                     "Use EasyWords > Collect AI batch results to apply them.")
+        else:
+            showWarning("Failed to submit AI batch - check console")
+
+    QueryOp(
+        parent=browser,
+        op=lambda col: submit_batch(records),
+        success=_success
+    ).run_in_background()
+
+
+def collect_ai_batches(browser):
+    """Collect results of pending OpenAI batch jobs"""
+    from .ai.batch_client import collect_batch
+    from aqt.utils import showInfo
+    from aqt.operations import QueryOp
+
+    batch_ids = list(config.get_pending_ai_batches().keys())
+    if not batch_ids:
+        tooltip("No pending AI batches", parent=browser)
+        return
+
+    def _op(col):
+        updated = 0
+        waiting = 0
+        for batch_id in batch_ids:
+            count = collect_batch(batch_id)
+            if count is None:
+                waiting += 1
+            else:
+                updated += count
+        return updated, waiting
+
+    def _success(result):
+        updated, waiting = result
+        message = f"Updated {updated} note(s) from AI batch results."
+        if waiting:
+            message += f"\n\n{waiting} batch(es) still in progress."
+        showInfo(message)
+
+    QueryOp(
+        parent=browser,
+        op=_op,
+        success=_success
+    ).run_in_background()
+
+
 def setup_reviewer_hooks():
     """Setup reviewer-related hooks"""
     
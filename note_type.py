@@ -3,8 +3,8 @@
 Note type management for EasyWords add-on
 """
 
-from typing import Optional, List, Dict
-import aqt
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping, Tuple
 from aqt import mw
 from anki.models import ModelManager, NotetypeDict
 
@@ -25,52 +25,15 @@ FIELD_NAMES = [
     FIELD_EXAMPLE,
     FIELD_AUDIO
 ]
+FIELD_NAMES_SET = frozenset(FIELD_NAMES)
 
-
-def get_note_type() -> Optional[NotetypeDict]:
-    """Get the EasyWords note type if it exists"""
-    if not mw or not mw.col:
-        return None
-    mm: ModelManager = mw.col.models
-    return mm.by_name(NOTE_TYPE_NAME)
-
-
-def ensure_note_type() -> Optional[NotetypeDict]:
-    """
-    Ensure the EasyWords note type exists, create if not.
-    Returns the note type, or None if collection is not available.
-    
-    Note: This is now optional. Users can use any note type with field mapping.
-    """
-    if not mw or not mw.col:
-        return None
-    
-    mm: ModelManager = mw.col.models
-    
-    # Check if note type already exists
-    existing = get_note_type()
-    if existing:
-        return existing
-    
-    # Create new note type
-    note_type = mm.new(NOTE_TYPE_NAME)
-    
-    # Add fields
-    for field_name in FIELD_NAMES:
-        field = mm.new_field(field_name)
-        mm.add_field(note_type, field)
-    
-    # Create card template
-    template = mm.new_template("Card 1")
-    
-    # Front template
-    template['qfmt'] = """
+# Card template and styling for the EasyWords note type
+_QFMT = """
 <div class="word">{{Word}}</div>
 <div class="phonetic">{{Phonetic}}</div>
 """
-    
-    # Back template
-    template['afmt'] = """
+
+_AFMT = """
 {{FrontSide}}
 
 <hr id=answer>
@@ -89,9 +52,8 @@ def ensure_note_type() -> Optional[NotetypeDict]:
 
 {{Audio}}
 """
-    
-    # Styling
-    note_type['css'] = """
+
+_CSS = """
 .card {
   font-family: arial;
   font-size: 20px;
@@ -135,9 +97,68 @@ def ensure_note_type() -> Optional[NotetypeDict]:
   color: #2c3e50;
 }
 """
+
+# Id of the EasyWords note type once found or created in this session
+_note_type_id: Optional[int] = None
+
+# Resolved field mappings
+# Format: {(note type id, note type mod, config version): mapping or None}
+_mapping_cache: Dict[Tuple[int, int, int], Optional[Mapping[str, str]]] = {}
+
+
+def get_note_type() -> Optional[NotetypeDict]:
+    """Get the EasyWords note type if it exists"""
+    if not mw or not mw.col:
+        return None
+    mm: ModelManager = mw.col.models
+    return mm.by_name(NOTE_TYPE_NAME)
+
+
+def ensure_note_type() -> Optional[NotetypeDict]:
+    """
+    Ensure the EasyWords note type exists, create if not.
+    Returns the note type, or None if collection is not available.
+    
+    Note: This is now optional. Users can use any note type with field mapping.
+    """
+    global _note_type_id
+    
+    if not mw or not mw.col:
+        return None
+    
+    mm: ModelManager = mw.col.models
+    
+    # Fast path: the note type was already found or created this session
+    if _note_type_id is not None:
+        existing = mm.get(_note_type_id)
+        if existing and existing['name'] == NOTE_TYPE_NAME:
+            return existing
+    
+    # Check if note type already exists
+    existing = get_note_type()
+    if existing:
+        _note_type_id = existing['id']
+        return existing
+    
+    # Create new note type
+    note_type = mm.new(NOTE_TYPE_NAME)
+    
+    # Add fields
+    for field_name in FIELD_NAMES:
+        field = mm.new_field(field_name)
+        mm.add_field(note_type, field)
+    
+    # Create card template
+    template = mm.new_template("Card 1")
+    template['qfmt'] = _QFMT
+    template['afmt'] = _AFMT
+    
+    # Styling
+    note_type['css'] = _CSS
     
     mm.add_template(note_type, template)
     mm.add(note_type)
+    _note_type_id = note_type['id']
     
     return note_type
 
@@ -150,9 +171,17 @@ def get_field_index(note_type: NotetypeDict, field_name: str) -> Optional[int]:
     return None
 
 
-def is_easywords_note(note) -> bool:
-    """Check if a note is an EasyWords note type"""
-    return note.note_type()['name'] == NOTE_TYPE_NAME
+def is_easywords_note(note, note_type: Optional[NotetypeDict] = None) -> bool:
+    """
+    Check if a note is an EasyWords note type
+    
+    Args:
+        note: The note to check
+        note_type: The note's type, if the caller already fetched it
+    """
+    if note_type is None:
+        note_type = note.note_type()
+    return note_type['name'] == NOTE_TYPE_NAME
 
 
 def has_word_field(note) -> bool:
@@ -160,27 +189,58 @@ def has_word_field(note) -> bool:
     return FIELD_WORD in note
 
 
-def get_mapped_fields(note) -> Optional[Dict[str, str]]:
+def get_mapped_fields(note, note_type: Optional[NotetypeDict] = None) -> Optional[Mapping[str, str]]:
     """
     Get field mapping for a note
     
+    Results are cached per note type and invalidated whenever the note type
+    or the configuration changes.
+    
     Args:
         note: The note to get mapping for
+        note_type: The note's type, if the caller already fetched it
     
     Returns:
-        Dict mapping source field to target field name, or None if no mapping
+        Read-only dict mapping source field to target field name, or None if no mapping
         Format: {"Word": "target_field", "Phonetic": "target_field", ...}
     """
     from .config import config
     
-    note_type_name = note.note_type()['name']
-    mapping = config.get_field_mapping(note_type_name)
+    if note_type is None:
+        note_type = note.note_type()
+    cache_key = (note_type['id'], note_type.get('mod', 0), config.version)
+    try:
+        return _mapping_cache[cache_key]
+    except KeyError:
+        pass
+    
+    mapping = _find_mapped_fields(note, note_type)
+    if mapping is not None:
+        mapping = MappingProxyType(mapping)
+    
+    # Entries for older config versions can never be hit again
+    if len(_mapping_cache) >= 256:
+        _mapping_cache.clear()
+    _mapping_cache[cache_key] = mapping
+    return mapping
+
+
+def invalidate_mapping_cache() -> None:
+    """Forget cached field mappings"""
+    _mapping_cache.clear()
+
+
+def _find_mapped_fields(note, note_type: NotetypeDict) -> Optional[Dict[str, str]]:
+    """Resolve the field mapping for a note (uncached, see get_mapped_fields)"""
+    from .config import config
+    
+    mapping = config.get_field_mapping(note_type['name'])
     
     if mapping:
-        return mapping
+        return dict(mapping)
     
     # Fallback: check if note has standard EasyWords fields
-    if is_easywords_note(note):
+    if is_easywords_note(note, note_type):
         return {
             FIELD_WORD: FIELD_WORD,
             FIELD_PHONETIC: FIELD_PHONETIC,
@@ -191,12 +251,7 @@ def get_mapped_fields(note) -> Optional[Dict[str, str]]:
     
     # Fallback 2: Auto-discover fields by name
     # If the note has fields that match our standard names, use them.
-    found_mapping = {}
-    note_fields = note.keys()
-    
-    for field in FIELD_NAMES:
-        if field in note_fields:
-            found_mapping[field] = field
+    found_mapping = {field: field for field in FIELD_NAMES_SET.intersection(note.keys())}
             
     # Require at least "Word" field to be considered a valid mapping
     if FIELD_WORD in found_mapping:
@@ -205,17 +260,19 @@ def get_mapped_fields(note) -> Optional[Dict[str, str]]:
     return None
 
 
-def get_word_from_note(note) -> Optional[str]:
+def get_word_from_note(note, mapping: Optional[Mapping[str, str]] = None) -> Optional[str]:
     """
     Get the word field content from a note using field mapping
     
     Args:
         note: The note to get word from
+        mapping: The note's field mapping, if the caller already resolved it
     
     Returns:
         The word content, or None if not found
     """
-    mapping = get_mapped_fields(note)
+    if mapping is None:
+        mapping = get_mapped_fields(note)
     if not mapping:
         return None
     
@@ -10,6 +10,12 @@ from typing import Optional, List
 class TTSEngine(ABC):
     """Base class for TTS engines"""
     
+    # Whether generate() may be called from several threads at once
+    thread_safe = True
+    
+    # Extension of the files generate() writes
+    file_extension = 'mp3'
+    
     def __init__(self, name: str):
         self.name = name
     
@@ -40,6 +46,10 @@ class TTSEngine(ABC):
         """
         pass
     
+    def warmup(self) -> None:
+        """Load whatever the first generate() call would otherwise pay for"""
+        pass
+    
     def get_default_voice(self) -> Optional[str]:
         """Get the default voice for this engine"""
         voices = self.get_voices()
@@ -4,17 +4,157 @@ Microsoft Edge TTS engine implementation
 """
 
 import asyncio
+import atexit
+import concurrent.futures
+import inspect
+import json
 import os
+import threading
+import time
+from functools import lru_cache
 from typing import Optional, List, Dict
 from .base import TTSEngine
 
 
+# Seconds to wait for a single Edge TTS request
+REQUEST_TIMEOUT = 60
+
+USER_FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'user_files')
+VOICES_CACHE_PATH = os.path.join(USER_FILES_DIR, 'edge_voices.json')
+
+# Seconds before the cached voice list is fetched again
+VOICES_CACHE_TTL = 7 * 86400
+
+
+def _read_voices_cache() -> Optional[List[str]]:
+    """Read the voice list saved by _write_voices_cache() if it is fresh enough"""
+    try:
+        if time.time() - os.path.getmtime(VOICES_CACHE_PATH) >= VOICES_CACHE_TTL:
+            return None
+        with open(VOICES_CACHE_PATH, 'r', encoding='utf-8') as f:
+            voices = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return voices if isinstance(voices, list) else None
+
+
+def _write_voices_cache(voice_names: List[str]) -> None:
+    """Save the voice list atomically so other sessions can skip the fetch"""
+    try:
+        os.makedirs(USER_FILES_DIR, exist_ok=True)
+        tmp_path = VOICES_CACHE_PATH + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(voice_names, f)
+        os.replace(tmp_path, VOICES_CACHE_PATH)
+    except OSError as e:
+        print(f"Failed to save Edge TTS voices: {e}")
+
+
+class _NoopAwaitable:
+    """Awaitable that completes immediately (and is harmless if never awaited)"""
+    
+    __slots__ = ()
+    
+    def __await__(self):
+        return iter(())
+
+
+def _create_shared_connector(limit: int):
+    """
+    Create a TCP connector that all edge-tts requests can share
+    
+    edge-tts opens a ClientSession per request, and the session closes its
+    connector when it ends. The returned connector ignores those calls so the
+    DNS cache and connection limit carry across requests; aclose() really
+    closes it. Must be called on the loop that will use it.
+    """
+    import aiohttp
+    
+    class _SharedConnector(aiohttp.TCPConnector):
+        def close(self, *args, **kwargs):
+            # Plain method like the base class: callers may or may not await it
+            return _NoopAwaitable()
+        
+        async def aclose(self):
+            result = aiohttp.TCPConnector.close(self)
+            if inspect.isawaitable(result):
+                await result
+    
+    return _SharedConnector(limit=limit, ttl_dns_cache=300)
+
+
 class EdgeTTSEngine(TTSEngine):
     """Microsoft Edge TTS engine (requires internet)"""
     
     def __init__(self):
         super().__init__("edge_tts")
         self._voices_cache = None
+        # One event loop for all requests, running on its own thread
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        # Connector shared by all requests; only touched on the loop thread
+        self._connector = None
+        self._accepts_connector: Optional[bool] = None
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the shared event loop, starting its thread on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="EasyWords-EdgeTTS", daemon=True
+                ).start()
+                self._loop = loop
+                atexit.register(self._stop_loop)
+            return self._loop
+    
+    def _stop_loop(self) -> None:
+        """Stop the shared event loop (registered with atexit)"""
+        with self._loop_lock:
+            if self._loop is not None:
+                if self._connector is not None:
+                    try:
+                        asyncio.run_coroutine_threadsafe(
+                            self._connector.aclose(), self._loop
+                        ).result(5)
+                    except Exception as e:
+                        print(f"Failed to close Edge TTS connections: {e}")
+                    self._connector = None
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+    
+    def _run(self, coro, timeout: Optional[float] = REQUEST_TIMEOUT):
+        """Run a coroutine on the shared loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+    
+    def _communicate(self, text: str, voice_name: str, rate_str: str):
+        """
+        Create an edge_tts.Communicate using the shared connector
+        
+        Must be called on the shared loop. Versions of edge-tts without the
+        connector argument get their own connection per request.
+        """
+        import edge_tts
+        from ..config import config
+        
+        if self._accepts_connector is None:
+            self._accepts_connector = 'connector' in inspect.signature(edge_tts.Communicate).parameters
+        if not self._accepts_connector:
+            return edge_tts.Communicate(text, voice_name, rate=rate_str)
+        
+        if self._connector is None:
+            self._connector = _create_shared_connector(config.get_edge_tts_concurrency())
+        return edge_tts.Communicate(text, voice_name, rate=rate_str, connector=self._connector)
+    
+    async def _save(self, text: str, voice_name: str, rate_str: str, output_path: str) -> None:
+        """Synthesize text into output_path (runs on the shared loop)"""
+        communicate = self._communicate(text, voice_name, rate_str)
+        await communicate.save(output_path)
     
     def is_available(self) -> bool:
         """Check if edge-tts library is available"""
@@ -24,6 +164,16 @@ class EdgeTTSEngine(TTSEngine):
         except ImportError:
             return False
     
+    def warmup(self) -> None:
+        """Import edge-tts and start the shared event loop ahead of the first request"""
+        try:
+            from edge_tts import Communicate
+        except ImportError:
+            return
+        if self._accepts_connector is None:
+            self._accepts_connector = 'connector' in inspect.signature(Communicate).parameters
+        self._get_loop()
+    
     def get_voices(self) -> List[str]:
         """Get list of available Edge TTS voices"""
         if self._voices_cache is not None:
@@ -32,34 +182,42 @@ class EdgeTTSEngine(TTSEngine):
         if not self.is_available():
             return []
         
+        # Voice list saved by an earlier session
+        cached = _read_voices_cache()
+        if cached is not None:
+            self._voices_cache = cached
+            return cached
+        
         try:
             import edge_tts
             
             # Run async function in sync context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            voices = loop.run_until_complete(edge_tts.list_voices())
-            loop.close()
+            voices = self._run(edge_tts.list_voices())
             
             # Extract English voices
-            voice_names = []
-            for voice in voices:
-                if 'en-' in voice['Locale'].lower():
-                    voice_names.append(f"{voice['ShortName']} ({voice['Locale']})")
+            # (edge-tts reports locales in canonical case, e.g. "en-US")
+            voice_names = [
+                f"{voice['ShortName']} ({voice['Locale']})"
+                for voice in voices
+                if voice['Locale'].startswith('en-')
+            ]
             
             self._voices_cache = voice_names
+            _write_voices_cache(voice_names)
             return voice_names
             
         except Exception as e:
             print(f"Failed to get Edge TTS voices: {e}")
             return []
     
-    def _prepare_voice_rate(self, voice: Optional[str], speed: float) -> tuple[str, str]:
-        """Prepare voice name and rate string"""
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _prepare_voice_rate(voice: Optional[str], speed: float) -> tuple[str, str]:
+        """Prepare voice name and rate string (cached, a batch reuses the same voice)"""
         # Parse voice name if in format "ShortName (Locale)"
         voice_name = voice
         if voice and '(' in voice:
-            voice_name = voice.split('(')[0].strip()
+            voice_name = voice.partition('(')[0].strip()
         
         # Default to en-US voice if not specified
         if not voice_name:
@@ -79,17 +237,10 @@ class EdgeTTSEngine(TTSEngine):
             return None
         
         try:
-            import edge_tts
-            
             voice_name, rate_str = self._prepare_voice_rate(voice, speed)
             
             # Run async generation
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            communicate = edge_tts.Communicate(text, voice_name, rate=rate_str)
-            loop.run_until_complete(communicate.save(output_path))
-            loop.close()
+            self._run(self._save(text, voice_name, rate_str, output_path))
             
             return output_path
             
@@ -101,13 +252,29 @@ class EdgeTTSEngine(TTSEngine):
         """
         Generate multiple audio files in parallel.
         items: List of dicts with keys: text, voice, speed, output_path
+        
+        Returns:
+            output_path of each item that was generated (None for failures),
+            in the same order as items
         """
         if not self.is_available():
             return [None] * len(items)
             
-        import edge_tts
+        from ..config import config
+        
+        max_in_flight = config.get_edge_tts_concurrency()
+        
+        async def _save(text, voice_name, rate_str, output_path, semaphore):
+            # Bounded so large batches do not get throttled by the service
+            async with semaphore:
+                await asyncio.wait_for(
+                    self._save(text, voice_name, rate_str, output_path), REQUEST_TIMEOUT
+                )
+            return output_path
         
         async def _run_batch():
+            # Created here so it binds to the shared loop
+            semaphore = asyncio.Semaphore(max_in_flight)
             tasks = []
             for item in items:
                 text = item.get('text')
@@ -123,29 +290,16 @@ class EdgeTTSEngine(TTSEngine):
                     item.get('voice'), item.get('speed', 1.0)
                 )
                 
-                communicate = edge_tts.Communicate(text, voice_name, rate=rate_str)
-                tasks.append(communicate.save(output_path))
+                tasks.append(_save(text, voice_name, rate_str, output_path, semaphore))
             
-            # Execute all tasks concurrently
-            await asyncio.gather(*tasks, return_exceptions=True)
+            # Execute all tasks, at most max_in_flight at a time
+            return await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Run the batch in a single event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(_run_batch())
-        finally:
-            loop.close()
-            
-        # Verify results
-        results = []
-        for item in items:
-            path = item.get('output_path')
-            if path and os.path.exists(path):
-                results.append(path)
-            else:
-                results.append(None)
-        return results
+        # Run the batch on the shared event loop; each request has its own timeout
+        outcomes = self._run(_run_batch(), timeout=None)
+        
+        # Failed requests come back as exceptions
+        return [None if isinstance(outcome, BaseException) else outcome for outcome in outcomes]
     
     def get_default_voice(self) -> Optional[str]:
         """Get default English voice"""
@@ -4,32 +4,89 @@ TTS manager for coordinating different TTS engines
 """
 
 import os
+import base64
 import hashlib
-from typing import Optional, Dict, List, Any, Callable
+import queue
+import threading
+import time
+from functools import lru_cache, partial
+from typing import Optional, Dict, List, Any, Callable, Set, Tuple
 from aqt import mw
 
 from ..config import config
 from .base import TTSEngine
-from .sapi5 import SAPI5Engine
-from .edge_tts import EdgeTTSEngine
 
 
-# Available engines
-_engines: Dict[str, TTSEngine] = {
-    'sapi5': SAPI5Engine(),
-    'edge_tts': EdgeTTSEngine()
+# Batches at least this large list the media folder once instead of
+# checking each file separately
+SCAN_MEDIA_MIN_ITEMS = 16
+
+# Requests for generate_audio_in_background(): (note, field_name, text, callback)
+_tts_queue: "queue.Queue[Tuple[Any, str, str, Optional[Callable]]]" = queue.Queue()
+_tts_worker: Optional[threading.Thread] = None
+_tts_worker_lock = threading.Lock()
+# Seconds the worker waits for more requests to join a batch, and the batch size limit
+TTS_QUEUE_WINDOW = 0.05
+TTS_QUEUE_MAX_ITEMS = 16
+
+# Thread pool for engines without generate_batch() (see _get_executor)
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+# Audio files known to exist in the media folder this session (see _known_audio_files)
+_known_media_dir: Optional[str] = None
+_known_files: Set[str] = set()
+# Whether _known_files came from a full listing of the folder
+_known_complete = False
+
+def _create_sapi5() -> TTSEngine:
+    from .sapi5 import SAPI5Engine
+    return SAPI5Engine()
+
+
+def _create_edge_tts() -> TTSEngine:
+    from .edge_tts import EdgeTTSEngine
+    return EdgeTTSEngine()
+
+
+# Available engines, created on first use (see _get_engine)
+_engine_factories: Dict[str, Callable[[], TTSEngine]] = {
+    'sapi5': _create_sapi5,
+    'edge_tts': _create_edge_tts
 }
+_engine_instances: Dict[str, TTSEngine] = {}
+_engine_lock = threading.Lock()
+
+
+def _get_engine(engine_name: str) -> Optional[TTSEngine]:
+    """Get the engine called engine_name, creating it on first use"""
+    engine = _engine_instances.get(engine_name)
+    if engine is not None:
+        return engine
+    
+    factory = _engine_factories.get(engine_name)
+    if factory is None:
+        return None
+    
+    with _engine_lock:
+        engine = _engine_instances.get(engine_name)
+        if engine is None:
+            engine = factory()
+            _engine_instances[engine_name] = engine
+    return engine
 
 
 def get_available_engines() -> Dict[str, TTSEngine]:
     """Get dictionary of available TTS engines"""
-    return {name: engine for name, engine in _engines.items() if engine.is_available()}
+    engines = {name: _get_engine(name) for name in _engine_factories}
+    return {name: engine for name, engine in engines.items() if engine.is_available()}
 
 
 def get_current_engine() -> Optional[TTSEngine]:
     """Get the currently configured TTS engine"""
     engine_name = config.get_tts_engine()
-    engine = _engines.get(engine_name)
+    engine = _get_engine(engine_name)
     
     if engine and engine.is_available():
         return engine
@@ -42,6 +99,22 @@ def get_current_engine() -> Optional[TTSEngine]:
     return None
 
 
+def warmup_engine() -> None:
+    """
+    Prepare the configured TTS engine so the first generation starts quickly
+    
+    Safe to call from a background thread; failures are only logged.
+    """
+    engine = get_current_engine()
+    if not engine:
+        return
+    
+    try:
+        engine.warmup()
+    except Exception as e:
+        print(f"TTS warmup failed: {e}")
+
+
 def generate_audio(text: str, voice: Optional[str] = None, 
                    speed: Optional[float] = None) -> Optional[str]:
     """
@@ -71,19 +144,23 @@ def generate_audio(text: str, voice: Optional[str] = None,
         speed = config.get_tts_speed()
     
     # Generate filename
-    filename = _generate_filename(text, engine.name, voice, speed)
+    filename = _generate_filename(text, engine.name, voice, speed, engine.file_extension)
     
     # Check if audio already exists (cache)
     media_dir = mw.col.media.dir()
     output_path = os.path.join(media_dir, filename)
     
-    if config.is_cache_audio() and os.path.exists(output_path):
-        return filename
+    if config.is_cache_audio():
+        cached = _find_cached_file(media_dir, filename, text, engine.name, voice, speed)
+        if cached:
+            return cached
     
     # Generate audio
     result = engine.generate(text, voice, speed, output_path)
     
-    if result and os.path.exists(result):
+    # Engines return the written path (or None on failure), as in generate_audio_batch()
+    if isinstance(result, str) or (result and os.path.exists(output_path)):
+        _known_audio_files(media_dir)[0].add(filename)
         return filename
     
     return None
@@ -104,58 +181,77 @@ def generate_audio_batch(items: List[Dict]) -> List[Optional[str]]:
     if not engine:
         return [None] * len(items)
         
-    # Pre-process items
-    processed_items = []
+    # Pre-process items; results are filled in by index
+    results: List[Optional[str]] = [None] * len(items)
     to_generate = []
+    # Indices of the items waiting for each filename to be generated;
+    # repeated texts are generated once
+    pending: Dict[str, List[int]] = {}
     
     media_dir = mw.col.media.dir()
     
     default_voice = config.get_tts_voice()
     default_speed = config.get_tts_speed()
     
+    engine_name = engine.name
+    extension = engine.file_extension
+    
+    scan_media = len(items) >= SCAN_MEDIA_MIN_ITEMS
+    cache_audio = config.is_cache_audio()
+    known, complete = _known_audio_files(media_dir, scan=cache_audio and scan_media)
+    existing = known if complete else None
+    
+    # Joined once; filenames never contain separators
+    media_prefix = os.path.join(media_dir, '')
+    
     for i, item in enumerate(items):
         text = item.get('text')
         if not text:
-            processed_items.append({'index': i, 'filename': None})
             continue
             
         voice = item.get('voice', default_voice)
         speed = item.get('speed', default_speed)
         
-        filename = _generate_filename(text, engine.name, voice, speed)
-        output_path = os.path.join(media_dir, filename)
+        filename = _generate_filename(text, engine_name, voice, speed, extension)
+        if filename in pending:
+            pending[filename].append(i)
+            continue
         
-        if config.is_cache_audio() and os.path.exists(output_path):
-            processed_items.append({'index': i, 'filename': filename})
+        cached = None
+        if cache_audio:
+            cached = _find_cached_file(media_dir, filename, text, engine_name, voice, speed, existing)
+        if cached:
+            results[i] = cached
         else:
+            pending[filename] = [i]
             to_generate.append({
-                'index': i,
                 'text': text,
                 'voice': voice,
                 'speed': speed,
-                'output_path': output_path,
+                'output_path': media_prefix + filename,
                 'filename': filename
             })
             
     # Generate batch if supported
     if to_generate:
         if hasattr(engine, 'generate_batch'):
-            engine.generate_batch(to_generate)
+            outcomes = engine.generate_batch(to_generate)
         else:
-            # Fallback to sequential
-            for item in to_generate:
-                engine.generate(item['text'], item['voice'], item['speed'], item['output_path'])
+            outcomes = _generate_each(engine, to_generate)
                 
-        # Update results
-        for item in to_generate:
-            if os.path.exists(item['output_path']):
-                processed_items.append({'index': item['index'], 'filename': item['filename']})
+        # Update results; engines return the written path (or None on failure),
+        # only other values need checking on disk
+        for item, outcome in zip(to_generate, outcomes):
+            if isinstance(outcome, str):
+                found = True
             else:
-                processed_items.append({'index': item['index'], 'filename': None})
+                found = bool(outcome) and os.path.exists(item['output_path'])
+            if found:
+                for index in pending[item['filename']]:
+                    results[index] = item['filename']
+                known.add(item['filename'])
                 
-    # Sort back to original order
-    processed_items.sort(key=lambda x: x['index'])
-    return [item['filename'] for item in processed_items]
+    return results
 
 
 def generate_audio_in_background(note: Any, field_name: str, text: str, 
@@ -163,20 +259,91 @@ def generate_audio_in_background(note: Any, field_name: str, text: str,
     """
     Generate audio in background and update note field.
     
+    Requests are queued for a single worker thread, which generates whatever
+    arrives within TTS_QUEUE_WINDOW seconds as one batch.
+    
     Args:
         note: The note to update
         field_name: The field to put the audio tag in
         text: Text to generate audio for
         callback: Optional callback to run after update (success: bool, filename: str)
     """
-    from aqt.operations import QueryOp
+    _ensure_tts_worker()
+    _tts_queue.put((note, field_name, text, callback))
+
+
+def _ensure_tts_worker() -> None:
+    """Start the background audio worker thread if it is not running"""
+    global _tts_worker
     
-    def _op(col):
-        # This runs in background thread
-        return generate_audio(text)
+    with _tts_worker_lock:
+        if _tts_worker is None or not _tts_worker.is_alive():
+            _tts_worker = threading.Thread(
+                target=_tts_worker_loop, name="EasyWords-TTS", daemon=True
+            )
+            _tts_worker.start()
+
+
+def collect_batch(task_queue: "queue.Queue", max_items: int,
+                  max_wait: float) -> Tuple[List[Any], bool]:
+    """
+    Take the next batch of items from a queue (blocks until one arrives)
+    
+    Items arriving within max_wait seconds of the first one join its batch,
+    up to max_items. None in the queue marks the end of the input.
     
-    def _success(filename):
-        # This runs in main thread
+    Args:
+        task_queue: Queue to read from
+        max_items: Maximum number of items per batch
+        max_wait: Maximum seconds the first item waits for the batch to fill
+        
+    Returns:
+        (batch, finished) where finished is True once the end marker was read;
+        the batch may be empty if the marker came first
+    """
+    item = task_queue.get()
+    if item is None:
+        return [], True
+    
+    batch = [item]
+    deadline = time.monotonic() + max_wait
+    while len(batch) < max_items:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = task_queue.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if item is None:
+            return batch, True
+        batch.append(item)
+    
+    return batch, False
+
+
+def _tts_worker_loop() -> None:
+    """Collect queued requests into batches and generate them (worker thread)"""
+    while True:
+        batch, _ = collect_batch(_tts_queue, TTS_QUEUE_MAX_ITEMS, TTS_QUEUE_WINDOW)
+        if not batch:
+            continue
+        
+        # Each distinct text is generated once
+        texts = list(dict.fromkeys(item[2] for item in batch))
+        try:
+            filenames = dict(zip(texts, generate_audio_batch([{'text': text} for text in texts])))
+        except Exception as e:
+            print(f"Background audio generation failed: {e}")
+            filenames = {}
+        
+        mw.taskman.run_on_main(partial(_apply_background_audio, batch, filenames))
+
+
+def _apply_background_audio(batch: List[Tuple], filenames: Dict[str, Optional[str]]) -> None:
+    """Write generated audio into the notes and run their callbacks (main thread)"""
+    for note, field_name, text, callback in batch:
+        filename = filenames.get(text)
         success = False
         if filename:
             try:
@@ -189,32 +356,173 @@ def generate_audio_in_background(note: Any, field_name: str, text: str,
         if callback:
             callback(success, filename)
 
-    op = QueryOp(
-        parent=mw,
-        op=lambda col: _op(col),
-        success=_success
-    )
-    # We run without progress dialog to avoid interrupting typing
-    op.run_in_background()
 
+def _generate_each(engine: TTSEngine, items: List[Dict]) -> List[Optional[str]]:
+    """
+    Generate items one by one for engines without generate_batch()
+    
+    Thread-safe engines run on the shared generation pool (see _get_executor),
+    since generation mostly waits on the network or the speech service;
+    others run sequentially.
+    
+    Returns:
+        engine.generate() result for each item (None on failure), in order
+    """
+    def _generate(item):
+        try:
+            return engine.generate(item['text'], item['voice'], item['speed'], item['output_path'])
+        except Exception as e:
+            print(f"TTS generation error for '{item['text']}': {e}")
+            return None
+    
+    if not engine.thread_safe:
+        return [_generate(item) for item in items]
+    
+    # Even single items go through the pool, so engines' per-thread state is reused
+    return list(_get_executor().map(_generate, items))
 
-def _generate_filename(text: str, engine: str, voice: str, speed: float) -> str:
+
+def _get_executor():
+    """
+    Get the long-lived generation thread pool
+    
+    Its threads survive between batches, so per-thread engine state (such as
+    SAPI5's COM objects) is created once per thread. The pool is replaced when
+    the tts_batch_workers setting changes.
+    """
+    global _executor, _executor_workers
+    from concurrent.futures import ThreadPoolExecutor
+    
+    workers = config.get_tts_batch_workers()
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                # Running batches finish on the old pool
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="EasyWords-TTSGen")
+            _executor_workers = workers
+        return _executor
+
+
+@lru_cache(maxsize=16384)
+def _generate_filename(text: str, engine: str, voice: str, speed: float,
+                       extension: str = 'mp3') -> str:
     """
     Generate a unique filename for the audio
     
-    Format: easywords_[hash].mp3
+    Format: easywords_[hash].[extension]
     """
-    # Create hash from text, engine, voice, and speed
-    content = f"{text}_{engine}_{voice}_{speed}"
-    hash_obj = hashlib.md5(content.encode('utf-8'))
-    hash_str = hash_obj.hexdigest()[:12]
+    # Hash text, engine, voice, and speed (unit separator between parts)
+    content = text.encode('utf-8', 'surrogatepass') + _filename_suffix(engine, voice, speed)
+    # 60 bits in 12 lowercase base32 characters (media folders may be case-insensitive)
+    digest = hashlib.blake2b(content, digest_size=8).digest()
+    hash_str = base64.b32encode(digest).decode('ascii')[:12].lower()
     
+    return f"easywords_{hash_str}.{extension}"
+
+
+@lru_cache(maxsize=64)
+def _filename_suffix(engine: str, voice: str, speed: float) -> bytes:
+    """Encoded engine/voice/speed part of the filename hash (shared by all texts)"""
+    return b"\x1f" + b"\x1f".join((
+        engine.encode('utf-8'), (voice or '').encode('utf-8'), f"{speed:.3f}".encode('ascii')
+    ))
+
+
+def clear_filename_cache() -> None:
+    """Forget memoized audio filenames"""
+    _generate_filename.cache_clear()
+    _filename_suffix.cache_clear()
+
+
+def _legacy_filename(text: str, engine: str, voice: str, speed: float) -> str:
+    """Filename used by earlier versions (MD5 based), so their audio stays cached"""
+    content = f"{text}_{engine}_{voice}_{speed}"
+    hash_str = hashlib.md5(content.encode('utf-8')).hexdigest()[:12]
     return f"easywords_{hash_str}.mp3"
 
 
+def _find_cached_file(media_dir: str, filename: str, text: str, engine: str,
+                      voice: str, speed: float, existing: Optional[Set[str]] = None) -> Optional[str]:
+    """
+    Find already generated audio for text
+    
+    Args:
+        existing: Names from _list_audio_files(media_dir); checked instead of
+            stat-ing each candidate when given
+    
+    Returns:
+        filename if it exists in media_dir, else the legacy filename if that
+        exists, else None
+    """
+    known = _known_audio_files(media_dir)[0]
+    if filename in known:
+        return filename
+    
+    if existing is None:
+        media_prefix = os.path.join(media_dir, '')
+        exists = lambda name: os.path.exists(media_prefix + name)
+    else:
+        exists = existing.__contains__
+    
+    if exists(filename):
+        known.add(filename)
+        return filename
+    
+    legacy = _legacy_filename(text, engine, voice, speed)
+    if legacy in known or exists(legacy):
+        known.add(legacy)
+        return legacy
+    return None
+
+
+def _known_audio_files(media_dir: str, scan: bool = False) -> Tuple[Set[str], bool]:
+    """
+    Get the audio files known to exist in media_dir this session
+    
+    Args:
+        media_dir: The media folder (a different folder starts a new set)
+        scan: List the folder, once per session, so the set is complete
+    
+    Returns:
+        (set of filenames, whether the set is a complete listing)
+    """
+    global _known_media_dir, _known_files, _known_complete
+    
+    if media_dir != _known_media_dir:
+        _known_media_dir = media_dir
+        _known_files = set()
+        _known_complete = False
+    
+    if scan and not _known_complete:
+        _known_files.update(_list_audio_files(media_dir))
+        _known_complete = True
+    
+    return _known_files, _known_complete
+
+
+def invalidate_cache() -> None:
+    """Forget which audio files are known to exist (e.g. after a media sync or check)"""
+    global _known_media_dir, _known_files, _known_complete
+    
+    _known_media_dir = None
+    _known_files = set()
+    _known_complete = False
+
+
+def _list_audio_files(media_dir: str) -> Set[str]:
+    """Get the names of all EasyWords audio files in media_dir (one directory scan)"""
+    try:
+        with os.scandir(media_dir) as entries:
+            return {entry.name for entry in entries if entry.name.startswith('easywords_')}
+    except OSError as e:
+        print(f"Failed to list media folder: {e}")
+        return set()
+
+
 def get_voices_for_engine(engine_name: str) -> List[str]:
     """Get list of voices for a specific engine"""
-    engine = _engines.get(engine_name)  
+    engine = _get_engine(engine_name)
     if engine and engine.is_available():
         return engine.get_voices()
     return []
@@ -3,20 +3,39 @@
 Windows SAPI5 TTS engine implementation
 """
 
-import os
+import importlib.util
 import sys
-from typing import Optional, List
+import threading
+from typing import Any, Dict, Optional, List
 from .base import TTSEngine
 
 
+# Audio format captured from SAPI before MP3 encoding (SAFT22kHz16BitMono)
+SAFT_FORMAT = 22
+FRAME_RATE = 22050
+SAMPLE_WIDTH = 2
+
+# pydub is needed to encode MP3; without it SAPI5 audio is saved as WAV
+_HAS_PYDUB = importlib.util.find_spec('pydub') is not None
+
+
 class SAPI5Engine(TTSEngine):
     """Windows SAPI5 TTS engine"""
     
+    # COM objects are kept per thread (see _get_speaker), so workers don't share them
+    thread_safe = True
+    
     def __init__(self):
         super().__init__("sapi5")
-        self._speaker = None
+        # Per-thread SpVoice / SpFileStream and the voice and rate currently set on it
+        self._local = threading.local()
         self._voices_cache = None
     
+    @property
+    def file_extension(self) -> str:
+        """MP3 when pydub can encode it, otherwise WAV (which Anki plays too)"""
+        return 'mp3' if _HAS_PYDUB else 'wav'
+    
     def is_available(self) -> bool:
         """Check if SAPI5 is available (Windows only)"""
         if sys.platform != "win32":
@@ -29,29 +48,66 @@ class SAPI5Engine(TTSEngine):
             return False
     
     def _get_speaker(self):
-        """Get or create the SAPI speaker object"""
-        if self._speaker is None:
+        """Get or create this thread's SAPI speaker object"""
+        speaker = getattr(self._local, 'speaker', None)
+        if speaker is None:
             try:
+                import pythoncom
                 import win32com.client
-                self._speaker = win32com.client.Dispatch("SAPI.SpVoice")
+                try:
+                    # COM must be initialized in every thread using it
+                    pythoncom.CoInitialize()
+                except pythoncom.com_error:
+                    pass
+                speaker = win32com.client.Dispatch("SAPI.SpVoice")
             except Exception as e:
                 print(f"Failed to initialize SAPI5: {e}")
                 return None
-        return self._speaker
+            self._local.speaker = speaker
+            self._local.voice_name = None
+            self._local.rate = None
+            self._local.voice_tokens = None
+        return speaker
+    
+    def _get_voice_tokens(self) -> Dict[str, Any]:
+        """
+        Get this thread's voice tokens by description (enumerated once per thread)
+        
+        Tokens are COM objects, so each thread keeps its own.
+        """
+        speaker = self._get_speaker()
+        if not speaker:
+            return {}
+        
+        tokens = self._local.voice_tokens
+        if tokens is None:
+            tokens = {voice.GetDescription(): voice for voice in speaker.GetVoices()}
+            self._local.voice_tokens = tokens
+        return tokens
+    
+    def warmup(self) -> None:
+        """Load SAPI and enumerate voices ahead of the first generate() call"""
+        if not self.is_available():
+            return
+        # Loads the SAPI libraries into the process and fills the voice name cache
+        self.get_voices()
+    
+    def _get_filestream(self):
+        """Get or create this thread's reusable SAPI file stream"""
+        filestream = getattr(self._local, 'filestream', None)
+        if filestream is None:
+            import win32com.client
+            filestream = win32com.client.Dispatch("SAPI.SpFileStream")
+            self._local.filestream = filestream
+        return filestream
     
     def get_voices(self) -> List[str]:
         """Get list of available SAPI5 voices"""
         if self._voices_cache is not None:
             return self._voices_cache
         
-        speaker = self._get_speaker()
-        if not speaker:
-            return []
-        
         try:
-            voices = []
-            for voice in speaker.GetVoices():
-                voices.append(voice.GetDescription())
+            voices = list(self._get_voice_tokens())
             self._voices_cache = voices
             return voices
         except Exception as e:
@@ -67,11 +123,15 @@ class SAPI5Engine(TTSEngine):
         if not speaker:
             return
         
+        # Already selected on this thread's speaker
+        if self._local.voice_name == voice_name:
+            return
+        
         try:
-            for voice in speaker.GetVoices():
-                if voice.GetDescription() == voice_name:
-                    speaker.Voice = voice
-                    break
+            token = self._get_voice_tokens().get(voice_name)
+            if token is not None:
+                speaker.Voice = token
+                self._local.voice_name = voice_name
         except Exception as e:
             print(f"Failed to set voice: {e}")
     
@@ -94,26 +154,25 @@ class SAPI5Engine(TTSEngine):
             # Convert our speed (0.5 to 2.0) to SAPI rate
             rate = int((speed - 1.0) * 10)
             rate = max(-10, min(10, rate))
-            speaker.Rate = rate
+            if self._local.rate != rate:
+                speaker.Rate = rate
+                self._local.rate = rate
             
             # Generate audio to file
             if output_path:
-                # Save to WAV file
-                import win32com.client
-                filestream = win32com.client.Dispatch("SAPI.SpFileStream")
+                # Encode straight from memory when possible
+                if output_path.endswith('.mp3') and self._speak_to_mp3(speaker, text, output_path):
+                    return output_path
+                
+                # Save as WAV (output_path is .wav unless MP3 encoding just failed;
+                # Anki plays WAV data whatever the extension)
+                filestream = self._get_filestream()
                 filestream.Open(output_path, 3)  # 3 = SSFMCreateForWrite
                 speaker.AudioOutputStream = filestream
                 speaker.Speak(text)
                 filestream.Close()
                 speaker.AudioOutputStream = None
                 
-                # Convert WAV to MP3 if needed
-                if output_path.endswith('.mp3'):
-                    wav_path = output_path.replace('.mp3', '.wav')
-                    self._convert_to_mp3(wav_path, output_path)
-                    if os.path.exists(wav_path):
-                        os.remove(wav_path)
-                
                 return output_path
             else:
                 # Speak directly (not saving to file)
@@ -124,19 +183,38 @@ class SAPI5Engine(TTSEngine):
             print(f"SAPI5 generation error: {e}")
             return None
     
-    def _convert_to_mp3(self, wav_path: str, mp3_path: str) -> bool:
-        """Convert WAV to MP3 (optional, requires pydub)"""
+    def _speak_to_mp3(self, speaker, text: str, mp3_path: str) -> bool:
+        """
+        Speak text into an in-memory stream and encode it to MP3 (requires pydub)
+        
+        Returns:
+            True if mp3_path was written, False if the caller should write WAV instead
+        """
+        if not _HAS_PYDUB:
+            return False
+        
         try:
             from pydub import AudioSegment
-            audio = AudioSegment.from_wav(wav_path)
-            audio.export(mp3_path, format="mp3")
-            return True
-        except ImportError:
-            # pydub not available, just rename to mp3 (Anki can play WAV anyway)
-            if os.path.exists(wav_path):
-                import shutil
-                shutil.move(wav_path, mp3_path)
+            import win32com.client
+            stream = win32com.client.Dispatch("SAPI.SpMemoryStream")
+            stream.Format.Type = SAFT_FORMAT
+        except Exception as e:
+            print(f"SAPI5 memory stream unavailable: {e}")
             return False
+        
+        speaker.AudioOutputStream = stream
+        try:
+            speaker.Speak(text)
+        finally:
+            speaker.AudioOutputStream = None
+        
+        try:
+            audio = AudioSegment(
+                data=bytes(stream.GetData()),
+                sample_width=SAMPLE_WIDTH, frame_rate=FRAME_RATE, channels=1
+            )
+            audio.export(mp3_path, format="mp3", bitrate="64k")
+            return True
         except Exception as e:
-            print(f"WAV to MP3 conversion error: {e}")
+            print(f"MP3 encoding error: {e}")
             return False